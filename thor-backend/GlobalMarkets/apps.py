@@ -1,11 +1,10 @@
-def ready(self):
-    import os
-    import logging
-    logger = logging.getLogger(__name__)
+from django.apps import AppConfig
 
-    if os.environ.get("GLOBAL_MARKETS_READY") == "1":
-        return
-    os.environ["GLOBAL_MARKETS_READY"] = "1"
 
-    # Signals only (keep GlobalMarkets decoupled)
-    import GlobalMarkets.signals  # noqa: F401
+class GlobalMarketsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "GlobalMarkets"
+
+    def ready(self):
+        # Signals only (keep GlobalMarkets decoupled)
+        import GlobalMarkets.signals  # noqa: F401
@@ -0,0 +1,295 @@
+"""Precomputed market-transition calendar.
+
+compute_market_status is evaluated once per market for every instant where its
+answer can change (local midnight, open, close, early close) over the next
+GLOBAL_MARKETS_CALENDAR_DAYS days. The result is a list of segments per market:
+(start_utc, status, next_transition_utc, reason), identical to what
+compute_market_status returns anywhere inside the segment.
+
+Callers such as the realtime heartbeat look up the current segment in memory and
+only need to do real work when `next_change_after(now)` is reached.
+
+Caching:
+  - process memory (the calendar object)
+  - Redis (global_markets:calendar), so new processes skip the DB build
+  - a Redis epoch (global_markets:calendar:epoch) bumped on Market /
+    MarketHoliday edits (receivers in GlobalMarkets.signals); every process
+    checks it at most once per _EPOCH_CHECK_SECONDS and rebuilds when it moved.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from GlobalMarkets.models import Market, MarketHoliday
+from GlobalMarkets.services import MarketComputation, _as_utc, _localize, compute_market_status_local
+from LiveData.shared.config_cache import RedisEpoch
+
+logger = logging.getLogger(__name__)
+
+_CALENDAR_KEY = "global_markets:calendar"
+_CALENDAR_EPOCH_KEY = "global_markets:calendar:epoch"
+_EPOCH_CHECK_SECONDS = 1.0
+
+# Rebuild this long before the horizon runs out.
+_REBUILD_MARGIN = timedelta(days=1)
+
+@dataclass(frozen=True)
+class MarketSegment:
+    start_utc: datetime
+    status: str
+    next_transition_utc: Optional[datetime]
+    reason: str
+
+    def as_computation(self) -> MarketComputation:
+        return MarketComputation(
+            status=self.status,
+            next_transition_utc=self.next_transition_utc,
+            reason=self.reason,
+        )
+
+
+@dataclass
+class MarketCalendar:
+    """Segments for every active market between built_at and horizon_utc."""
+
+    epoch: str
+    built_at: datetime
+    horizon_utc: datetime
+    # market key -> display name, in Market ordering (sort_order, name)
+    names: Dict[str, str] = field(default_factory=dict)
+    segments: Dict[str, List[MarketSegment]] = field(default_factory=dict)
+
+    @property
+    def rebuild_at(self) -> datetime:
+        return self.horizon_utc - _REBUILD_MARGIN
+
+    def status_at(self, key: str, now_utc: datetime) -> Optional[MarketComputation]:
+        segs = self.segments.get(key)
+        if not segs:
+            return None
+        i = bisect_right([s.start_utc for s in segs], now_utc) - 1
+        if i < 0:
+            return None
+        return segs[i].as_computation()
+
+    def next_change_after(self, now_utc: datetime) -> datetime:
+        """Earliest segment boundary after now_utc across all markets (or the rebuild point)."""
+        nxt = self.rebuild_at
+        for segs in self.segments.values():
+            i = bisect_right([s.start_utc for s in segs], now_utc)
+            if i < len(segs) and segs[i].start_utc < nxt:
+                nxt = segs[i].start_utc
+        return nxt
+
+    def covers(self, now_utc: datetime) -> bool:
+        return self.built_at <= now_utc < self.rebuild_at
+
+    # -------------------------
+    # Redis (de)serialization
+    # -------------------------
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "epoch": self.epoch,
+                "built_at": self.built_at.timestamp(),
+                "horizon_utc": self.horizon_utc.timestamp(),
+                "markets": [
+                    {
+                        "key": key,
+                        "name": name,
+                        "segments": [
+                            [
+                                s.start_utc.timestamp(),
+                                s.status,
+                                s.next_transition_utc.timestamp() if s.next_transition_utc else None,
+                                s.reason,
+                            ]
+                            for s in self.segments.get(key, [])
+                        ],
+                    }
+                    for key, name in self.names.items()
+                ],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "MarketCalendar":
+        data = json.loads(raw)
+
+        def _dt(ts):
+            return datetime.fromtimestamp(float(ts), tz=dt_timezone.utc) if ts is not None else None
+
+        cal = cls(
+            epoch=str(data["epoch"]),
+            built_at=_dt(data["built_at"]),
+            horizon_utc=_dt(data["horizon_utc"]),
+        )
+        for m in data.get("markets") or []:
+            cal.names[m["key"]] = m.get("name") or m["key"]
+            cal.segments[m["key"]] = [
+                MarketSegment(start_utc=_dt(s[0]), status=s[1], next_transition_utc=_dt(s[2]), reason=s[3] or "")
+                for s in m.get("segments") or []
+            ]
+        return cal
+
+
+# -----------------------------------------------------------------------------
+# Build
+# -----------------------------------------------------------------------------
+def _candidate_instants(market: Market, start_utc: datetime, end_utc: datetime, holidays: Dict[date, MarketHoliday]):
+    """Every UTC instant in (start, end) where compute_market_status may change its answer."""
+    local_start = _localize(market, start_utc)
+    local_end = _localize(market, end_utc)
+    tz = local_start.tzinfo
+
+    day = local_start.date()
+    while day <= local_end.date() + timedelta(days=1):
+        times = [time.min, market.open_time, market.close_time]
+        holiday = holidays.get(day)
+        if holiday is not None and holiday.early_close_time:
+            times.append(holiday.early_close_time)
+        for t in times:
+            if t is None:
+                continue
+            instant = _as_utc(datetime.combine(day, t, tzinfo=tz))
+            if start_utc < instant < end_utc:
+                yield instant
+        day += timedelta(days=1)
+
+
+def _market_segments(
+    market: Market,
+    start_utc: datetime,
+    end_utc: datetime,
+    holidays: Dict[date, MarketHoliday],
+) -> List[MarketSegment]:
+    segments: List[MarketSegment] = []
+    for instant in [start_utc, *sorted(set(_candidate_instants(market, start_utc, end_utc, holidays)))]:
+        local = _localize(market, instant)
+        computed = compute_market_status_local(market, local, holidays.get(local.date()))
+        prev = segments[-1] if segments else None
+        if (
+            prev is not None
+            and prev.status == computed.status
+            and prev.next_transition_utc == computed.next_transition_utc
+            and prev.reason == computed.reason
+        ):
+            continue
+        segments.append(
+            MarketSegment(
+                start_utc=instant,
+                status=computed.status,
+                next_transition_utc=computed.next_transition_utc,
+                reason=computed.reason,
+            )
+        )
+    return segments
+
+
+def build_market_calendar(
+    *,
+    now_utc: Optional[datetime] = None,
+    days: Optional[int] = None,
+    epoch: str = "0",
+) -> MarketCalendar:
+    """Compute segments for all active markets from now_utc over `days` days (two queries)."""
+    now_utc = _as_utc(now_utc or timezone.now()).replace(microsecond=0)
+    days = int(days or getattr(settings, "GLOBAL_MARKETS_CALENDAR_DAYS", 14) or 14)
+    # The rebuild margin must leave real coverage.
+    horizon = now_utc + max(timedelta(days=days), 2 * _REBUILD_MARGIN)
+
+    holidays = {
+        h.date: h
+        for h in MarketHoliday.objects.filter(
+            date__gte=now_utc.date() - timedelta(days=1),
+            date__lte=horizon.date() + timedelta(days=1),
+        )
+    }
+
+    cal = MarketCalendar(epoch=epoch, built_at=now_utc, horizon_utc=horizon)
+    for market in Market.objects.filter(is_active=True).order_by("sort_order", "name"):
+        try:
+            cal.segments[market.key] = _market_segments(market, now_utc, horizon, holidays)
+        except Exception:
+            logger.exception("Failed building calendar for market %s", market.key)
+            continue
+        cal.names[market.key] = market.name
+    return cal
+
+
+# -----------------------------------------------------------------------------
+# Cache
+# -----------------------------------------------------------------------------
+_calendar: Optional[MarketCalendar] = None
+_epoch = RedisEpoch(_CALENDAR_EPOCH_KEY, check_seconds=_EPOCH_CHECK_SECONDS)
+
+
+def _load_from_redis(epoch: str, now_utc: datetime) -> Optional[MarketCalendar]:
+    try:
+        raw = _epoch.client.get(_CALENDAR_KEY)
+        if not raw:
+            return None
+        cal = MarketCalendar.from_json(raw)
+    except Exception:
+        logger.debug("Failed loading %s", _CALENDAR_KEY, exc_info=True)
+        return None
+    if cal.epoch != epoch or not cal.covers(now_utc):
+        return None
+    return cal
+
+
+def _store_in_redis(cal: MarketCalendar) -> None:
+    try:
+        ttl = max(60, int((cal.rebuild_at - cal.built_at).total_seconds()))
+        _epoch.client.set(_CALENDAR_KEY, cal.to_json(), ex=ttl)
+    except Exception:
+        logger.debug("Failed storing %s", _CALENDAR_KEY, exc_info=True)
+
+
+def get_market_calendar(now_utc: Optional[datetime] = None) -> MarketCalendar:
+    """Current calendar: memory, then Redis, then a DB build (stored back to Redis)."""
+    global _calendar
+    now_utc = _as_utc(now_utc or timezone.now())
+    epoch = _epoch.current()
+
+    cal = _calendar
+    if cal is not None and cal.epoch == epoch and cal.covers(now_utc):
+        return cal
+
+    cal = _load_from_redis(epoch, now_utc)
+    if cal is None:
+        cal = build_market_calendar(now_utc=now_utc, epoch=epoch)
+        _store_in_redis(cal)
+        logger.info(
+            "Market calendar built: markets=%s horizon=%s epoch=%s",
+            len(cal.segments),
+            cal.horizon_utc.isoformat(),
+            epoch,
+        )
+    _calendar = cal
+    return cal
+
+
+def invalidate_market_calendar() -> None:
+    """Drop the calendar here, in Redis and (via the epoch) in every other process."""
+    global _calendar
+    _calendar = None
+    _epoch.bump(delete=[_CALENDAR_KEY])
+
+
+__all__ = [
+    "MarketCalendar",
+    "MarketSegment",
+    "build_market_calendar",
+    "get_market_calendar",
+    "invalidate_market_calendar",
+]
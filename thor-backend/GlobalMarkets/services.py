@@ -81,11 +81,18 @@ def compute_market_status(market: Market, *, now_utc: Optional[datetime] = None)
     now_utc = _as_utc(now_utc)
 
     local_now = _localize(market, now_utc)
-    local_date = local_now.date()
+    return compute_market_status_local(market, local_now, _get_holiday(local_now.date()))
+
+
+def compute_market_status_local(
+    market: Market,
+    local_now: datetime,
+    holiday: Optional[MarketHoliday],
+) -> MarketComputation:
+    """compute_market_status for an already-localized time and its (preloaded) holiday row."""
     weekday = int(local_now.weekday())
 
     # Check for US holiday (applies to all markets)
-    holiday = _get_holiday(local_date)
     if holiday and holiday.is_closed:
         # Closed all day - next transition is next business day
         tomorrow = _next_day(local_now)
@@ -4,12 +4,16 @@ GlobalMarkets signals
 Emits events when a Market's status changes.
 Other apps (e.g. FutureTrading) can listen to these
 without GlobalMarkets knowing about them.
+
+Also invalidates the precomputed market calendar on Market / MarketHoliday edits.
 """
 
 import logging
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver, Signal
-from .models import Market
+from .market_calendar import invalidate_market_calendar
+from .models import Market, MarketHoliday
 
 logger = logging.getLogger(__name__)
 
@@ -64,3 +68,22 @@ def on_market_status_change(sender, instance: Market, **kwargs):
         market_opened.send(sender=sender, instance=instance)
     elif new_status == "CLOSED":
         market_closed.send(sender=sender, instance=instance)
+
+
+# Saving only these fields is the heartbeat persisting a transition, not an edit.
+_STATUS_ONLY_FIELDS = frozenset({"status", "status_changed_at", "updated_at"})
+
+
+@receiver(post_save, sender=Market, dispatch_uid="market_calendar_market_saved")
+def _on_market_saved(sender, instance: Market, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= _STATUS_ONLY_FIELDS:
+        return
+    # After commit, so other processes rebuild from the edited rows.
+    transaction.on_commit(invalidate_market_calendar)
+
+
+@receiver(post_delete, sender=Market, dispatch_uid="market_calendar_market_deleted")
+@receiver(post_save, sender=MarketHoliday, dispatch_uid="market_calendar_holiday_saved")
+@receiver(post_delete, sender=MarketHoliday, dispatch_uid="market_calendar_holiday_deleted")
+def _on_calendar_input_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_market_calendar)
@@ -4,6 +4,7 @@ from django.db import transaction
 from LiveData.schwab.signal_control import suppress_schwab_subscription_signals
 
 from .models import Instrument
+from .models import InstrumentBarRollup
 from .models import InstrumentIntraday
 from .models import MarketTrading24Hour
 from .models import Rolling52WeekStats
@@ -219,6 +220,26 @@ class InstrumentIntradayAdmin(admin.ModelAdmin):
     readonly_fields = ("timestamp_minute",)
 
 
+@admin.register(InstrumentBarRollup)
+class InstrumentBarRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "bucket_start",
+        "timeframe",
+        "symbol",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "bar_count",
+    )
+    list_filter = ("timeframe", "symbol")
+    search_fields = ("symbol",)
+    ordering = ("-bucket_start", "timeframe", "symbol")
+    date_hierarchy = "bucket_start"
+    readonly_fields = ("first_minute", "last_minute", "updated_at")
+
+
 @admin.register(MarketTrading24Hour)
 class MarketTrading24HourAdmin(admin.ModelAdmin):
     list_display = (
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+
+from Instruments.models.intraday import InstrumentIntraday
+from Instruments.services.bar_rollups import ROLLUP_TIMEFRAMES, rebuild_bar_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild 5m/15m/1h/1d bar rollups from InstrumentIntraday 1m history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--start",
+            type=str,
+            default=None,
+            help="First UTC day (YYYY-MM-DD). Default: oldest 1m bar.",
+        )
+        parser.add_argument(
+            "--end",
+            type=str,
+            default=None,
+            help="Last UTC day, inclusive (YYYY-MM-DD). Default: today (UTC).",
+        )
+        parser.add_argument(
+            "--timeframes",
+            nargs="*",
+            default=None,
+            help=f"Subset of {', '.join(ROLLUP_TIMEFRAMES)}. Default: all.",
+        )
+        parser.add_argument(
+            "--symbols",
+            nargs="*",
+            default=None,
+            help="Optional list of symbols to rebuild. Default: all symbols.",
+        )
+
+    def handle(self, *args, **options):
+        timeframes = options.get("timeframes") or list(ROLLUP_TIMEFRAMES)
+        unknown = [tf for tf in timeframes if tf not in ROLLUP_TIMEFRAMES]
+        if unknown:
+            raise CommandError(f"Unknown timeframe(s): {', '.join(unknown)}")
+
+        try:
+            start_day = date.fromisoformat(options["start"]) if options.get("start") else None
+            end_day = (
+                date.fromisoformat(options["end"])
+                if options.get("end")
+                else datetime.now(dt_timezone.utc).date()
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if start_day is None:
+            oldest = InstrumentIntraday.objects.aggregate(oldest=Min("timestamp_minute"))["oldest"]
+            if oldest is None:
+                self.stdout.write(self.style.WARNING("No 1m bars stored; nothing to backfill."))
+                return
+            start_day = oldest.astimezone(dt_timezone.utc).date()
+
+        if end_day < start_day:
+            raise CommandError("--end must not be before --start")
+
+        start = datetime.combine(start_day, time.min, tzinfo=dt_timezone.utc)
+        end = datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=dt_timezone.utc)
+
+        result = rebuild_bar_rollups(start, end, timeframes=timeframes, symbols=options.get("symbols"))
+
+        buckets = " ".join(f"{tf}={n}" for tf, n in result.buckets.items())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"backfill_bar_rollups done: start={result.start:%Y-%m-%d} end={result.end:%Y-%m-%d} "
+                f"days={result.chunks} {buckets}"
+            )
+        )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from Instruments.services.intraday_partitions import is_partitioned, prune_intraday_partitions
+
+
+class Command(BaseCommand):
+    help = "Drop (or detach) daily InstrumentIntraday partitions older than the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=None,
+            help="Days of 1m history to keep (UTC). Default: settings.INTRADAY_RETENTION_DAYS.",
+        )
+        parser.add_argument(
+            "--detach",
+            action="store_true",
+            help="Detach old partitions (keep them as standalone tables) instead of dropping them.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List partitions that would be removed without changing anything.",
+        )
+
+    def handle(self, *args, **options):
+        keep_days = options.get("keep_days")
+        if keep_days is None:
+            keep_days = int(getattr(settings, "INTRADAY_RETENTION_DAYS", 400))
+        if int(keep_days) < 1:
+            raise CommandError("--keep-days must be >= 1")
+
+        if not is_partitioned():
+            self.stdout.write(self.style.WARNING("InstrumentIntraday is not partitioned; nothing to do."))
+            return
+
+        result = prune_intraday_partitions(
+            int(keep_days),
+            detach_only=bool(options.get("detach")),
+            dry_run=bool(options.get("dry_run")),
+        )
+
+        action = "would remove" if options.get("dry_run") else ("detached" if options.get("detach") else "dropped")
+        for name in result.removed:
+            self.stdout.write(f"{action}: {name}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"prune_intraday_partitions done: cutoff={result.cutoff} {action}={len(result.removed)} kept={result.kept}"
+            )
+        )
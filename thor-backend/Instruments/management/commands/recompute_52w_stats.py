@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from datetime import date
 
 from django.core.management.base import BaseCommand
@@ -58,13 +59,16 @@ class Command(BaseCommand):
         else:
             asof_date = timezone.now().astimezone(timezone.utc).date()
 
+        started = time.monotonic()
         result = recompute_rolling_52w_from_24h(asof_date=asof_date, window_days=int(days), symbols=symbols)
+        elapsed = time.monotonic() - started
 
         self.stdout.write(
             self.style.SUCCESS(
                 "recompute_52w_stats done: "
                 f"asof={result.asof_date} window_start={result.window_start} window_days={result.window_days} "
-                f"symbols_seen={result.symbols_seen} updated={result.updated_rows} skipped_no_data={result.skipped_no_data}"
+                f"symbols_seen={result.symbols_seen} updated={result.updated_rows} skipped_no_data={result.skipped_no_data} "
+                f"elapsed={elapsed:.2f}s"
             )
         )
 
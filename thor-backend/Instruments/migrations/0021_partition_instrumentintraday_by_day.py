@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+# Convert Instruments_instrumentintraday into a table RANGE-partitioned by UTC day.
+#
+# - PostgreSQL requires the primary key to include the partition key, so the
+#   physical PK becomes (id, timestamp_minute). Django still treats `id` as the
+#   primary key; ids stay unique via the shared sequence.
+# - The unique constraint and secondary indexes are recreated on the parent with
+#   their original names (they cascade to every partition).
+# - One partition per day present in the old table, today + 7 days ahead, and a
+#   DEFAULT partition as a safety net. Instruments.services.intraday_partitions
+#   keeps creating upcoming days from the heartbeat.
+#
+# Idempotent: does nothing if the table is missing or already partitioned.
+CONVERT_SQL = r"""
+DO $$
+DECLARE
+    parent_reg regclass := to_regclass('public."Instruments_instrumentintraday"');
+    idx record;
+    con record;
+    index_defs text[] := ARRAY[]::text[];
+    constraint_defs text[] := ARRAY[]::text[];
+    def text;
+    d date;
+BEGIN
+    IF parent_reg IS NULL THEN
+        RETURN;
+    END IF;
+    IF (SELECT relkind FROM pg_class WHERE oid = parent_reg) = 'p' THEN
+        RETURN;
+    END IF;
+
+    LOCK TABLE public."Instruments_instrumentintraday" IN ACCESS EXCLUSIVE MODE;
+    ALTER TABLE public."Instruments_instrumentintraday" RENAME TO "Instruments_instrumentintraday_legacy";
+
+    -- Free the PK name for the new parent.
+    FOR con IN
+        SELECT conname
+        FROM pg_constraint
+        WHERE conrelid = 'public."Instruments_instrumentintraday_legacy"'::regclass
+          AND contype = 'p'
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE public."Instruments_instrumentintraday_legacy" RENAME CONSTRAINT %I TO %I',
+            con.conname,
+            left(con.conname, 55) || '_legacy'
+        );
+    END LOOP;
+
+    -- Unique constraints (other than the PK): remember, then drop to free the names.
+    FOR con IN
+        SELECT conname, pg_get_constraintdef(oid) AS condef
+        FROM pg_constraint
+        WHERE conrelid = 'public."Instruments_instrumentintraday_legacy"'::regclass
+          AND contype = 'u'
+    LOOP
+        constraint_defs := constraint_defs || format('ADD CONSTRAINT %I %s', con.conname, con.condef);
+        EXECUTE format('ALTER TABLE public."Instruments_instrumentintraday_legacy" DROP CONSTRAINT %I', con.conname);
+    END LOOP;
+
+    -- Plain secondary indexes: remember their definitions, then rename the old ones.
+    FOR idx IN
+        SELECT c.relname AS name, pg_get_indexdef(i.indexrelid) AS indexdef
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = 'public."Instruments_instrumentintraday_legacy"'::regclass
+          AND NOT i.indisprimary
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint pc WHERE pc.conindid = i.indexrelid)
+    LOOP
+        index_defs := index_defs || replace(
+            idx.indexdef,
+            'ON public."Instruments_instrumentintraday_legacy"',
+            'ON public."Instruments_instrumentintraday"'
+        );
+        EXECUTE format('ALTER INDEX public.%I RENAME TO %I', idx.name, left(idx.name, 55) || '_legacy');
+    END LOOP;
+
+    CREATE SEQUENCE IF NOT EXISTS public."Instruments_instrumentintraday_part_id_seq";
+    PERFORM setval(
+        'public."Instruments_instrumentintraday_part_id_seq"',
+        COALESCE((SELECT max(id) FROM public."Instruments_instrumentintraday_legacy"), 0) + 1,
+        false
+    );
+
+    CREATE TABLE public."Instruments_instrumentintraday" (
+        id bigint NOT NULL DEFAULT nextval('public."Instruments_instrumentintraday_part_id_seq"'),
+        timestamp_minute timestamp with time zone NOT NULL,
+        symbol varchar(32) NOT NULL,
+        open_1m numeric(18, 4) NOT NULL,
+        high_1m numeric(18, 4) NOT NULL,
+        low_1m numeric(18, 4) NOT NULL,
+        close_1m numeric(18, 4) NOT NULL,
+        volume_1m bigint NOT NULL,
+        bid_last numeric(18, 4) NULL,
+        ask_last numeric(18, 4) NULL,
+        spread_last numeric(18, 4) NULL,
+        created_at timestamp with time zone NOT NULL,
+        CONSTRAINT "Instruments_instrumentintraday_pkey" PRIMARY KEY (id, timestamp_minute)
+    ) PARTITION BY RANGE (timestamp_minute);
+
+    ALTER SEQUENCE public."Instruments_instrumentintraday_part_id_seq"
+        OWNED BY public."Instruments_instrumentintraday".id;
+
+    FOREACH def IN ARRAY constraint_defs LOOP
+        EXECUTE 'ALTER TABLE public."Instruments_instrumentintraday" ' || def;
+    END LOOP;
+    FOREACH def IN ARRAY index_defs LOOP
+        EXECUTE def;
+    END LOOP;
+
+    CREATE TABLE public."Instruments_instrumentintraday_default"
+        PARTITION OF public."Instruments_instrumentintraday" DEFAULT;
+
+    FOR d IN
+        SELECT DISTINCT (timestamp_minute AT TIME ZONE 'UTC')::date
+        FROM public."Instruments_instrumentintraday_legacy"
+        UNION
+        SELECT generate_series(
+            (now() AT TIME ZONE 'UTC')::date,
+            (now() AT TIME ZONE 'UTC')::date + 7,
+            interval '1 day'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE public.%I PARTITION OF public."Instruments_instrumentintraday" FOR VALUES FROM (%L) TO (%L)',
+            'Instruments_instrumentintraday_p' || to_char(d, 'YYYYMMDD'),
+            d::timestamp AT TIME ZONE 'UTC',
+            (d + 1)::timestamp AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+
+    INSERT INTO public."Instruments_instrumentintraday" (
+        id, timestamp_minute, symbol, open_1m, high_1m, low_1m, close_1m,
+        volume_1m, bid_last, ask_last, spread_last, created_at
+    )
+    SELECT
+        id, timestamp_minute, symbol, open_1m, high_1m, low_1m, close_1m,
+        volume_1m, bid_last, ask_last, spread_last, created_at
+    FROM public."Instruments_instrumentintraday_legacy";
+
+    DROP TABLE public."Instruments_instrumentintraday_legacy";
+END $$;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("Instruments", "0020_markettrading24hour_cleanup_legacy"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=CONVERT_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-16 20:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Instruments', '0021_partition_instrumentintraday_by_day'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InstrumentBarRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timeframe', models.CharField(choices=[('5m', '5 minutes'), ('15m', '15 minutes'), ('1h', '1 hour'), ('1d', '1 day')], max_length=8)),
+                ('symbol', models.CharField(max_length=32)),
+                ('bucket_start', models.DateTimeField(help_text='Bucket start (UTC)')),
+                ('open', models.DecimalField(decimal_places=4, max_digits=18)),
+                ('high', models.DecimalField(decimal_places=4, max_digits=18)),
+                ('low', models.DecimalField(decimal_places=4, max_digits=18)),
+                ('close', models.DecimalField(decimal_places=4, max_digits=18)),
+                ('volume', models.BigIntegerField(default=0)),
+                ('bar_count', models.PositiveIntegerField(default=0, help_text='1m bars merged into this bucket')),
+                ('first_minute', models.DateTimeField()),
+                ('last_minute', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Bar Rollup',
+                'verbose_name_plural': 'Bar Rollups',
+                'db_table': 'Instruments_instrumentbarrollup',
+                'constraints': [models.UniqueConstraint(fields=('timeframe', 'symbol', 'bucket_start'), name='uniq_bar_rollup_tf_sym_bucket')],
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@ from .instrument import Instrument
 from .intraday import InstrumentIntraday
 from .market_24h import MarketTrading24Hour
 from .market_52w import Rolling52WeekStats, week52_extreme_changed
+from .rollup import InstrumentBarRollup
 from ThorTrading.studies.futures_total.models.rtd import (
     ContractWeight,
     InstrumentCategory,
@@ -13,6 +14,7 @@ from .watchlist import UserInstrumentWatchlistItem
 __all__ = [
     "Instrument",
     "InstrumentIntraday",
+    "InstrumentBarRollup",
     "MarketTrading24Hour",
     "Rolling52WeekStats",
     "week52_extreme_changed",
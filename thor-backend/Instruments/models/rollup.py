@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.db import models
+
+
+class InstrumentBarRollup(models.Model):
+    """
+    Coarser OHLCV bars (5m / 15m / 1h / 1d) materialized from InstrumentIntraday.
+
+    One row per (timeframe, symbol, bucket_start). Buckets are aligned to the
+    UTC epoch, so hourly buckets start on the hour and daily buckets at 00:00 UTC.
+
+    first_minute / last_minute record which 1m bars produced open / close, so
+    merging minute bars into a bucket is order-independent
+    (see Instruments.services.bar_rollups).
+    """
+
+    class Timeframe(models.TextChoices):
+        M5 = "5m", "5 minutes"
+        M15 = "15m", "15 minutes"
+        H1 = "1h", "1 hour"
+        D1 = "1d", "1 day"
+
+    timeframe = models.CharField(max_length=8, choices=Timeframe.choices)
+    symbol = models.CharField(max_length=32)
+    bucket_start = models.DateTimeField(help_text="Bucket start (UTC)")
+
+    open = models.DecimalField(max_digits=18, decimal_places=4)
+    high = models.DecimalField(max_digits=18, decimal_places=4)
+    low = models.DecimalField(max_digits=18, decimal_places=4)
+    close = models.DecimalField(max_digits=18, decimal_places=4)
+    volume = models.BigIntegerField(default=0)
+    bar_count = models.PositiveIntegerField(default=0, help_text="1m bars merged into this bucket")
+
+    first_minute = models.DateTimeField()
+    last_minute = models.DateTimeField()
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "Instruments_instrumentbarrollup"
+        verbose_name = "Bar Rollup"
+        verbose_name_plural = "Bar Rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["timeframe", "symbol", "bucket_start"],
+                name="uniq_bar_rollup_tf_sym_bucket",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.symbol} {self.timeframe} {self.bucket_start:%Y-%m-%d %H:%M} "
+            f"O={self.open} H={self.high} L={self.low} C={self.close}"
+        )
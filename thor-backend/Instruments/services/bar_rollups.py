@@ -0,0 +1,289 @@
+"""Multi-timeframe bar rollups (5m / 15m / 1h / 1d) materialized from 1m bars.
+
+InstrumentBarRollup holds one row per (timeframe, symbol, bucket). It is kept
+current from the closed-bar flush (merge_bars_into_rollups, called with the 1m
+rows a flush actually inserted) and rebuilt for history by
+rebuild_bar_rollups (backfill_bar_rollups command).
+
+Merging is order-independent: open/close come from the earliest/latest minute
+seen for the bucket (first_minute/last_minute), high/low are GREATEST/LEAST and
+volume is summed, so bars arriving late or in separate batches fold in cleanly.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import connection, transaction
+
+from Instruments.models.intraday import InstrumentIntraday
+from Instruments.models.rollup import InstrumentBarRollup
+
+logger = logging.getLogger(__name__)
+
+# Timeframe -> bucket width in seconds. Buckets are aligned to the UTC epoch.
+ROLLUP_TIMEFRAMES: Dict[str, int] = {
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+
+def bucket_start(ts: datetime, seconds: int) -> datetime:
+    epoch = int(ts.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % seconds, tz=dt_timezone.utc)
+
+
+def _rollup_rows(rows: Iterable, timeframes: Sequence[str]) -> Dict[Tuple[str, str, datetime], dict]:
+    """Fold 1m rows into per-(timeframe, symbol, bucket) partials."""
+    out: Dict[Tuple[str, str, datetime], dict] = {}
+    for r in rows:
+        ts = r.timestamp_minute
+        if ts is None or r.open_1m is None or r.close_1m is None:
+            continue
+        for tf in timeframes:
+            key = (tf, r.symbol, bucket_start(ts, ROLLUP_TIMEFRAMES[tf]))
+            st = out.get(key)
+            if st is None:
+                out[key] = {
+                    "open": r.open_1m,
+                    "high": r.high_1m,
+                    "low": r.low_1m,
+                    "close": r.close_1m,
+                    "volume": int(r.volume_1m or 0),
+                    "bar_count": 1,
+                    "first_minute": ts,
+                    "last_minute": ts,
+                }
+                continue
+            if ts < st["first_minute"]:
+                st["open"] = r.open_1m
+                st["first_minute"] = ts
+            if ts >= st["last_minute"]:
+                st["close"] = r.close_1m
+                st["last_minute"] = ts
+            if r.high_1m is not None and (st["high"] is None or r.high_1m > st["high"]):
+                st["high"] = r.high_1m
+            if r.low_1m is not None and (st["low"] is None or r.low_1m < st["low"]):
+                st["low"] = r.low_1m
+            st["volume"] += int(r.volume_1m or 0)
+            st["bar_count"] += 1
+    return out
+
+
+_MERGE_ROLLUP_SQL = """
+INSERT INTO {t} AS r (
+    timeframe, symbol, bucket_start, open, high, low, close,
+    volume, bar_count, first_minute, last_minute, updated_at
+)
+SELECT v.timeframe, v.symbol, v.bucket_start, v.open, v.high, v.low, v.close,
+       v.volume, v.bar_count, v.first_minute, v.last_minute, now()
+FROM (VALUES {values}) AS v (
+    timeframe, symbol, bucket_start, open, high, low, close,
+    volume, bar_count, first_minute, last_minute
+)
+ON CONFLICT (timeframe, symbol, bucket_start) DO UPDATE SET
+    open = CASE WHEN EXCLUDED.first_minute < r.first_minute THEN EXCLUDED.open ELSE r.open END,
+    first_minute = LEAST(r.first_minute, EXCLUDED.first_minute),
+    close = CASE WHEN EXCLUDED.last_minute >= r.last_minute THEN EXCLUDED.close ELSE r.close END,
+    last_minute = GREATEST(r.last_minute, EXCLUDED.last_minute),
+    high = GREATEST(r.high, EXCLUDED.high),
+    low = LEAST(r.low, EXCLUDED.low),
+    volume = r.volume + EXCLUDED.volume,
+    bar_count = r.bar_count + EXCLUDED.bar_count,
+    updated_at = now()
+"""
+
+_MERGE_VALUE_ROW = (
+    "(%s, %s, %s::timestamptz, %s::numeric, %s::numeric, %s::numeric, %s::numeric, "
+    "%s::bigint, %s::integer, %s::timestamptz, %s::timestamptz)"
+)
+
+
+def _merge_partials_pg(partials: Dict[Tuple[str, str, datetime], dict]) -> int:
+    qn = connection.ops.quote_name
+    params: list = []
+    for (tf, sym, bucket), st in partials.items():
+        params.extend([
+            tf, sym, bucket, st["open"], st["high"], st["low"], st["close"],
+            st["volume"], st["bar_count"], st["first_minute"], st["last_minute"],
+        ])
+    sql = _MERGE_ROLLUP_SQL.format(
+        t=qn(InstrumentBarRollup._meta.db_table),
+        values=", ".join([_MERGE_VALUE_ROW] * len(partials)),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return max(0, cursor.rowcount or 0)
+
+
+def _merge_partials_orm(partials: Dict[Tuple[str, str, datetime], dict]) -> int:
+    merged = 0
+    for (tf, sym, bucket), st in partials.items():
+        obj = (
+            InstrumentBarRollup.objects.select_for_update()
+            .filter(timeframe=tf, symbol=sym, bucket_start=bucket)
+            .first()
+        )
+        if obj is None:
+            InstrumentBarRollup.objects.create(timeframe=tf, symbol=sym, bucket_start=bucket, **st)
+            merged += 1
+            continue
+        if st["first_minute"] < obj.first_minute:
+            obj.open = st["open"]
+            obj.first_minute = st["first_minute"]
+        if st["last_minute"] >= obj.last_minute:
+            obj.close = st["close"]
+            obj.last_minute = st["last_minute"]
+        obj.high = max(obj.high, st["high"])
+        obj.low = min(obj.low, st["low"])
+        obj.volume += st["volume"]
+        obj.bar_count += st["bar_count"]
+        obj.save()
+        merged += 1
+    return merged
+
+
+def merge_bars_into_rollups(rows: Iterable, timeframes: Optional[Sequence[str]] = None) -> int:
+    """
+    Merge newly inserted 1m bars into every rollup timeframe.
+
+    `rows` are InstrumentIntraday instances or anything with the same
+    *_1m / timestamp_minute / symbol attributes. Only pass bars that were not
+    stored before, otherwise volume/bar_count are counted twice. One statement
+    per call on PostgreSQL. Returns the number of buckets touched.
+    """
+    partials = _rollup_rows(rows, list(timeframes or ROLLUP_TIMEFRAMES))
+    if not partials:
+        return 0
+    if connection.vendor == "postgresql":
+        return _merge_partials_pg(partials)
+    with transaction.atomic():
+        return _merge_partials_orm(partials)
+
+
+# Full recompute of every bucket in [start, end) from InstrumentIntraday.
+_REBUILD_ROLLUP_SQL = """
+INSERT INTO {t} AS r (
+    timeframe, symbol, bucket_start, open, high, low, close,
+    volume, bar_count, first_minute, last_minute, updated_at
+)
+SELECT
+    %s,
+    b.symbol,
+    to_timestamp(floor(extract(epoch FROM b.timestamp_minute) / %s) * %s) AS bucket,
+    (array_agg(b.open_1m ORDER BY b.timestamp_minute ASC))[1],
+    max(b.high_1m),
+    min(b.low_1m),
+    (array_agg(b.close_1m ORDER BY b.timestamp_minute DESC))[1],
+    COALESCE(sum(b.volume_1m), 0),
+    count(*),
+    min(b.timestamp_minute),
+    max(b.timestamp_minute),
+    now()
+FROM {intraday} AS b
+WHERE b.timestamp_minute >= %s AND b.timestamp_minute < %s {symbol_filter}
+GROUP BY b.symbol, bucket
+ON CONFLICT (timeframe, symbol, bucket_start) DO UPDATE SET
+    open = EXCLUDED.open,
+    high = EXCLUDED.high,
+    low = EXCLUDED.low,
+    close = EXCLUDED.close,
+    volume = EXCLUDED.volume,
+    bar_count = EXCLUDED.bar_count,
+    first_minute = EXCLUDED.first_minute,
+    last_minute = EXCLUDED.last_minute,
+    updated_at = now()
+"""
+
+
+@dataclass
+class RebuildResult:
+    start: datetime
+    end: datetime
+    chunks: int = 0
+    buckets: Dict[str, int] = field(default_factory=dict)
+
+
+def _utc_day_floor(ts: datetime) -> datetime:
+    ts = ts.astimezone(dt_timezone.utc)
+    return datetime.combine(ts.date(), time.min, tzinfo=dt_timezone.utc)
+
+
+def _rebuild_chunk_pg(tf: str, start: datetime, end: datetime, symbols: Optional[List[str]]) -> int:
+    qn = connection.ops.quote_name
+    seconds = ROLLUP_TIMEFRAMES[tf]
+    params: list = [tf, seconds, seconds, start, end]
+    symbol_filter = ""
+    if symbols:
+        symbol_filter = "AND b.symbol = ANY(%s)"
+        params.append(list(symbols))
+    sql = _REBUILD_ROLLUP_SQL.format(
+        t=qn(InstrumentBarRollup._meta.db_table),
+        intraday=qn(InstrumentIntraday._meta.db_table),
+        symbol_filter=symbol_filter,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return max(0, cursor.rowcount or 0)
+
+
+def _rebuild_chunk_orm(tf: str, start: datetime, end: datetime, symbols: Optional[List[str]]) -> int:
+    qs = InstrumentIntraday.objects.filter(timestamp_minute__gte=start, timestamp_minute__lt=end)
+    if symbols:
+        qs = qs.filter(symbol__in=symbols)
+    partials = _rollup_rows(qs.order_by("timestamp_minute").iterator(), [tf])
+
+    stale = InstrumentBarRollup.objects.filter(timeframe=tf, bucket_start__gte=start, bucket_start__lt=end)
+    if symbols:
+        stale = stale.filter(symbol__in=symbols)
+    stale.delete()
+    return _merge_partials_orm(partials) if partials else 0
+
+
+def rebuild_bar_rollups(
+    start: datetime,
+    end: datetime,
+    *,
+    timeframes: Optional[Sequence[str]] = None,
+    symbols: Optional[Sequence[str]] = None,
+) -> RebuildResult:
+    """
+    Recompute rollups for [start, end) from InstrumentIntraday, one UTC day per statement.
+
+    The range is widened to whole UTC days so every bucket (daily included)
+    is rebuilt from complete data. Existing buckets are overwritten.
+    """
+    tfs = [tf for tf in (timeframes or ROLLUP_TIMEFRAMES) if tf in ROLLUP_TIMEFRAMES]
+    syms = [s.strip().upper() for s in (symbols or []) if s and s.strip()] or None
+
+    day = _utc_day_floor(start)
+    stop = _utc_day_floor(end)
+    if stop < end:
+        stop += timedelta(days=1)
+
+    result = RebuildResult(start=day, end=stop, buckets={tf: 0 for tf in tfs})
+    rebuild = _rebuild_chunk_pg if connection.vendor == "postgresql" else _rebuild_chunk_orm
+
+    while day < stop:
+        chunk_end = day + timedelta(days=1)
+        with transaction.atomic():
+            for tf in tfs:
+                result.buckets[tf] += rebuild(tf, day, chunk_end, syms)
+        result.chunks += 1
+        day = chunk_end
+
+    return result
+
+
+__all__ = [
+    "ROLLUP_TIMEFRAMES",
+    "RebuildResult",
+    "bucket_start",
+    "merge_bars_into_rollups",
+    "rebuild_bar_rollups",
+]
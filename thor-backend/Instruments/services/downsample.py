@@ -0,0 +1,226 @@
+"""Server-side downsampling of intraday bar series for charts.
+
+Two reductions, both vectorized with NumPy:
+
+  - ohlc_buckets: fixed-width time buckets (first open, max high, min low,
+    last close, summed volume). Candles stay truthful at any zoom level.
+  - lttb_indices: Largest-Triangle-Three-Buckets on a single series (close),
+    for line charts; keeps the visually significant points.
+
+Either way the output size is bounded by the requested point count, so a
+multi-month range costs the same payload as a single day. Once the bucket is
+at least 5m wide the series is read from InstrumentBarRollup instead of the
+1m table (source_timeframe_for), so long ranges never load every minute.
+
+NumPy is optional at import time; callers check NUMPY_AVAILABLE.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from Instruments.models.intraday import InstrumentIntraday
+from Instruments.models.rollup import InstrumentBarRollup
+from Instruments.services.bar_rollups import ROLLUP_TIMEFRAMES
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = np is not None
+
+# Readable series resolutions (seconds): the 1m table plus the rollup timeframes.
+SOURCE_TIMEFRAMES = {"1m": 60, **ROLLUP_TIMEFRAMES}
+
+# Candidate bucket widths (seconds); the smallest one that fits `points` wins,
+# so bucket edges land on round clock times.
+_BUCKET_STEPS = (
+    60, 120, 180, 300, 600, 900, 1800,
+    3600, 7200, 10800, 14400, 21600, 43200,
+    86400, 2 * 86400, 7 * 86400,
+)
+
+
+class Series(NamedTuple):
+    """Column arrays, oldest first. t is epoch seconds (int64); the rest float64."""
+
+    t: "np.ndarray"
+    o: "np.ndarray"
+    h: "np.ndarray"
+    l: "np.ndarray"
+    c: "np.ndarray"
+    v: "np.ndarray"
+
+    @property
+    def size(self) -> int:
+        return int(self.t.shape[0])
+
+
+def load_series(symbol: str, start: datetime, end: datetime, timeframe: str = "1m") -> Series:
+    """
+    Bars for `symbol` in [start, end) as NumPy columns (prices cast to float in SQL).
+
+    "1m" reads InstrumentIntraday; coarser timeframes read InstrumentBarRollup.
+    """
+    if timeframe == "1m":
+        qs = InstrumentIntraday.objects.filter(
+            symbol=symbol, timestamp_minute__gte=start, timestamp_minute__lt=end
+        ).order_by("timestamp_minute")
+        ts_field, price_fields, volume_field = "timestamp_minute", ("open_1m", "high_1m", "low_1m", "close_1m"), "volume_1m"
+    else:
+        qs = InstrumentBarRollup.objects.filter(
+            timeframe=timeframe, symbol=symbol, bucket_start__gte=start, bucket_start__lt=end
+        ).order_by("bucket_start")
+        ts_field, price_fields, volume_field = "bucket_start", ("open", "high", "low", "close"), "volume"
+
+    rows = qs.annotate(
+        of=Cast(price_fields[0], FloatField()),
+        hf=Cast(price_fields[1], FloatField()),
+        lf=Cast(price_fields[2], FloatField()),
+        cf=Cast(price_fields[3], FloatField()),
+    ).values_list(ts_field, "of", "hf", "lf", "cf", volume_field)
+
+    ts, o, h, l, c, v = [], [], [], [], [], []
+    for row in rows.iterator(chunk_size=10000):
+        ts.append(row[0].timestamp())
+        o.append(row[1])
+        h.append(row[2])
+        l.append(row[3])
+        c.append(row[4])
+        v.append(row[5] or 0)
+
+    return Series(
+        t=np.asarray(ts, dtype=np.int64),
+        o=np.asarray(o, dtype=np.float64),
+        h=np.asarray(h, dtype=np.float64),
+        l=np.asarray(l, dtype=np.float64),
+        c=np.asarray(c, dtype=np.float64),
+        v=np.asarray(v, dtype=np.float64),
+    )
+
+
+def bucket_seconds_for(span_seconds: float, points: int) -> int:
+    """Smallest round bucket width that keeps `span_seconds` within `points` buckets."""
+    points = max(1, int(points))
+    for step in _BUCKET_STEPS:
+        if span_seconds / step <= points:
+            return step
+    days = int(-(-span_seconds // (points * 86400)))
+    return max(1, days) * 86400
+
+
+def plan_bucket_seconds(span_seconds: float, points: int, min_seconds: int = 60) -> int:
+    """Bucket width for `points` rows over `span_seconds`, never finer than `min_seconds`."""
+    # Epoch-aligned buckets can straddle both ends of the span: leave room for one extra.
+    return max(bucket_seconds_for(span_seconds, max(1, points - 1)), int(min_seconds))
+
+
+def source_timeframe_for(bucket_seconds: int) -> str:
+    """Coarsest SOURCE_TIMEFRAMES entry whose buckets tile `bucket_seconds` exactly."""
+    best = "1m"
+    for tf, seconds in SOURCE_TIMEFRAMES.items():
+        if bucket_seconds % seconds == 0 and seconds > SOURCE_TIMEFRAMES[best]:
+            best = tf
+    return best
+
+
+def ohlc_buckets(series: Series, width: int) -> Series:
+    """Aggregate into epoch-aligned buckets of `width` seconds (empty buckets are skipped)."""
+    if series.size == 0:
+        return series
+
+    bucket = series.t // width
+    # Series is sorted by time, so each bucket is one contiguous run.
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], series.size] - 1
+
+    return Series(
+        t=bucket[starts] * width,
+        o=series.o[starts],
+        h=np.maximum.reduceat(series.h, starts),
+        l=np.minimum.reduceat(series.l, starts),
+        c=series.c[ends],
+        v=np.add.reduceat(series.v, starts),
+    )
+
+
+def lttb_indices(x: "np.ndarray", y: "np.ndarray", threshold: int) -> "np.ndarray":
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Each inner bucket keeps the
+    point forming the largest triangle with the previously kept point and the
+    mean of the next bucket; the area is computed for a whole bucket at once.
+    """
+    n = int(x.shape[0])
+    if threshold >= n or n < 3:
+        return np.arange(n)
+    if threshold < 3:
+        return np.array([0, n - 1], dtype=np.int64)
+
+    x = x.astype(np.float64, copy=False)
+    y = y.astype(np.float64, copy=False)
+
+    # Bucket edges over the inner points 1..n-2.
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    out = np.empty(threshold, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < threshold - 1:
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            avg_x = x[nlo:nhi].mean()
+            avg_y = y[nlo:nhi].mean()
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - avg_x) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (avg_y - ay))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample(
+    series: Series, points: int, bucket_seconds: int, mode: str = "ohlc", source_seconds: int = 60
+) -> tuple[Series, Optional[int]]:
+    """
+    Reduce `series` to at most `points` rows. Returns (series, bucket_seconds).
+
+    mode="ohlc": `bucket_seconds`-wide time buckets (source_seconds when untouched).
+    mode="lttb": LTTB on close; rows are original source bars (bucket_seconds None).
+    """
+    if series.size <= points:
+        return series, (source_seconds if mode == "ohlc" else None)
+
+    if mode == "lttb":
+        idx = lttb_indices(series.t, series.c, points)
+        return Series(*(col[idx] for col in series)), None
+
+    return ohlc_buckets(series, bucket_seconds), bucket_seconds
+
+
+__all__ = [
+    "NUMPY_AVAILABLE",
+    "SOURCE_TIMEFRAMES",
+    "Series",
+    "load_series",
+    "bucket_seconds_for",
+    "plan_bucket_seconds",
+    "source_timeframe_for",
+    "ohlc_buckets",
+    "lttb_indices",
+    "downsample",
+]
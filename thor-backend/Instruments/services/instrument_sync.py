@@ -72,6 +72,7 @@ def upsert_quote_source_map(instrument: Instrument) -> None:
 
     key = getattr(settings, "INSTRUMENT_QUOTE_SOURCE_HASH", "instruments:quote_source")
     live_data_redis.client.hset(key, sym, (instrument.quote_source or "AUTO").upper())
+    live_data_redis.config_cache.invalidate(key)
 
 
 def remove_quote_source_map(symbol: str) -> None:
@@ -82,3 +83,4 @@ def remove_quote_source_map(symbol: str) -> None:
         return
     key = getattr(settings, "INSTRUMENT_QUOTE_SOURCE_HASH", "instruments:quote_source")
     live_data_redis.client.hdel(key, sym)
+    live_data_redis.config_cache.invalidate(key)
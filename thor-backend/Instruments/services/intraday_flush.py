@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import csv
+import io
 import logging
+import math
+import time
 from decimal import Decimal
 from datetime import date, datetime, timedelta, timezone as dt_timezone
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connection, transaction
 from django.db.models import Max, Min, Sum
 
 from Instruments.models.intraday import InstrumentIntraday
 from Instruments.models.market_24h import MarketTrading24Hour
+from Instruments.services.bar_rollups import merge_bars_into_rollups
 from LiveData.shared.redis_client import live_data_redis
 
 logger = logging.getLogger(__name__)
@@ -52,15 +58,109 @@ def _iter_unique_symbols(rows: Iterable[InstrumentIntraday]) -> list[str]:
     return out
 
 
+def _session_window_utc(session_date: date) -> Tuple[datetime, datetime]:
+    start = datetime(session_date.year, session_date.month, session_date.day, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+# One grouped aggregate over the session window + one upsert for the whole batch.
+# Numeric results are rounded to the columns' scale by PostgreSQL on insert.
+# `finalized` is intentionally not written; rollover logic owns that.
+_RECOMPUTE_24H_SQL = """
+INSERT INTO {m24} (
+    session_number, session_date, symbol,
+    prev_close_24h, open_price_24h, open_prev_diff_24h, open_prev_pct_24h,
+    low_24h, high_24h, range_diff_24h, range_pct_24h,
+    close_24h, volume_24h, finalized
+)
+SELECT
+    %(session_number)s, %(session_date)s, agg.symbol,
+    prev.close_24h,
+    agg.open_24h,
+    CASE WHEN prev.close_24h <> 0 THEN agg.open_24h - prev.close_24h END,
+    CASE WHEN prev.close_24h <> 0 THEN (agg.open_24h - prev.close_24h) / prev.close_24h * 100 END,
+    agg.low_24h,
+    agg.high_24h,
+    agg.high_24h - agg.low_24h,
+    (agg.high_24h - agg.low_24h) / NULLIF(agg.low_24h, 0) * 100,
+    agg.close_24h,
+    agg.volume_24h,
+    FALSE
+FROM (
+    SELECT
+        symbol,
+        (array_agg(open_1m ORDER BY timestamp_minute ASC))[1] AS open_24h,
+        (array_agg(close_1m ORDER BY timestamp_minute DESC))[1] AS close_24h,
+        MAX(high_1m) AS high_24h,
+        MIN(low_1m) AS low_24h,
+        COALESCE(SUM(volume_1m), 0) AS volume_24h
+    FROM {intraday}
+    WHERE symbol = ANY(%(symbols)s)
+      AND timestamp_minute >= %(start)s
+      AND timestamp_minute < %(end)s
+    GROUP BY symbol
+) AS agg
+LEFT JOIN {m24} AS prev
+    ON prev.session_number = %(prev_session_number)s AND prev.symbol = agg.symbol
+ON CONFLICT (session_number, symbol) DO UPDATE SET
+    session_date = EXCLUDED.session_date,
+    prev_close_24h = EXCLUDED.prev_close_24h,
+    open_price_24h = EXCLUDED.open_price_24h,
+    open_prev_diff_24h = EXCLUDED.open_prev_diff_24h,
+    open_prev_pct_24h = EXCLUDED.open_prev_pct_24h,
+    low_24h = EXCLUDED.low_24h,
+    high_24h = EXCLUDED.high_24h,
+    range_diff_24h = EXCLUDED.range_diff_24h,
+    range_pct_24h = EXCLUDED.range_pct_24h,
+    close_24h = EXCLUDED.close_24h,
+    volume_24h = EXCLUDED.volume_24h
+"""
+
+
 def _recompute_market_trading_24h_for_symbols(session_number: int, symbols: list[str]) -> int:
-    """Recompute MarketTrading24Hour for (session_number, symbol) from InstrumentIntraday."""
+    """Recompute MarketTrading24Hour for (session_number, symbol) from InstrumentIntraday.
+
+    On PostgreSQL the whole batch is one statement (grouped aggregate + bulk
+    INSERT ... ON CONFLICT DO UPDATE), so the query count is constant in the
+    number of symbols. Other backends use the per-symbol ORM path.
+    """
 
     session_date = _session_date_from_number(session_number)
     if session_date is None or not symbols:
         return 0
 
-    start = datetime(session_date.year, session_date.month, session_date.day, tzinfo=dt_timezone.utc)
-    end = start + timedelta(days=1)
+    if connection.vendor != "postgresql":
+        return _recompute_market_trading_24h_for_symbols_orm(session_number, symbols)
+
+    start, end = _session_window_utc(session_date)
+    qn = connection.ops.quote_name
+    sql = _RECOMPUTE_24H_SQL.format(
+        m24=qn(MarketTrading24Hour._meta.db_table),
+        intraday=qn(InstrumentIntraday._meta.db_table),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            {
+                "session_number": session_number,
+                "session_date": session_date,
+                "prev_session_number": _prev_session_number(session_number),
+                "symbols": list(symbols),
+                "start": start,
+                "end": end,
+            },
+        )
+        return max(0, cursor.rowcount or 0)
+
+
+def _recompute_market_trading_24h_for_symbols_orm(session_number: int, symbols: list[str]) -> int:
+    """Per-symbol ORM recompute (non-PostgreSQL databases)."""
+
+    session_date = _session_date_from_number(session_number)
+    if session_date is None or not symbols:
+        return 0
+
+    start, end = _session_window_utc(session_date)
 
     updated = 0
     prev_sn = _prev_session_number(session_number)
@@ -145,6 +245,166 @@ def _recompute_market_trading_24h_for_symbols(session_number: int, symbols: list
     return updated
 
 
+# Incremental 24h merge of a batch of *newly inserted* bars into the existing
+# (session_number, symbol) row, which is the running OHLCV state:
+# first open kept, max high, min low, last close, summed volume. Closed bars
+# arrive in order through q:bars:1m:*, so the batch's last close wins; periodic
+# full recomputes (see _maybe_reconcile_24h) correct any drift.
+_MERGE_24H_SQL = """
+INSERT INTO {m24} (
+    session_number, session_date, symbol,
+    prev_close_24h, open_price_24h, open_prev_diff_24h, open_prev_pct_24h,
+    low_24h, high_24h, range_diff_24h, range_pct_24h,
+    close_24h, volume_24h, finalized
+)
+SELECT
+    %s, %s, v.symbol,
+    prev.close_24h,
+    v.open_24h,
+    CASE WHEN prev.close_24h <> 0 THEN v.open_24h - prev.close_24h END,
+    CASE WHEN prev.close_24h <> 0 THEN (v.open_24h - prev.close_24h) / prev.close_24h * 100 END,
+    v.low_24h,
+    v.high_24h,
+    v.high_24h - v.low_24h,
+    (v.high_24h - v.low_24h) / NULLIF(v.low_24h, 0) * 100,
+    v.close_24h,
+    v.volume_24h,
+    FALSE
+FROM (VALUES {values}) AS v (symbol, open_24h, high_24h, low_24h, close_24h, volume_24h)
+LEFT JOIN {m24} AS prev
+    ON prev.session_number = %s AND prev.symbol = v.symbol
+ON CONFLICT (session_number, symbol) DO UPDATE SET
+    session_date = EXCLUDED.session_date,
+    prev_close_24h = COALESCE({m24}.prev_close_24h, EXCLUDED.prev_close_24h),
+    open_price_24h = COALESCE({m24}.open_price_24h, EXCLUDED.open_price_24h),
+    open_prev_diff_24h = CASE
+        WHEN COALESCE({m24}.prev_close_24h, EXCLUDED.prev_close_24h) <> 0
+        THEN COALESCE({m24}.open_price_24h, EXCLUDED.open_price_24h)
+             - COALESCE({m24}.prev_close_24h, EXCLUDED.prev_close_24h)
+    END,
+    open_prev_pct_24h = CASE
+        WHEN COALESCE({m24}.prev_close_24h, EXCLUDED.prev_close_24h) <> 0
+        THEN (COALESCE({m24}.open_price_24h, EXCLUDED.open_price_24h)
+              - COALESCE({m24}.prev_close_24h, EXCLUDED.prev_close_24h))
+             / COALESCE({m24}.prev_close_24h, EXCLUDED.prev_close_24h) * 100
+    END,
+    low_24h = LEAST({m24}.low_24h, EXCLUDED.low_24h),
+    high_24h = GREATEST({m24}.high_24h, EXCLUDED.high_24h),
+    range_diff_24h = GREATEST({m24}.high_24h, EXCLUDED.high_24h) - LEAST({m24}.low_24h, EXCLUDED.low_24h),
+    range_pct_24h = (GREATEST({m24}.high_24h, EXCLUDED.high_24h) - LEAST({m24}.low_24h, EXCLUDED.low_24h))
+        / NULLIF(LEAST({m24}.low_24h, EXCLUDED.low_24h), 0) * 100,
+    close_24h = EXCLUDED.close_24h,
+    volume_24h = COALESCE({m24}.volume_24h, 0) + EXCLUDED.volume_24h
+"""
+
+# session_number -> monotonic time of the last full 24h recompute (process-local).
+_last_24h_reconcile: Dict[int, float] = {}
+# session_number -> symbols merged incrementally since that recompute.
+_symbols_since_reconcile: Dict[int, set[str]] = {}
+
+
+def _rollup_new_bars(rows: List[InstrumentIntraday]) -> Dict[str, dict]:
+    """Per-symbol OHLCV partial for a batch: first open, max high, min low, last close, sum volume."""
+    out: Dict[str, dict] = {}
+    for r in sorted(rows, key=lambda r: r.timestamp_minute):
+        st = out.get(r.symbol)
+        if st is None:
+            out[r.symbol] = {
+                "open": r.open_1m,
+                "high": r.high_1m,
+                "low": r.low_1m,
+                "close": r.close_1m,
+                "volume": int(r.volume_1m or 0),
+            }
+            continue
+        if r.high_1m is not None and (st["high"] is None or r.high_1m > st["high"]):
+            st["high"] = r.high_1m
+        if r.low_1m is not None and (st["low"] is None or r.low_1m < st["low"]):
+            st["low"] = r.low_1m
+        if r.close_1m is not None:
+            st["close"] = r.close_1m
+        st["volume"] += int(r.volume_1m or 0)
+    return out
+
+
+def _merge_market_trading_24h_incremental(session_number: int, rows: List[InstrumentIntraday]) -> int:
+    """Merge newly inserted bars into MarketTrading24Hour (one statement, O(new bars))."""
+    session_date = _session_date_from_number(session_number)
+    if session_date is None or not rows:
+        return 0
+
+    # Same window as the full recompute, so both paths agree.
+    start, end = _session_window_utc(session_date)
+    rollup = _rollup_new_bars([r for r in rows if r.timestamp_minute and start <= r.timestamp_minute < end])
+    if not rollup:
+        return 0
+
+    qn = connection.ops.quote_name
+    m24 = qn(MarketTrading24Hour._meta.db_table)
+    values = ", ".join(
+        ["(%s, %s::numeric, %s::numeric, %s::numeric, %s::numeric, %s::bigint)"] * len(rollup)
+    )
+    params: list = [session_number, session_date]
+    for sym, st in rollup.items():
+        params.extend([sym, st["open"], st["high"], st["low"], st["close"], st["volume"]])
+    params.append(_prev_session_number(session_number))
+
+    # Placeholder order: SELECT list, VALUES rows, JOIN.
+    sql = _MERGE_24H_SQL.format(m24=m24, values=values)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return max(0, cursor.rowcount or 0)
+
+
+def _reconcile_due(session_number: int, now: float) -> bool:
+    interval = int(getattr(settings, "INTRADAY_24H_RECONCILE_SECONDS", 300) or 0)
+    if interval <= 0:
+        return True
+    last = _last_24h_reconcile.get(session_number)
+    return last is None or (now - last) >= interval
+
+
+def _update_market_trading_24h(session_number: int, new_rows: List[InstrumentIntraday]) -> None:
+    """Fold a flushed batch into MarketTrading24Hour.
+
+    PostgreSQL: merge only the new bars, and fully recompute every symbol seen
+    since the last reconcile when one is due (also on the first flush after a
+    process start). Other backends: full per-symbol recompute.
+    """
+    symbols = _iter_unique_symbols(new_rows)
+    if connection.vendor != "postgresql":
+        _recompute_market_trading_24h_for_symbols(session_number, symbols)
+        return
+
+    now = time.monotonic()
+    pending = _symbols_since_reconcile.setdefault(session_number, set())
+    pending.update(symbols)
+
+    if _reconcile_due(session_number, now):
+        _recompute_market_trading_24h_for_symbols(session_number, sorted(pending))
+        _last_24h_reconcile[session_number] = now
+        pending.clear()
+        # Old sessions never flush again; keep the bookkeeping small.
+        for sn in [sn for sn in _last_24h_reconcile if sn < session_number]:
+            _last_24h_reconcile.pop(sn, None)
+            _symbols_since_reconcile.pop(sn, None)
+        return
+
+    _merge_market_trading_24h_incremental(session_number, new_rows)
+
+
+def _existing_bar_keys(rows: List[InstrumentIntraday]) -> set[tuple[str, datetime]]:
+    """(symbol, timestamp_minute) pairs from `rows` already stored (one query)."""
+    if not rows:
+        return set()
+    symbols = {r.symbol for r in rows}
+    minutes = {r.timestamp_minute for r in rows}
+    return set(
+        InstrumentIntraday.objects.filter(symbol__in=symbols, timestamp_minute__in=minutes)
+        .values_list("symbol", "timestamp_minute")
+    )
+
+
 def _pop_closed_bars(routing_key: str, batch_size: int = 500) -> Tuple[List[dict], List[str], int]:
     decoded, raw_items, queue_left = live_data_redis.checkout_closed_bars(routing_key, count=batch_size)
     return decoded, raw_items, queue_left
@@ -217,7 +477,184 @@ def _to_instrument_intraday_models(bars: List[dict]) -> List[InstrumentIntraday]
     return rows
 
 
+class _CopyRow(NamedTuple):
+    """One staged bar for the COPY fast path (`t` is the minute bucket, epoch seconds)."""
+
+    t: int
+    symbol: str
+    open_1m: object
+    high_1m: object
+    low_1m: object
+    close_1m: object
+    volume_1m: int
+    bid_last: object
+    ask_last: object
+    spread_last: object
+
+
+class _BarRow(NamedTuple):
+    """An inserted InstrumentIntraday row as returned by the COPY fast path."""
+
+    timestamp_minute: datetime
+    symbol: str
+    open_1m: object
+    high_1m: object
+    low_1m: object
+    close_1m: object
+    volume_1m: int
+    bid_last: object
+    ask_last: object
+    spread_last: object
+
+
+def _to_copy_float(v) -> Optional[float]:
+    """Numeric bar field for COPY; non-numeric/non-finite values become NULL (like _to_decimal)."""
+    if v is None:
+        return None
+    try:
+        f = float(v)
+    except Exception:
+        return None
+    return f if math.isfinite(f) else None
+
+
+def _to_copy_rows(bars: List[dict]) -> List[_CopyRow]:
+    """Same validation as _to_instrument_intraday_models, without model/Decimal/datetime overhead."""
+    rows: List[_CopyRow] = []
+
+    for b in bars:
+        try:
+            raw_ts = b.get("t")
+            if raw_ts is None:
+                continue
+
+            symbol = (b.get("symbol") or b.get("future") or "").strip()
+            if not symbol:
+                continue
+
+            bid = _to_copy_float(b.get("bid"))
+            ask = _to_copy_float(b.get("ask"))
+            spread = _to_copy_float(b.get("spread"))
+            if spread is None and bid is not None and ask is not None:
+                spread = ask - bid
+
+            rows.append(
+                _CopyRow(
+                    int(raw_ts),
+                    symbol.upper(),
+                    _to_copy_float(b.get("o")),
+                    _to_copy_float(b.get("h")),
+                    _to_copy_float(b.get("l")),
+                    _to_copy_float(b.get("c")),
+                    int(b.get("v") or 0),
+                    bid,
+                    ask,
+                    spread,
+                )
+            )
+        except Exception:
+            logger.exception("Failed to convert instrument bar payload: %s", b)
+
+    return rows
+
+
+_COPY_STAGE_TABLE = "instruments_intraday_copy_stage"
+_COPY_VALUE_COLUMNS = "symbol, open_1m, high_1m, low_1m, close_1m, volume_1m, bid_last, ask_last, spread_last"
+_COPY_COLUMNS = f"timestamp_minute, {_COPY_VALUE_COLUMNS}"
+
+# Session-local staging table; rows vanish at commit (flushes run in a transaction).
+_CREATE_STAGE_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS {_COPY_STAGE_TABLE} (
+    t bigint,
+    symbol varchar(32),
+    open_1m numeric,
+    high_1m numeric,
+    low_1m numeric,
+    close_1m numeric,
+    volume_1m bigint,
+    bid_last numeric,
+    ask_last numeric,
+    spread_last numeric
+) ON COMMIT DELETE ROWS
+"""
+
+_INSERT_FROM_STAGE_SQL = """
+INSERT INTO {intraday} ({cols}, created_at)
+SELECT to_timestamp(t), {value_cols}, now() FROM {stage}
+ON CONFLICT (timestamp_minute, symbol) DO NOTHING
+RETURNING {cols}
+"""
+
+
+def _copy_rows_to_csv(rows: List[_CopyRow]) -> io.StringIO:
+    buf = io.StringIO()
+    # csv writes None as an empty unquoted field, which COPY csv reads as NULL.
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    return buf
+
+
+def _copy_insert_bars(rows: List[_CopyRow]) -> List[_BarRow]:
+    """
+    COPY rows into the staging table, then INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+
+    Returns the rows actually inserted (duplicates already stored are skipped),
+    which is exactly what the 24h rollup must merge. Must run in a transaction.
+    """
+    if not rows:
+        return []
+
+    qn = connection.ops.quote_name
+    copy_sql = f"COPY {_COPY_STAGE_TABLE} (t, {_COPY_VALUE_COLUMNS}) FROM STDIN WITH (FORMAT csv)"
+    buf = _copy_rows_to_csv(rows)
+
+    with connection.cursor() as cursor:
+        cursor.execute(_CREATE_STAGE_SQL)
+        cursor.execute(f"TRUNCATE {_COPY_STAGE_TABLE}")
+
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            raw.copy_expert(copy_sql, buf)
+        else:  # psycopg 3
+            with raw.copy(copy_sql) as copy:
+                copy.write(buf.getvalue())
+
+        cursor.execute(
+            _INSERT_FROM_STAGE_SQL.format(
+                intraday=qn(InstrumentIntraday._meta.db_table),
+                cols=_COPY_COLUMNS,
+                value_cols=_COPY_VALUE_COLUMNS,
+                stage=_COPY_STAGE_TABLE,
+            )
+        )
+        return [_BarRow(*row) for row in cursor.fetchall()]
+
+
+def _insert_bars_orm(instr_rows: List[InstrumentIntraday], *, want_new: bool) -> List[InstrumentIntraday]:
+    """bulk_create path; returns the rows that were not already stored when `want_new`."""
+    # Redelivered bars (e.g. recovered from the processing queue after a
+    # crash) must not be merged into the 24h rollup twice.
+    existing = _existing_bar_keys(instr_rows) if want_new else set()
+    InstrumentIntraday.objects.bulk_create(instr_rows, ignore_conflicts=True)
+    if not want_new:
+        return []
+
+    new_rows = []
+    for r in instr_rows:
+        key = (r.symbol, r.timestamp_minute)
+        if key not in existing:
+            existing.add(key)
+            new_rows.append(r)
+    return new_rows
+
+
 def flush_closed_bars(routing_key: str, batch_size: int = 500, max_batches: int = 20) -> int:
+    """
+    Drain closed 1m bars from Redis into InstrumentIntraday (+ 24h and 5m/15m/1h/1d rollups).
+
+    PostgreSQL uses COPY into a temp staging table and one INSERT ... SELECT
+    ... ON CONFLICT DO NOTHING per batch; other databases use bulk_create.
+    """
     total_inserted = 0
     prefix = str(routing_key)
 
@@ -227,6 +664,8 @@ def flush_closed_bars(routing_key: str, batch_size: int = 500, max_batches: int
     if recovered:
         logger.warning("Recovered %s bars from processing queue for %s", recovered, prefix)
 
+    use_copy = connection.vendor == "postgresql"
+
     for _ in range(max_batches):
         bars, raw_items, queue_left = _pop_closed_bars(prefix, batch_size=batch_size)
         if not raw_items:
@@ -243,7 +682,7 @@ def flush_closed_bars(routing_key: str, batch_size: int = 500, max_batches: int
                 break
             continue
 
-        instr_rows = _to_instrument_intraday_models(bars)
+        instr_rows = _to_copy_rows(bars) if use_copy else _to_instrument_intraday_models(bars)
         if not instr_rows:
             live_data_redis.acknowledge_closed_bars(prefix, raw_items)
             logger.info(
@@ -258,20 +697,36 @@ def flush_closed_bars(routing_key: str, batch_size: int = 500, max_batches: int
 
         try:
             with transaction.atomic():
-                InstrumentIntraday.objects.bulk_create(instr_rows, ignore_conflicts=True)
+                if use_copy:
+                    new_rows = _copy_insert_bars(instr_rows)
+                else:
+                    new_rows = _insert_bars_orm(instr_rows, want_new=True)
 
                 if session_number is not None:
-                    symbols = _iter_unique_symbols(instr_rows)
                     try:
-                        _recompute_market_trading_24h_for_symbols(session_number, symbols)
+                        # Savepoint: a failed 24h update must not poison the bar insert.
+                        with transaction.atomic():
+                            _update_market_trading_24h(session_number, new_rows)
                     except Exception:
                         logger.exception("Failed to update MarketTrading24Hour for session_number=%s", session_number)
 
+                try:
+                    with transaction.atomic():
+                        merge_bars_into_rollups(new_rows)
+                except Exception:
+                    logger.exception("Failed to merge bar rollups for %s", prefix)
+
             try:
-                latest_ts: Optional[datetime] = max(
-                    [*(r.timestamp_minute for r in instr_rows if r.timestamp_minute)],
-                    default=None,
-                )
+                if use_copy:
+                    latest_t = max((r.t for r in instr_rows), default=None)
+                    latest_ts: Optional[datetime] = (
+                        datetime.fromtimestamp(latest_t, tz=dt_timezone.utc) if latest_t is not None else None
+                    )
+                else:
+                    latest_ts = max(
+                        [*(r.timestamp_minute for r in instr_rows if r.timestamp_minute)],
+                        default=None,
+                    )
                 if latest_ts:
                     cache_key = f"thor:last_bar_ts:{prefix}"
                     live_data_redis.client.set(cache_key, latest_ts.isoformat(), ex=3600)
@@ -0,0 +1,201 @@
+"""Daily range partitions for InstrumentIntraday (PostgreSQL).
+
+Migration 0021 turns Instruments_instrumentintraday into a table partitioned by
+UTC day (`<table>_pYYYYMMDD`) plus a DEFAULT partition. This module keeps
+upcoming partitions in place (heartbeat job) and implements retention
+(prune_intraday_partitions command).
+
+Everything here is a no-op on other databases or while the table is not
+partitioned.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from Instruments.models.intraday import InstrumentIntraday
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = InstrumentIntraday._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+_PARTITION_RE = re.compile(rf"^{re.escape(PARENT_TABLE)}_p(\d{{8}})$")
+
+# Last UTC day for which upcoming partitions were ensured (process-local).
+_ensured_through: Optional[date] = None
+
+
+def partition_name(day: date) -> str:
+    return f"{PARENT_TABLE}_p{day:%Y%m%d}"
+
+
+def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+            [f'public."{PARENT_TABLE}"'],
+        )
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def list_partitions() -> List[Tuple[str, date]]:
+    """Attached daily partitions as (table_name, day), oldest first (DEFAULT excluded)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [f'public."{PARENT_TABLE}"'],
+        )
+        names = [r[0] for r in cursor.fetchall()]
+
+    out: List[Tuple[str, date]] = []
+    for name in names:
+        m = _PARTITION_RE.match(name)
+        if not m:
+            continue
+        try:
+            out.append((name, datetime.strptime(m.group(1), "%Y%m%d").date()))
+        except ValueError:
+            continue
+    return sorted(out, key=lambda x: x[1])
+
+
+def _create_partition(day: date) -> None:
+    """Create the partition for `day`, moving any rows that landed in DEFAULT first."""
+    qn = connection.ops.quote_name
+    name = partition_name(day)
+    start, end = _day_bounds(day)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT_PARTITION)} "
+            f"WHERE timestamp_minute >= %s AND timestamp_minute < %s)",
+            [start, end],
+        )
+        default_has_rows = bool(cursor.fetchone()[0])
+
+        if not default_has_rows:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(PARENT_TABLE)} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+            return
+
+        # Rows for this day already sit in DEFAULT: build the table standalone,
+        # move them, then attach (attaching re-checks DEFAULT's constraint).
+        cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(PARENT_TABLE)} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} "
+            f"WHERE timestamp_minute >= %s AND timestamp_minute < %s RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved",
+            [start, end],
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(PARENT_TABLE)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+        logger.warning("intraday partitions: moved DEFAULT rows into new partition %s", name)
+
+
+def ensure_intraday_partitions(days_ahead: Optional[int] = None, *, today: Optional[date] = None) -> List[str]:
+    """Make sure partitions exist for yesterday..today+days_ahead (UTC). Returns created names."""
+    global _ensured_through
+
+    if days_ahead is None:
+        days_ahead = int(getattr(settings, "INTRADAY_PARTITION_DAYS_AHEAD", 7))
+    today = today or datetime.now(dt_timezone.utc).date()
+    through = today + timedelta(days=max(0, int(days_ahead)))
+
+    if _ensured_through is not None and _ensured_through >= through:
+        return []
+    if not is_partitioned():
+        return []
+
+    existing = {day for _name, day in list_partitions()}
+    created: List[str] = []
+    day = today - timedelta(days=1)
+    while day <= through:
+        if day not in existing:
+            _create_partition(day)
+            created.append(partition_name(day))
+        day += timedelta(days=1)
+
+    _ensured_through = through
+    if created:
+        logger.info("intraday partitions: created %s", created)
+    return created
+
+
+@dataclass
+class PruneResult:
+    cutoff: date
+    removed: List[str] = field(default_factory=list)
+    kept: int = 0
+
+
+def prune_intraday_partitions(
+    keep_days: int,
+    *,
+    detach_only: bool = False,
+    dry_run: bool = False,
+    today: Optional[date] = None,
+) -> PruneResult:
+    """
+    Drop (or detach) daily partitions older than `keep_days` UTC days.
+
+    Partitions whose whole day is before today - keep_days are removed. Dropping
+    a partition is a metadata operation, unlike DELETE on an unpartitioned table.
+    """
+    today = today or datetime.now(dt_timezone.utc).date()
+    cutoff = today - timedelta(days=max(1, int(keep_days)))
+    result = PruneResult(cutoff=cutoff)
+
+    if not is_partitioned():
+        return result
+
+    qn = connection.ops.quote_name
+    for name, day in list_partitions():
+        if day >= cutoff:
+            result.kept += 1
+            continue
+        result.removed.append(name)
+        if dry_run:
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(PARENT_TABLE)} DETACH PARTITION {qn(name)}")
+            if not detach_only:
+                cursor.execute(f"DROP TABLE {qn(name)}")
+
+    return result
+
+
+__all__ = [
+    "PARENT_TABLE",
+    "DEFAULT_PARTITION",
+    "PruneResult",
+    "partition_name",
+    "is_partitioned",
+    "list_partitions",
+    "ensure_intraday_partitions",
+    "prune_intraday_partitions",
+]
@@ -13,7 +13,7 @@ from Instruments.models.market_24h import MarketTrading24Hour
 from Instruments.services.market_52w_live import finalize_live_52w_to_db, seed_live_52w_all_symbols
 from Instruments.services.market_52w_live import upsert_live_52w_on_price
 
-from api.websocket.broadcast import broadcast_to_websocket_sync
+from api.websocket.broadcast import broadcast_symbol_message_sync
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,13 @@ logger = logging.getLogger(__name__)
 _LAST_UTC_SESSION_NUMBER_KEY = "intraday:last_utc_session_number"
 _LAST_52W_RECOMPUTE_DAY_KEY = "intraday:last_52w_recompute_day"
 
+# Process-local change tracking. realtime_provider builds a new supervisor every
+# second, so this lives at module level rather than on the instance.
+#   _quote_version_hwm: last LiveDataRedis quote version processed (None = not yet synced)
+#   _last_cum_volume:   symbol -> last cumulative (session total) volume seen
+_quote_version_hwm: Optional[int] = None
+_last_cum_volume: Dict[str, float] = {}
+
 
 def _session_date_from_session_number(session_number: int) -> date | None:
     """Best-effort parse YYYYMMDD session_number into a date."""
@@ -176,6 +183,48 @@ def _active_symbols(max_age_seconds: int = 60, limit: int = 5000) -> list[str]:
         return []
 
 
+def _changed_symbols(limit: int = 5000) -> list[str]:
+    """Symbols whose quote changed since the previous tick in this process.
+
+    The first call after start-up has nothing to compare against, so it
+    returns every symbol active in the last 60s and syncs the high-water mark
+    to the current quote version.
+    """
+
+    global _quote_version_hwm
+
+    if _quote_version_hwm is None:
+        version = live_data_redis.get_quote_version()
+        symbols = _active_symbols(max_age_seconds=60, limit=limit)
+        _quote_version_hwm = version
+        return symbols
+
+    symbols, _quote_version_hwm = live_data_redis.get_quote_changes(_quote_version_hwm, limit=limit)
+    return [s.lstrip("/").upper() for s in symbols if s]
+
+
+def _bar_volume_delta(sym: str, volume: Any) -> float:
+    """Volume traded since the last quote processed for `sym`.
+
+    Quote volume is the cumulative session total, while 1m bars sum per-tick
+    volume. The first sighting only records a baseline; a drop means the
+    provider's counter reset (new session) and the new total is all fresh.
+    """
+
+    try:
+        cum = float(volume)
+    except (TypeError, ValueError):
+        return 0.0
+
+    prev = _last_cum_volume.get(sym)
+    _last_cum_volume[sym] = cum
+    if prev is None:
+        return 0.0
+    if cum < prev:
+        return cum
+    return cum - prev
+
+
 def _make_tick(
     sym: str,
     row: Dict[str, Any],
@@ -183,11 +232,12 @@ def _make_tick(
     routing_key: str,
     session_number: Optional[int],
     session_date: Optional[str] = None,
+    volume: Any = None,
 ) -> Dict[str, Any]:
     return {
         "symbol": sym,
         "price": row.get("last"),
-        "volume": row.get("volume"),
+        "volume": volume,
         "bid": row.get("bid"),
         "ask": row.get("ask"),
         "ts": row.get("ts"),
@@ -264,6 +314,9 @@ class IntradaySupervisor:
 
     Lives in Instruments because it writes Instruments DB truth tables.
     LiveData remains responsible only for streaming + Redis publishing.
+
+    Change-driven: each tick handles only symbols whose quote version moved
+    since the previous tick, so a quiet market costs one Redis round trip.
     """
 
     include_equities: bool = True
@@ -271,6 +324,7 @@ class IntradaySupervisor:
 
     def tick(self) -> Dict[str, Any]:
         result: Dict[str, Any] = {
+            "changed": 0,
             "captured": {"ticks": 0, "closed_bars": 0},
             "flushed": {"equities": 0, "futures": 0},
             "skipped": [],
@@ -279,7 +333,8 @@ class IntradaySupervisor:
 
         try:
             _finalize_previous_session_if_rolled_over()
-            symbols = _active_symbols(max_age_seconds=60, limit=5000)
+            symbols = _changed_symbols(limit=5000)
+            result["changed"] = len(symbols)
             enriched = live_data_redis.get_latest_quotes(symbols) if symbols else []
 
             captured_ticks = 0
@@ -335,9 +390,10 @@ class IntradaySupervisor:
                         asof_ts=row.get("timestamp") or row.get("ts"),
                     )
                     if snap_52w:
-                        broadcast_to_websocket_sync(
-                            channel_layer=None,
-                            message={"type": "market.52w", "data": snap_52w},
+                        broadcast_symbol_message_sync(
+                            None,
+                            sym,
+                            {"type": "market.52w", "data": snap_52w},
                         )
                 except Exception:
                     logger.debug("live52w update failed for %s", sym, exc_info=True)
@@ -351,9 +407,10 @@ class IntradaySupervisor:
                         volume=row.get("volume"),
                     )
                     if snap:
-                        broadcast_to_websocket_sync(
-                            channel_layer=None,
-                            message={"type": "market.24h", "data": snap},
+                        broadcast_symbol_message_sync(
+                            None,
+                            sym,
+                            {"type": "market.24h", "data": snap},
                         )
                 except Exception:
                     logger.debug("live24h update failed for %s", sym, exc_info=True)
@@ -364,6 +421,7 @@ class IntradaySupervisor:
                     routing_key=routing_key,
                     session_number=session_number,
                     session_date=session_date,
+                    volume=_bar_volume_delta(sym, row.get("volume")),
                 )
 
                 try:
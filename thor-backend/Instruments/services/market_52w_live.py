@@ -4,12 +4,13 @@ import logging
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from django.db import transaction
 from django.utils import timezone as dj_timezone
 
 from Instruments.models.market_52w import Rolling52WeekStats
+from LiveData.shared.config_cache import RedisEpoch
 from LiveData.shared.redis_client import live_data_redis
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,64 @@ def _live_52w_keys(symbol: str, session_number: int) -> Live52wKeys:
     )
 
 
+# ---------------------------------------------------------------------------
+# In-process cache of the current extremes.
+#
+# Most ticks are inside the 52w range, so upsert_live_52w_on_price answers them
+# from memory and only touches Redis when a price breaks a cached extreme (or
+# the symbol/session is not cached yet). Entries are keyed by session_number,
+# so a new session always goes back to Redis.
+#
+# Within a session the Redis extremes only ever widen, so a stale entry can only
+# cost an extra Redis read, never a missed update. The exception is a reseed
+# from DB (which can narrow them): seed/finalize bump a Redis epoch counter and
+# other processes drop their cache within _EPOCH_CHECK_SECONDS.
+# ---------------------------------------------------------------------------
+_LIVE_52W_EPOCH_KEY = "live:52w:epoch"
+_EPOCH_CHECK_SECONDS = 1.0
+
+# symbol -> (session_number, high_52w, low_52w)
+_extremes_cache: Dict[str, Tuple[int, Decimal, Decimal]] = {}
+_live_52w_epoch = RedisEpoch(_LIVE_52W_EPOCH_KEY, check_seconds=_EPOCH_CHECK_SECONDS)
+# Epoch the cached extremes belong to (None = unknown).
+_cache_epoch: Optional[str] = None
+
+
+def invalidate_live_52w_cache(symbol: Optional[str] = None) -> None:
+    """Drop cached extremes for one symbol, or all of them (this process only)."""
+    if symbol is None:
+        _extremes_cache.clear()
+    else:
+        _extremes_cache.pop((symbol or "").strip().upper(), None)
+
+
+def _bump_live_52w_epoch() -> None:
+    """Invalidate the extremes cache here and, via the Redis epoch, in other processes."""
+    global _cache_epoch
+    invalidate_live_52w_cache()
+    _cache_epoch = _live_52w_epoch.bump()
+
+
+def _sync_cache_epoch() -> None:
+    global _cache_epoch
+    epoch = _live_52w_epoch.current()
+    if not _live_52w_epoch.available:
+        # Can't confirm coherence: fall back to Redis for every tick.
+        invalidate_live_52w_cache()
+        _cache_epoch = None
+        return
+    if epoch != _cache_epoch:
+        invalidate_live_52w_cache()
+        _cache_epoch = epoch
+
+
+def _cache_extremes(sym: str, sn: int, high: Optional[Decimal], low: Optional[Decimal]) -> None:
+    if high is None or low is None:
+        _extremes_cache.pop(sym, None)
+    else:
+        _extremes_cache[sym] = (sn, high, low)
+
+
 def _to_decimal(value: Any) -> Optional[Decimal]:
     if value in (None, ""):
         return None
@@ -193,8 +252,10 @@ def seed_live_52w_all_symbols(*, session_number: int) -> int:
             pipe.execute()
         except Exception:
             logger.exception("Failed seeding 52w Redis snapshot (count=%s)", count)
+            _bump_live_52w_epoch()
             return 0
 
+    _bump_live_52w_epoch()
     return count
 
 
@@ -224,6 +285,7 @@ def seed_live_52w_symbol_from_db(*, session_number: int, symbol: str) -> bool:
         return f"{parsed.isoformat()}T00:00:00Z" if parsed else None
 
     key = f"live:52w:{sym}".lower()
+    invalidate_live_52w_cache(sym)
 
     if not row:
         # No DB row: create a blank seeded row for safety.
@@ -279,6 +341,9 @@ def upsert_live_52w_on_price(
     - Mark dirty + add to per-session dirty set
 
     Returns snapshot dict ONLY when an extreme changed (for WS broadcast).
+
+    Prices inside the cached [low, high] for this session return without
+    touching Redis (see _extremes_cache).
     """
 
     sn = int(session_number)
@@ -290,6 +355,11 @@ def upsert_live_52w_on_price(
     if px is None:
         return None
 
+    _sync_cache_epoch()
+    cached = _extremes_cache.get(sym)
+    if cached is not None and cached[0] == sn and cached[2] <= px <= cached[1]:
+        return None
+
     dt = _to_utc_datetime(asof_ts)
     asof_iso = _to_utc_iso_z(dt)
 
@@ -350,6 +420,8 @@ def upsert_live_52w_on_price(
         changed = True
 
     if not changed:
+        if sess_s and str(sess_s).strip() == str(sn):
+            _cache_extremes(sym, sn, high_v, low_v)
         return None
 
     mapping["dirty"] = "1"
@@ -361,8 +433,17 @@ def upsert_live_52w_on_price(
         pipe.execute()
     except Exception:
         logger.debug("Failed writing live 52w update for %s", sym, exc_info=True)
+        invalidate_live_52w_cache(sym)
         return None
 
+    if sess_s and str(sess_s).strip() == str(sn):
+        _cache_extremes(
+            sym,
+            sn,
+            px if "high_52w" in mapping else high_v,
+            px if "low_52w" in mapping else low_v,
+        )
+
     # Return a WS-friendly snapshot.
     try:
         high_now, high_dt_now, low_now, low_dt_now = live_data_redis.client.hmget(
@@ -445,4 +526,5 @@ def finalize_live_52w_to_db(*, session_number: int) -> int:
     except Exception:
         logger.debug("Failed deleting %s", dirty_key, exc_info=True)
 
+    _bump_live_52w_epoch()
     return updated
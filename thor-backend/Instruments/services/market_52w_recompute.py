@@ -3,9 +3,12 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Iterable, Optional
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
 
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 
 from Instruments.models.market_24h import MarketTrading24Hour
 from Instruments.models.market_52w import Rolling52WeekStats
@@ -35,6 +38,68 @@ def _normalize_symbols(symbols: Iterable[str]) -> list[str]:
     return out
 
 
+# Highest high / lowest low (earliest date on ties) per symbol over the window,
+# for every requested symbol in one pass over MarketTrading24Hour.
+_WINDOW_EXTREMES_SQL = """
+WITH w AS (
+    SELECT symbol, session_date, high_24h, low_24h
+    FROM {m24}
+    WHERE session_date >= %s AND session_date <= %s AND symbol = ANY(%s)
+),
+hi AS (
+    SELECT DISTINCT ON (symbol) symbol, high_24h, session_date
+    FROM w
+    WHERE high_24h IS NOT NULL
+    ORDER BY symbol, high_24h DESC, session_date ASC
+),
+lo AS (
+    SELECT DISTINCT ON (symbol) symbol, low_24h, session_date
+    FROM w
+    WHERE low_24h IS NOT NULL
+    ORDER BY symbol, low_24h ASC, session_date ASC
+)
+SELECT hi.symbol, hi.high_24h, hi.session_date, lo.low_24h, lo.session_date
+FROM hi
+JOIN lo ON lo.symbol = hi.symbol
+"""
+
+# symbol -> (high_52w, high_date, low_52w, low_date)
+Extremes = Dict[str, Tuple[Decimal, date, Decimal, date]]
+
+
+def _window_extremes_pg(window_start: date, asof_date: date, symbols: list[str]) -> Extremes:
+    if not symbols:
+        return {}
+    sql = _WINDOW_EXTREMES_SQL.format(m24=connection.ops.quote_name(MarketTrading24Hour._meta.db_table))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [window_start, asof_date, symbols])
+        return {sym: (hi, hi_date, lo, lo_date) for sym, hi, hi_date, lo, lo_date in cursor.fetchall()}
+
+
+def _window_extremes_orm(window_start: date, asof_date: date, symbols: list[str]) -> Extremes:
+    """Portable equivalent of _WINDOW_EXTREMES_SQL (ROW_NUMBER windows, two queries)."""
+    if not symbols:
+        return {}
+    qs = MarketTrading24Hour.objects.filter(
+        symbol__in=symbols,
+        session_date__gte=window_start,
+        session_date__lte=asof_date,
+    )
+
+    def _first_per_symbol(field: str, order) -> Dict[str, Tuple[Decimal, date]]:
+        ranked = (
+            qs.exclude(**{f"{field}__isnull": True})
+            .annotate(rn=Window(RowNumber(), partition_by=[F("symbol")], order_by=[order, F("session_date").asc()]))
+            .filter(rn=1)
+            .values_list("symbol", field, "session_date")
+        )
+        return {sym: (value, day) for sym, value, day in ranked}
+
+    highs = _first_per_symbol("high_24h", F("high_24h").desc())
+    lows = _first_per_symbol("low_24h", F("low_24h").asc())
+    return {sym: (*highs[sym], *lows[sym]) for sym in highs if sym in lows}
+
+
 def recompute_rolling_52w_from_24h(
     *,
     asof_date: date,
@@ -49,6 +114,9 @@ def recompute_rolling_52w_from_24h(
     Target: Rolling52WeekStats (high_52w/_date, low_52w/_date)
 
     window_days is inclusive of asof_date.
+
+    One set-based query finds every symbol's extremes (DISTINCT ON on
+    PostgreSQL), then a single bulk upsert writes them.
     """
 
     if window_days <= 0:
@@ -69,51 +137,33 @@ def recompute_rolling_52w_from_24h(
 
     symbols_norm = _normalize_symbols(symbols_list)
 
-    updated = 0
-    skipped = 0
+    if connection.vendor == "postgresql":
+        extremes = _window_extremes_pg(window_start, asof_date, symbols_norm)
+    else:
+        extremes = _window_extremes_orm(window_start, asof_date, symbols_norm)
+
+    rows = [
+        Rolling52WeekStats(
+            symbol=sym,
+            high_52w=high_52w,
+            high_52w_date=high_date,
+            low_52w=low_52w,
+            low_52w_date=low_date,
+        )
+        for sym, (high_52w, high_date, low_52w, low_date) in extremes.items()
+    ]
 
     with transaction.atomic():
-        for sym in symbols_norm:
-            qs = MarketTrading24Hour.objects.filter(
-                symbol=sym,
-                session_date__gte=window_start,
-                session_date__lte=asof_date,
-            )
-
-            max_row = (
-                qs.exclude(high_24h__isnull=True)
-                .order_by("-high_24h", "session_date")
-                .values_list("high_24h", "session_date")
-                .first()
-            )
-            min_row = (
-                qs.exclude(low_24h__isnull=True)
-                .order_by("low_24h", "session_date")
-                .values_list("low_24h", "session_date")
-                .first()
-            )
-
-            if not max_row or not min_row:
-                skipped += 1
-                continue
-
-            high_52w, high_date = max_row
-            low_52w, low_date = min_row
-
-            if high_52w is None or low_52w is None or high_date is None or low_date is None:
-                skipped += 1
-                continue
-
-            Rolling52WeekStats.objects.update_or_create(
-                symbol=sym,
-                defaults={
-                    "high_52w": high_52w,
-                    "high_52w_date": high_date,
-                    "low_52w": low_52w,
-                    "low_52w_date": low_date,
-                },
-            )
-            updated += 1
+        Rolling52WeekStats.objects.bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["symbol"],
+            update_fields=["high_52w", "high_52w_date", "low_52w", "low_52w_date", "last_updated"],
+        )
+
+    updated = len(rows)
+    skipped = len(symbols_norm) - updated
 
     return Rolling52wRecomputeResult(
         asof_date=asof_date,
@@ -0,0 +1,80 @@
+"""1m bar reads that stitch the Redis recent-bars ring buffer onto DB history.
+
+Closed bars reach InstrumentIntraday only on the next heartbeat flush, but they
+land in bar:1m:recent:<symbol> (LiveDataRedis.enqueue_closed_bar / ingest_tick)
+the moment the minute rolls over. For a range the ring buffer fully covers
+(the usual "last few hours" chart) this is a single Redis read; older parts
+come from the database, and each minute is taken from exactly one source so
+there are no gaps or duplicates at the seam.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone as dt_timezone
+from typing import List, Optional, Tuple
+
+from Instruments.models.intraday import InstrumentIntraday
+from LiveData.shared.redis_client import live_data_redis
+
+logger = logging.getLogger(__name__)
+
+# (timestamp_minute, open, high, low, close, volume)
+BarTuple = Tuple[datetime, object, object, object, object, int]
+
+
+def _ring_bar_tuple(bar: dict) -> Optional[BarTuple]:
+    try:
+        t = int(bar["t"]) if bar.get("t") is not None else int(bar["bucket"]) * 60
+    except (KeyError, TypeError, ValueError):
+        return None
+    if bar.get("o") is None or bar.get("c") is None:
+        return None
+    return (
+        datetime.fromtimestamp(t, tz=dt_timezone.utc),
+        bar.get("o"),
+        bar.get("h", bar.get("o")),
+        bar.get("l", bar.get("o")),
+        bar.get("c"),
+        int(float(bar.get("v") or 0)),
+    )
+
+
+def load_1m_bars(symbol: str, start: datetime, end: datetime, limit: int) -> List[BarTuple]:
+    """
+    Up to `limit` 1m bars for `symbol` in [start, end), oldest first.
+
+    Minutes older than the oldest ring-buffer entry are read from
+    InstrumentIntraday; everything from there on comes from Redis.
+    """
+    start_t = int(start.timestamp())
+    end_t = int(end.timestamp())
+    symbol = symbol.upper()
+
+    ring, oldest_t = live_data_redis.get_recent_bars(symbol, start_t, end_t)
+
+    db_rows: List[BarTuple] = []
+    if oldest_t is None or oldest_t > start_t:
+        db_end = end if oldest_t is None else min(end, datetime.fromtimestamp(oldest_t, tz=dt_timezone.utc))
+        db_rows = list(
+            InstrumentIntraday.objects.filter(symbol=symbol, timestamp_minute__gte=start, timestamp_minute__lt=db_end)
+            .order_by("timestamp_minute")
+            .values_list("timestamp_minute", "open_1m", "high_1m", "low_1m", "close_1m", "volume_1m")[:limit]
+        )
+        if len(db_rows) >= limit:
+            return db_rows
+
+    last_ts = db_rows[-1][0] if db_rows else None
+    out = db_rows
+    for bar in ring:
+        row = _ring_bar_tuple(bar)
+        if row is None or (last_ts is not None and row[0] <= last_ts):
+            continue
+        out.append(row)
+        last_ts = row[0]
+        if len(out) >= limit:
+            break
+    return out
+
+
+__all__ = ["BarTuple", "load_1m_bars"]
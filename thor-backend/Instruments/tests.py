@@ -0,0 +1,129 @@
+import unittest
+
+from django.test import SimpleTestCase
+
+from Instruments.services import downsample as ds
+
+np = ds.np
+
+
+def _minute_series(start, n, *, seed=7, gaps=True):
+	"""Random-walk 1m bars from `start` (epoch seconds), optionally with missing minutes."""
+	rng = np.random.default_rng(seed)
+	steps = rng.integers(1, 4, size=n) if gaps else np.ones(n, dtype=np.int64)
+	t = start + (np.cumsum(steps) - steps) * 60
+	c = 100.0 + np.cumsum(rng.normal(0, 0.5, size=n))
+	o = np.r_[c[:1], c[:-1]]
+	spread = rng.uniform(0, 0.4, size=n)
+	return ds.Series(
+		t=t.astype(np.int64),
+		o=o,
+		h=np.maximum(o, c) + spread,
+		l=np.minimum(o, c) - spread,
+		c=c,
+		v=rng.integers(0, 500, size=n).astype(np.float64),
+	)
+
+
+@unittest.skipUnless(ds.NUMPY_AVAILABLE, "numpy not installed")
+class LttbIndicesTests(SimpleTestCase):
+	def test_keeps_endpoints_and_returns_strictly_increasing_indices(self):
+		series = _minute_series(1_700_000_000, 1000)
+		for threshold in (3, 4, 10, 137, 999):
+			with self.subTest(threshold=threshold):
+				idx = ds.lttb_indices(series.t, series.c, threshold)
+				self.assertEqual(len(idx), threshold)
+				self.assertEqual((idx[0], idx[-1]), (0, series.size - 1))
+				self.assertTrue(np.all(np.diff(idx) > 0))
+
+	def test_threshold_at_or_above_n_keeps_every_point(self):
+		series = _minute_series(1_700_000_000, 50)
+		for threshold in (50, 51, 500):
+			with self.subTest(threshold=threshold):
+				np.testing.assert_array_equal(ds.lttb_indices(series.t, series.c, threshold), np.arange(50))
+
+	def test_fewer_than_three_points(self):
+		for n in (0, 1, 2):
+			series = _minute_series(1_700_000_000, n)
+			for threshold in (0, 1, 2, 3):
+				with self.subTest(n=n, threshold=threshold):
+					np.testing.assert_array_equal(ds.lttb_indices(series.t, series.c, threshold), np.arange(n))
+
+	def test_keeps_the_spike(self):
+		x = np.arange(100, dtype=np.float64)
+		y = np.zeros(100)
+		y[42] = 10.0
+		self.assertIn(42, ds.lttb_indices(x, y, 5).tolist())
+
+
+@unittest.skipUnless(ds.NUMPY_AVAILABLE, "numpy not installed")
+class OhlcBucketsTests(SimpleTestCase):
+	def test_bucket_count_stays_within_points(self):
+		# Unaligned start so buckets straddle both ends of the span.
+		start = 1_700_000_000 + 37 * 60
+		series = _minute_series(start, 5000)
+		span = float(series.t[-1] + 60 - start)
+		for points in (3, 7, 50, 333, 2000):
+			with self.subTest(points=points):
+				width = ds.plan_bucket_seconds(span, points)
+				out = ds.ohlc_buckets(series, width)
+				self.assertLessEqual(out.size, points)
+				self.assertTrue(np.all(out.t % width == 0))
+				self.assertTrue(np.all(np.diff(out.t) > 0))
+
+	def test_volume_is_conserved(self):
+		series = _minute_series(1_700_000_000, 2000)
+		for width in (120, 300, 3600, 86400):
+			with self.subTest(width=width):
+				self.assertEqual(ds.ohlc_buckets(series, width).v.sum(), series.v.sum())
+
+	def test_buckets_take_first_open_extremes_and_last_close(self):
+		series = _minute_series(1_700_000_000, 600)
+		width = 900
+		out = ds.ohlc_buckets(series, width)
+		for i, t in enumerate(out.t):
+			mask = (series.t // width) * width == t
+			with self.subTest(bucket=int(t)):
+				self.assertEqual(out.o[i], series.o[mask][0])
+				self.assertEqual(out.h[i], series.h[mask].max())
+				self.assertEqual(out.l[i], series.l[mask].min())
+				self.assertEqual(out.c[i], series.c[mask][-1])
+
+	def test_empty_series(self):
+		empty = _minute_series(1_700_000_000, 0)
+		self.assertEqual(ds.ohlc_buckets(empty, 300).size, 0)
+
+
+class BucketPlanningTests(SimpleTestCase):
+	def test_plan_respects_source_resolution(self):
+		self.assertEqual(ds.plan_bucket_seconds(3600, 1000, min_seconds=300), 300)
+		self.assertEqual(ds.plan_bucket_seconds(3600, 1000), 60)
+
+	def test_plan_leaves_room_for_straddling_buckets(self):
+		# 60 minutes in 60 points would fit exactly if aligned; one spare bucket is kept.
+		self.assertEqual(ds.plan_bucket_seconds(3600, 60), 120)
+		self.assertEqual(ds.plan_bucket_seconds(3600, 61), 60)
+
+	def test_plan_beyond_largest_step_uses_whole_days(self):
+		width = ds.plan_bucket_seconds(400 * 86400, 10)
+		self.assertEqual(width % 86400, 0)
+		self.assertLessEqual(400 * 86400 / width, 9)
+
+	def test_source_timeframe_tiles_the_bucket(self):
+		expected = {
+			60: "1m",
+			120: "1m",
+			180: "1m",
+			300: "5m",
+			600: "5m",
+			900: "15m",
+			1800: "15m",
+			3600: "1h",
+			10800: "1h",
+			86400: "1d",
+			7 * 86400: "1d",
+		}
+		for width, timeframe in expected.items():
+			with self.subTest(width=width):
+				self.assertEqual(ds.source_timeframe_for(width), timeframe)
+				self.assertEqual(width % ds.SOURCE_TIMEFRAMES[timeframe], 0)
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from django.urls import path
 
-from Instruments.views import InstrumentCatalogView, UserWatchlistView
+from Instruments.views import InstrumentBarsView, InstrumentCatalogView, UserWatchlistView
 
 urlpatterns = [
     path("catalog/", InstrumentCatalogView.as_view(), name="instrument-catalog"),
+    path("bars/", InstrumentBarsView.as_view(), name="instrument-bars"),
     path("watchlist/", UserWatchlistView.as_view(), name="instrument-watchlist"),
 ]
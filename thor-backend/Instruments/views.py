@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import json
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
 from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from Instruments.models import Instrument, UserInstrumentWatchlistItem
+from Instruments.models import Instrument, InstrumentBarRollup, UserInstrumentWatchlistItem
 from Instruments.serializers import InstrumentSummarySerializer, WatchlistItemSerializer, WatchlistReplaceSerializer
+from Instruments.services import downsample as ds
+from Instruments.services.bar_rollups import ROLLUP_TIMEFRAMES
+from Instruments.services.recent_bars import load_1m_bars
 from Instruments.services.watchlist_sync import sync_watchlist_to_schwab
 
 
@@ -61,3 +69,146 @@ class InstrumentCatalogView(APIView):
         # Keep payload small; this endpoint is intended for dropdown autocomplete.
         items = qs.order_by("symbol")[:50]
         return Response({"items": InstrumentSummarySerializer(items, many=True).data})
+
+
+BAR_TIMEFRAMES = {"1m": 60, **ROLLUP_TIMEFRAMES}
+BARS_DEFAULT_COUNT = 500
+BARS_MAX_COUNT = 5000
+BARS_DOWNSAMPLE_MODES = ("ohlc", "lttb")
+BARS_STREAM_CHUNK = 500
+
+
+def _parse_bar_time(raw: str | None) -> datetime | None:
+    """ISO datetime (naive = UTC) or YYYY-MM-DD (00:00 UTC)."""
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    dt = parse_datetime(raw)
+    if dt is None:
+        d = parse_date(raw)
+        if d is None:
+            raise ValueError(raw)
+        dt = datetime.combine(d, time.min)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=dt_timezone.utc)
+    return dt
+
+
+class InstrumentBarsView(APIView):
+    """
+    GET /api/instruments/bars/?symbol=ES&timeframe=15m&start=2025-01-02&end=2025-01-03T12:00
+
+    OHLCV bars in [start, end). 1m stitches the Redis recent-bars ring buffer
+    onto InstrumentIntraday; coarser timeframes read InstrumentBarRollup rows.
+
+    With `points` (3..5000) the range is downsampled server-side instead of
+    truncated (see Instruments.services.downsample), e.g. for a 3-month chart:
+    ?symbol=ES&start=2025-01-01&end=2025-04-01&points=1000&mode=ohlc
+      - mode=ohlc (default): round-width time buckets; `bucket_seconds` is their width
+      - mode=lttb: Largest-Triangle-Three-Buckets on close, for line charts
+    `timeframe` is then the finest resolution used; buckets of 5m or wider are
+    read from the matching rollup (`source_timeframe`). The body is streamed.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        symbol = (request.query_params.get("symbol") or "").strip().upper()
+        timeframe = (request.query_params.get("timeframe") or "1m").strip().lower()
+
+        if not symbol:
+            return Response({"detail": "symbol is required"}, status=400)
+        if timeframe not in BAR_TIMEFRAMES:
+            return Response({"detail": "Invalid timeframe", "valid": list(BAR_TIMEFRAMES)}, status=400)
+
+        try:
+            start = _parse_bar_time(request.query_params.get("start"))
+            end = _parse_bar_time(request.query_params.get("end"))
+        except ValueError as exc:
+            return Response({"detail": f"Invalid datetime: {exc}"}, status=400)
+
+        span = timedelta(seconds=BAR_TIMEFRAMES[timeframe])
+        end = end or datetime.now(dt_timezone.utc)
+        start = start or end - span * BARS_DEFAULT_COUNT
+        if start >= end:
+            return Response({"detail": "start must be before end"}, status=400)
+
+        if request.query_params.get("points"):
+            return self._downsampled(request, symbol, timeframe, start, end)
+
+        # One extra row tells us whether the range was truncated.
+        if timeframe == "1m":
+            rows = load_1m_bars(symbol, start, end, BARS_MAX_COUNT + 1)
+        else:
+            rows = list(
+                InstrumentBarRollup.objects.filter(
+                    timeframe=timeframe, symbol=symbol, bucket_start__gte=start, bucket_start__lt=end
+                )
+                .order_by("bucket_start")
+                .values_list("bucket_start", "open", "high", "low", "close", "volume")[: BARS_MAX_COUNT + 1]
+            )
+        truncated = len(rows) > BARS_MAX_COUNT
+        bars = [
+            {"t": ts.isoformat(), "o": float(o), "h": float(h), "l": float(l), "c": float(c), "v": int(v or 0)}
+            for ts, o, h, l, c, v in rows[:BARS_MAX_COUNT]
+        ]
+
+        return Response(
+            {
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "truncated": truncated,
+                "bars": bars,
+            }
+        )
+
+    def _downsampled(self, request, symbol: str, timeframe: str, start: datetime, end: datetime):
+        mode = (request.query_params.get("mode") or "ohlc").strip().lower()
+        if mode not in BARS_DOWNSAMPLE_MODES:
+            return Response({"detail": "Invalid mode", "valid": list(BARS_DOWNSAMPLE_MODES)}, status=400)
+        try:
+            points = int(request.query_params.get("points"))
+        except (TypeError, ValueError):
+            return Response({"detail": "points must be an integer"}, status=400)
+        points = max(3, min(points, BARS_MAX_COUNT))
+
+        if not ds.NUMPY_AVAILABLE:
+            return Response({"detail": "Downsampling requires numpy, which is not installed"}, status=503)
+
+        width = ds.plan_bucket_seconds((end - start).total_seconds(), points, BAR_TIMEFRAMES[timeframe])
+        source_tf = ds.source_timeframe_for(width)
+        series = ds.load_series(symbol, start, end, source_tf)
+        source_bars = series.size
+        out, bucket_seconds = ds.downsample(
+            series, points, width, mode=mode, source_seconds=BAR_TIMEFRAMES[source_tf]
+        )
+
+        def body():
+            head = {
+                "symbol": symbol,
+                "timeframe": timeframe,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "truncated": False,
+                "mode": mode,
+                "source_timeframe": source_tf,
+                "source_bars": source_bars,
+                "bucket_seconds": bucket_seconds,
+            }
+            yield json.dumps(head, separators=(",", ":"))[:-1] + ',"bars":['
+
+            rows = list(zip(*(col.tolist() for col in out)))
+            for i in range(0, len(rows), BARS_STREAM_CHUNK):
+                chunk = [
+                    {
+                        "t": datetime.fromtimestamp(t, tz=dt_timezone.utc).isoformat(),
+                        "o": o, "h": h, "l": l, "c": c, "v": int(v),
+                    }
+                    for t, o, h, l, c, v in rows[i:i + BARS_STREAM_CHUNK]
+                ]
+                yield ("," if i else "") + json.dumps(chunk, separators=(",", ":"))[1:-1]
+            yield "]}"
+
+        return StreamingHttpResponse(body(), content_type="application/json")
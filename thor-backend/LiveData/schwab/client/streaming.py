@@ -12,7 +12,6 @@ IMPORTANT:
 
 from __future__ import annotations
 
-import json
 import logging
 import time
 from typing import Any, Dict, Iterable, Optional
@@ -24,10 +23,6 @@ from LiveData.shared.redis_client import live_data_redis
 
 logger = logging.getLogger(__name__)
 
-# GlobalMarkets must write this key to Redis
-ACTIVE_SESSION_KEY_REDIS = "live_data:active_session"
-
-
 def _to_float(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -75,21 +70,6 @@ def _extract_timestamp(tick: Dict[str, Any]) -> float:
     return now
 
 
-def _safe_json_loads(raw: Any) -> Optional[dict]:
-    if raw is None:
-        return None
-    try:
-        if isinstance(raw, (bytes, bytearray)):
-            raw = raw.decode("utf-8")
-        if isinstance(raw, str):
-            return json.loads(raw)
-        if isinstance(raw, dict):
-            return raw
-    except Exception:
-        return None
-    return None
-
-
 def _get_any(d: Dict[str, Any], *keys: Any) -> Any:
     """Return the first non-None value for any key, trying str/int forms.
 
@@ -128,10 +108,8 @@ class SchwabStreamingProducer:
             - session_number is fetched from Redis (written by GlobalMarkets heartbeat).
     """
 
-    def __init__(self, channel_layer: Any | None = None):
+    def __init__(self, channel_layer: Any | None = None, conflation_ms: int = 0):
         self.channel_layer = channel_layer or get_channel_layer()
-        self._session_cache: Optional[dict] = None
-        self._session_cache_until: float = 0.0  # unix time
         self._missing_routing_last_log: float = 0.0
         self._missing_price_last_log: dict[str, float] = {}
         self._last_quote_by_symbol: dict[str, dict[str, Any]] = {}
@@ -139,6 +117,13 @@ class SchwabStreamingProducer:
         self._logged_first_payload: bool = False
         self._logged_first_redis_snapshot: bool = False
 
+        # Per-symbol conflation: merge deltas for `conflation_seconds` and emit
+        # one consolidated quote per symbol per window (0 disables).
+        self.conflation_seconds: float = max(0.0, float(conflation_ms or 0) / 1000.0)
+        self._pending_by_symbol: dict[str, dict[str, Any]] = {}
+        self.ticks_received: int = 0
+        self.ticks_emitted: int = 0
+
     @staticmethod
     def _to_session_number(value: Any) -> Optional[int]:
         """Coerce routing snapshot values into an int session_number."""
@@ -160,22 +145,8 @@ class SchwabStreamingProducer:
           "updated_at": 1735412345
         }
         """
-        now = time.time()
-        if self._session_cache and now < self._session_cache_until:
-            return self._session_cache
-
-        raw = None
-        try:
-            raw = live_data_redis.client.get(ACTIVE_SESSION_KEY_REDIS)
-        except Exception:
-            logger.exception("Failed reading %s from Redis", ACTIVE_SESSION_KEY_REDIS)
-
-        data = _safe_json_loads(raw)
-
-        # Cache for a short time to avoid Redis GET per tick
-        self._session_cache = data
-        self._session_cache_until = now + 2.0  # 2s cache
-        return data
+        # Process-cached and invalidated on write (LiveData.shared.config_cache).
+        return live_data_redis.get_active_session_snapshot()
 
     def _resolve_session_number(self, payload: Dict[str, Any]) -> Optional[int]:
         snap = self._get_active_session_snapshot()
@@ -333,39 +304,139 @@ class SchwabStreamingProducer:
         if not payload:
             return
 
+        self.ticks_received += 1
+        if self.conflation_seconds > 0:
+            self._conflate(payload)
+            return
+
+        self._emit(payload, self._build_bar_tick(payload))
+
+    # ------------------------------------------------------------------
+    # Conflation
+    # ------------------------------------------------------------------
+    def _conflate(self, payload: Dict[str, Any]) -> None:
+        """Merge a normalized delta into the symbol's pending window.
+
+        The quote fields take the latest values; the bar window keeps the first,
+        high and low price and the summed per-tick volume so the 1m bar stays
+        identical to unconflated processing. A window never spans two minute
+        buckets: a bucket change emits the pending window first.
+        """
+        symbol = payload["symbol"]
+        bar_tick = self._build_bar_tick(payload)
+        bucket = int(float(payload["timestamp"])) // 60
+
+        pending = self._pending_by_symbol.get(symbol)
+        if pending is not None and pending["bucket"] != bucket:
+            self._emit_pending(symbol)
+            pending = None
+
+        if pending is None:
+            pending = {
+                "first_at": time.monotonic(),
+                "bucket": bucket,
+                "payload": dict(payload),
+                "bar": None,
+                "bar_volume": 0.0,
+            }
+            self._pending_by_symbol[symbol] = pending
+        else:
+            merged = pending["payload"]
+            for key, value in payload.items():
+                # Deltas omit unchanged fields; never overwrite known values with None.
+                if value is not None or key not in merged:
+                    merged[key] = value
+
+        if bar_tick is None:
+            return
+
+        price = float(bar_tick["price"])
         try:
-            # Always publish quotes (session-agnostic)
-            live_data_redis.publish_quote(payload["symbol"], payload, broadcast_ws=True)
+            pending["bar_volume"] += float(bar_tick.get("volume") or 0)
+        except Exception:
+            pass
 
-            if not self._logged_first_redis_snapshot:
-                self._logged_first_redis_snapshot = True
-                try:
-                    snap = live_data_redis.get_latest_quote(payload["symbol"])  # immediate readback
-                    logger.warning("Schwab first Redis latest quote snapshot=%s", snap)
-                except Exception:
-                    logger.exception("Failed reading back latest quote after publish")
+        window = pending["bar"]
+        if window is None:
+            pending["bar"] = {**bar_tick, "open": price, "high": price, "low": price}
+        else:
+            window.update({k: v for k, v in bar_tick.items() if v is not None})
+            window["high"] = max(float(window["high"]), price)
+            window["low"] = min(float(window["low"]), price)
+
+    def _emit_pending(self, symbol: str) -> None:
+        pending = self._pending_by_symbol.pop(symbol, None)
+        if pending is None:
+            return
+        bar_tick = pending["bar"]
+        if bar_tick is not None:
+            bar_tick["volume"] = pending["bar_volume"]
+        self._emit(pending["payload"], bar_tick)
+
+    def flush_due(self, now: float | None = None) -> int:
+        """Emit every pending window older than the conflation interval."""
+        if not self._pending_by_symbol:
+            return 0
+        now = time.monotonic() if now is None else now
+        due = [
+            sym
+            for sym, pending in self._pending_by_symbol.items()
+            if now - pending["first_at"] >= self.conflation_seconds
+        ]
+        for sym in due:
+            self._emit_pending(sym)
+        return len(due)
+
+    def flush_all(self) -> int:
+        """Emit all pending windows (shutdown / reconnect)."""
+        symbols = list(self._pending_by_symbol.keys())
+        for sym in symbols:
+            self._emit_pending(sym)
+        return len(symbols)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Conflation counters: ticks received vs consolidated quotes emitted."""
+        received = self.ticks_received
+        emitted = self.ticks_emitted
+        return {
+            "conflation_ms": int(self.conflation_seconds * 1000),
+            "ticks_received": received,
+            "ticks_emitted": emitted,
+            "pending_symbols": len(self._pending_by_symbol),
+            "conflation_ratio": round(received / emitted, 2) if emitted else None,
+        }
 
+    # ------------------------------------------------------------------
+    # Emit (publish + tick cache + bars)
+    # ------------------------------------------------------------------
+    def _emit(self, payload: Dict[str, Any], bar_tick: Optional[Dict[str, Any]]) -> None:
+        self.ticks_emitted += 1
+
+        try:
+            # Quotes are always published (session-agnostic); ticks/bars only
+            # when GlobalMarkets has published session routing.
             session_number = self._resolve_session_number(payload)
-            if session_number is None:
-                # No routing available: don't write bars/ticks to session namespaces
-                # (and don't spam warnings)
-                return
+            routing_key = str(session_number) if session_number is not None else None
 
-            routing_key = str(session_number)
-            payload["session_number"] = session_number
+            if routing_key is None:
+                bar_tick = None
+            elif bar_tick:
+                bar_tick["session_number"] = session_number
 
-            # Short TTL tick cache (keyed by session)
-            live_data_redis.set_tick(routing_key, payload["symbol"], payload, ttl=10)
+            # One Redis round trip: source check, merge, publish, snapshot,
+            # active ZADD, tick cache, 1m bar rollover and closed-bar enqueue.
+            _closed_bar, merged = live_data_redis.ingest_tick(
+                payload["symbol"],
+                payload,
+                routing_key=routing_key,
+                bar_tick=bar_tick,
+                tick_ttl=10,
+                broadcast_ws=True,
+            )
 
-            # Update 1m bar (keyed by session)
-            bar_tick = self._build_bar_tick(payload)
-            if bar_tick:
-                bar_tick["session_number"] = session_number
-                closed_bar, _cur = live_data_redis.upsert_current_bar_1m(
-                    routing_key, payload["symbol"], bar_tick
-                )
-                if closed_bar:
-                    live_data_redis.enqueue_closed_bar(routing_key, closed_bar)
+            if not self._logged_first_redis_snapshot and merged is not None:
+                self._logged_first_redis_snapshot = True
+                logger.warning("Schwab first Redis latest quote snapshot=%s", merged)
 
         except Exception:
             logger.exception(
@@ -436,9 +507,11 @@ class SchwabStreamingProducer:
                 for tick in message.get("content", []):
                     if isinstance(tick, dict):
                         self.process_tick(tick)
-                return
-            if isinstance(message, dict):
+            elif isinstance(message, dict):
                 self.process_tick(message)
+
+            if self.conflation_seconds > 0:
+                self.flush_due()
         except Exception:
             logger.exception("Failed to process Schwab streaming message")
 
@@ -15,9 +15,12 @@ from typing import Any, Dict, List, Optional, Tuple
 import ctypes
 
 from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 
+from api.websocket.broadcast import set_broadcast_queue
+from api.websocket.broadcast_queue import BroadcastQueue
 from LiveData.schwab.models import BrokerConnection
 from LiveData.schwab.client.streaming import SchwabStreamingProducer
 from LiveData.schwab.client.tokens import ensure_valid_access_token
@@ -293,6 +296,18 @@ class Command(BaseCommand):
         parser.add_argument("--exit-after-first", action="store_true", help="Exit after first message received.")
         parser.add_argument("--lock-ttl", type=int, default=60, help="Redis lock TTL in seconds.")
         parser.add_argument("--lock-renew", type=int, default=20, help="How often to renew lock in seconds.")
+        parser.add_argument(
+            "--conflate-ms",
+            type=int,
+            default=None,
+            help="Per-symbol conflation window in ms (0 disables). Default: settings.SCHWAB_STREAM_CONFLATE_MS.",
+        )
+        parser.add_argument(
+            "--broadcast-queue-max",
+            type=int,
+            default=None,
+            help="Max queued WebSocket broadcasts. Default: settings.SCHWAB_STREAM_BROADCAST_QUEUE_MAX.",
+        )
 
     def handle(self, *args, **options):
         if _IMPORT_ERROR is not None or StreamClient is None or schwab_client_from_access_functions is None:
@@ -301,6 +316,14 @@ class Command(BaseCommand):
         user_id: int = int(options.get("user_id") or 1)
         echo_ticks: bool = bool(options.get("echo_ticks"))
         exit_after_first: bool = bool(options.get("exit_after_first"))
+        conflate_ms = options.get("conflate_ms")
+        if conflate_ms is None:
+            conflate_ms = getattr(settings, "SCHWAB_STREAM_CONFLATE_MS", 0)
+        conflate_ms = max(0, int(conflate_ms or 0))
+        broadcast_queue_max = options.get("broadcast_queue_max")
+        if broadcast_queue_max is None:
+            broadcast_queue_max = getattr(settings, "SCHWAB_STREAM_BROADCAST_QUEUE_MAX", 5000)
+        broadcast_queue_max = max(1, int(broadcast_queue_max or 5000))
 
         lock_ttl_seconds: int = int(options.get("lock_ttl") or 60)
         lock_renew_seconds: int = int(options.get("lock_renew") or 20)
@@ -503,7 +526,8 @@ class Command(BaseCommand):
                 except Exception:
                     pass
 
-            producer = SchwabStreamingProducer()
+            producer = SchwabStreamingProducer(conflation_ms=conflate_ms)
+            stats_key = f"live_data:schwab:stream_stats:{user_id}"
 
             def _echo_message(msg: object) -> None:
                 if not echo_ticks:
@@ -540,13 +564,49 @@ class Command(BaseCommand):
             last_futures_msg_at: float = 0.0
 
             async def _run() -> None:
-                backoff = 2
-                max_backoff = 60
-
                 control_queue: asyncio.Queue[dict] = asyncio.Queue()
                 _start_pubsub_thread(user_id, control_queue, asyncio.get_running_loop())
                 logger.warning("Schwab control plane channel=%s", _control_channel(user_id))
 
+                # All WebSocket broadcasts made on this loop go through one bounded,
+                # per-symbol-conflating worker instead of unbounded create_task() calls.
+                broadcast_queue: BroadcastQueue | None = None
+                channel_layer = get_channel_layer()
+                if channel_layer is not None:
+                    broadcast_queue = BroadcastQueue(channel_layer, max_pending=broadcast_queue_max)
+                    broadcast_queue.start()
+                    set_broadcast_queue(broadcast_queue)
+
+                async def _stats_reporter() -> None:
+                    """Publish streamer stats (conflation + broadcast queue) every 10s."""
+                    while True:
+                        await asyncio.sleep(10)
+                        stats: dict[str, Any] = dict(producer.get_stats())
+                        if broadcast_queue is not None:
+                            stats["broadcast"] = broadcast_queue.get_stats()
+                        logger.info("Schwab stream stats: %s", stats)
+                        with contextlib.suppress(Exception):
+                            live_data_redis.client.setex(
+                                stats_key,
+                                60,
+                                json.dumps({**stats, "timestamp": int(time.time())}, default=str),
+                            )
+
+                stats_task = asyncio.create_task(_stats_reporter())
+                try:
+                    await _run_stream(control_queue)
+                finally:
+                    stats_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError, Exception):
+                        await stats_task
+                    if broadcast_queue is not None:
+                        set_broadcast_queue(None)
+                        await broadcast_queue.stop()
+
+            async def _run_stream(control_queue: "asyncio.Queue[dict]") -> None:
+                backoff = 2
+                max_backoff = 60
+
                 current_equities: set[str] = set(desired_equities)
                 current_futures: set[str] = set(desired_futures)
 
@@ -823,8 +883,18 @@ class Command(BaseCommand):
                                         with contextlib.suppress(Exception):
                                             self.stdout.write(f"subscribed_futures={sorted(applied_futures)}")
 
+                        async def _conflation_flusher() -> None:
+                            """Emit conflated windows on time even when the feed goes quiet."""
+                            interval = max(0.01, producer.conflation_seconds / 2.0)
+                            while True:
+                                await asyncio.sleep(interval)
+                                producer.flush_due()
+
                         control_task = asyncio.create_task(_control_consumer())
                         watchdog_task = asyncio.create_task(_stall_watchdog())
+                        flusher_task: asyncio.Task | None = None
+                        if producer.conflation_seconds > 0:
+                            flusher_task = asyncio.create_task(_conflation_flusher())
 
                         try:
                             # initial apply
@@ -867,6 +937,12 @@ class Command(BaseCommand):
                                 keepalive_task.cancel()
                                 with contextlib.suppress(asyncio.CancelledError, Exception):
                                     await keepalive_task
+                            if flusher_task is not None:
+                                flusher_task.cancel()
+                                with contextlib.suppress(asyncio.CancelledError, Exception):
+                                    await flusher_task
+                            with contextlib.suppress(Exception):
+                                producer.flush_all()
                             with contextlib.suppress(Exception):
                                 await stream_client.logout()
 
@@ -885,7 +961,8 @@ class Command(BaseCommand):
                         backoff = min(backoff * 2, max_backoff)
 
             self.stdout.write(self.style.SUCCESS(
-                f"Starting Schwab stream user_id={user_id} equities={equities or '-'} futures={futures or '-'}"
+                f"Starting Schwab stream user_id={user_id} equities={equities or '-'} futures={futures or '-'} "
+                f"conflate_ms={conflate_ms}"
             ))
 
             try:
@@ -12,17 +12,48 @@ from typing import Any
 
 from django.conf import settings
 
-from api.websocket.broadcast import broadcast_to_websocket_sync
+from api.websocket.broadcast import MARKET_DATA_SNAPSHOT_KEY, broadcast_to_websocket_sync
 from core.infra.jobs import Job
 from LiveData.schwab.models import BrokerConnection
 from LiveData.schwab.client.tokens import ensure_valid_access_token
+from LiveData.shared.codec import decode_payload
 from LiveData.shared.redis_client import live_data_redis
 from thor_project.realtime.broadcaster import maybe_broadcast_global_market_status
 
 logger = logging.getLogger(__name__)
 
 
+def _quote_delta(prev: dict[str, Any] | None, cur: dict[str, Any]) -> dict[str, Any] | None:
+    """Return {symbol, <changed fields>} for `cur` vs `prev`, or None if unchanged."""
+    if prev is None:
+        return dict(cur)
+    changed = {k: v for k, v in cur.items() if k not in prev or prev[k] != v}
+    changed.update({k: None for k in prev.keys() - cur.keys()})
+    if not changed:
+        return None
+    changed["symbol"] = cur.get("symbol")
+    return changed
+
+
 class MarketDataSnapshotJob(Job):
+    """Publish the active quote set once per interval as a sequenced delta.
+
+    Each run diffs the latest quotes against the previous run and broadcasts a
+    single `market_data_delta` event:
+
+        {"epoch": ..., "seq": N, "base_seq": N-1, "timestamp": ...,
+         "changes": [{"symbol": "ES", <changed fields>}, ...],
+         "removed": ["NQ", ...]}
+
+    Runs with no changes broadcast nothing. The full snapshot (same seq) is
+    cached at MARKET_DATA_SNAPSHOT_KEY before the delta goes out; the consumer
+    serves it on connect and on `market_data_resync`. A client that connects in
+    between gets snapshot N and then delta N, so clients drop deltas with
+    seq <= their last seq and resync only when base_seq > last seq (see
+    MarketDataConsumer). Legacy sockets get the attached `legacy` frame:
+    `market_data` with the full quotes of the changed symbols only.
+    """
+
     name = "market_data_snapshot"
 
     def __init__(
@@ -38,6 +69,13 @@ class MarketDataSnapshotJob(Job):
         self.prune_after_seconds = int(prune_after_seconds)
         self.max_symbols = int(max_symbols)
 
+        # Delta state (process-local). A new epoch tells clients to resync
+        # after a restart even if seq numbers happen to line up.
+        self.epoch = f"{int(time.time() * 1000):x}"
+        self.seq = 0
+        self._last_quotes: dict[str, dict[str, Any]] = {}
+        self._snapshot_json: str | None = None
+
     def should_run(self, now: float, state: dict[str, Any]) -> bool:
         last = state.get("last_run", {}).get(self.name)
         return last is None or (now - last) >= self.interval_seconds
@@ -64,16 +102,16 @@ class MarketDataSnapshotJob(Job):
             return
 
         # Pull quote snapshots in one HMGET.
-        quotes: list[dict[str, Any]] = []
+        quotes: dict[str, dict[str, Any]] = {}
         try:
-            raws = live_data_redis.client.hmget(live_data_redis.LATEST_QUOTES_HASH, *symbols)
+            raws = live_data_redis.raw_client.hmget(live_data_redis.LATEST_QUOTES_HASH, *symbols)
             for raw in raws:
                 if not raw:
                     continue
                 try:
-                    q = json.loads(raw)
-                    if isinstance(q, dict):
-                        quotes.append(q)
+                    q = decode_payload(raw)
+                    if isinstance(q, dict) and q.get("symbol"):
+                        quotes[str(q["symbol"])] = q
                 except Exception:
                     continue
         except Exception:
@@ -83,17 +121,58 @@ class MarketDataSnapshotJob(Job):
         if not quotes:
             return
 
-        payload = {"timestamp": now_ts, "quotes": quotes}
+        changes: list[dict[str, Any]] = []
+        for sym, q in quotes.items():
+            delta = _quote_delta(self._last_quotes.get(sym), q)
+            if delta is not None:
+                changes.append(delta)
+        removed = [sym for sym in self._last_quotes if sym not in quotes]
+
+        base_seq = self.seq
+        if changes or removed or self._snapshot_json is None:
+            self.seq += 1
+            self._last_quotes = quotes
+            self._snapshot_json = json.dumps(
+                {
+                    "epoch": self.epoch,
+                    "seq": self.seq,
+                    "timestamp": now_ts,
+                    "quotes": list(quotes.values()),
+                },
+                default=str,
+            )
 
+        # Refresh every run so the TTL never lapses while the feed is quiet.
         try:
-            live_data_redis.client.setex("thor:market_data:snapshot", 10, json.dumps(payload, default=str))
+            live_data_redis.client.setex(MARKET_DATA_SNAPSHOT_KEY, 10, self._snapshot_json)
         except Exception:
             logger.debug("market_data_snapshot: failed caching snapshot", exc_info=True)
 
+        if not changes and not removed:
+            return
+
+        payload = {
+            "epoch": self.epoch,
+            "seq": self.seq,
+            "base_seq": base_seq,
+            "timestamp": now_ts,
+            "changes": changes,
+            "removed": removed,
+        }
+        # Full quotes of the changed symbols for legacy (non-delta) sockets.
+        legacy = {
+            "type": "market_data",
+            "data": {
+                "timestamp": now_ts,
+                "seq": self.seq,
+                "quotes": [quotes[str(c["symbol"])] for c in changes],
+            },
+        }
+
         try:
             broadcast_to_websocket_sync(
                 getattr(ctx, "channel_layer", None) if ctx else None,
-                {"type": "market_data", "data": payload},
+                {"type": "market_data_delta", "data": payload, "legacy": legacy},
             )
         except Exception:
             logger.debug("market_data_snapshot: websocket broadcast failed", exc_info=True)
@@ -101,6 +180,8 @@ class MarketDataSnapshotJob(Job):
 
 class SchwabHealthJob(Job):
     name = "schwab_health"
+    # Token refreshes are network calls; flag runs that hang.
+    timeout_seconds = 30.0
 
     def __init__(self, interval_seconds: float | None = None, refresh_buffer_seconds: int | None = None):
         # Defaults read from settings with sensible fallbacks
@@ -219,4 +300,9 @@ def register(registry):
     return [job.name, snapshot_job.name, gm_job.name]
 
 
-__all__ = ["register", "SchwabHealthJob", "MarketDataSnapshotJob", "GlobalMarketsStatusBroadcastJob"]
+__all__ = [
+    "register",
+    "SchwabHealthJob",
+    "MarketDataSnapshotJob",
+    "GlobalMarketsStatusBroadcastJob",
+]
@@ -0,0 +1,218 @@
+import json
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.websocket.broadcast import MARKET_DATA_SNAPSHOT_KEY
+from LiveData.schwab.client import streaming
+from LiveData.schwab.client.streaming import SchwabStreamingProducer
+from LiveData.schwab.realtime import provider
+from LiveData.schwab.realtime.provider import MarketDataSnapshotJob, _quote_delta
+from LiveData.shared.redis_client import LiveDataRedis
+
+
+class QuoteDeltaTests(SimpleTestCase):
+	def test_new_symbol_returns_full_quote(self):
+		cur = {"symbol": "ES", "bid": 1.0, "ask": 1.25}
+		delta = _quote_delta(None, cur)
+		self.assertEqual(delta, cur)
+		self.assertIsNot(delta, cur)
+
+	def test_unchanged_returns_none(self):
+		q = {"symbol": "ES", "bid": 1.0}
+		self.assertIsNone(_quote_delta(dict(q), q))
+
+	def test_changed_and_added_fields_with_symbol(self):
+		prev = {"symbol": "ES", "bid": 1.0, "ask": 1.25}
+		cur = {"symbol": "ES", "bid": 1.5, "ask": 1.25, "last": 1.4}
+		self.assertEqual(_quote_delta(prev, cur), {"symbol": "ES", "bid": 1.5, "last": 1.4})
+
+	def test_dropped_field_is_sent_as_none(self):
+		prev = {"symbol": "ES", "bid": 1.0, "last": 1.1}
+		cur = {"symbol": "ES", "bid": 1.0}
+		self.assertEqual(_quote_delta(prev, cur), {"symbol": "ES", "last": None})
+
+
+class _FakeRedisClient:
+	def __init__(self, store):
+		self.store = store
+
+	def zremrangebyscore(self, key, lo, hi):
+		return 0
+
+	def zrevrangebyscore(self, key, hi, lo, start=0, num=None):
+		return list(self.store["active"])
+
+	def setex(self, key, ttl, value):
+		self.store["setex"][key] = value
+
+	def hmget(self, key, *fields):
+		return [json.dumps(self.store["quotes"][f]) if f in self.store["quotes"] else None for f in fields]
+
+
+class _FakeLiveDataRedis:
+	ACTIVE_QUOTES_ZSET = "quotes:active"
+	LATEST_QUOTES_HASH = "quotes:latest"
+
+	def __init__(self):
+		self.store = {"active": [], "quotes": {}, "setex": {}}
+		self.client = self.raw_client = _FakeRedisClient(self.store)
+
+	def set_quotes(self, quotes):
+		self.store["quotes"] = {q["symbol"]: q for q in quotes}
+		self.store["active"] = list(self.store["quotes"])
+
+	def cached_snapshot(self):
+		return json.loads(self.store["setex"][MARKET_DATA_SNAPSHOT_KEY])
+
+
+class MarketDataSnapshotSeqTests(SimpleTestCase):
+	def setUp(self):
+		self.redis = _FakeLiveDataRedis()
+		self.sent = []
+		for p in (
+			mock.patch.object(provider, "live_data_redis", self.redis),
+			mock.patch.object(
+				provider, "broadcast_to_websocket_sync", lambda layer, message: self.sent.append(message)
+			),
+		):
+			p.start()
+			self.addCleanup(p.stop)
+		self.job = MarketDataSnapshotJob()
+
+	def run_job(self, *quotes):
+		self.redis.set_quotes(list(quotes))
+		before = len(self.sent)
+		self.job.run(None)
+		return self.sent[before:]
+
+	def test_seq_chains_across_no_change_runs_and_removals(self):
+		es = {"symbol": "ES", "bid": 1.0}
+		nq = {"symbol": "NQ", "bid": 2.0}
+
+		(first,) = self.run_job(es, nq)
+		self.assertEqual((first["data"]["seq"], first["data"]["base_seq"]), (1, 0))
+		self.assertEqual(first["data"]["changes"], [es, nq])
+
+		# No change: nothing broadcast, the cached snapshot keeps its seq.
+		self.assertEqual(self.run_job(es, nq), [])
+		self.assertEqual(self.redis.cached_snapshot()["seq"], 1)
+
+		(changed,) = self.run_job({"symbol": "ES", "bid": 1.5}, nq)
+		self.assertEqual((changed["data"]["seq"], changed["data"]["base_seq"]), (2, 1))
+		self.assertEqual(changed["data"]["changes"], [{"symbol": "ES", "bid": 1.5}])
+		self.assertEqual(changed["data"]["removed"], [])
+		self.assertEqual(changed["legacy"]["data"]["quotes"], [{"symbol": "ES", "bid": 1.5}])
+
+		(removed,) = self.run_job({"symbol": "ES", "bid": 1.5})
+		self.assertEqual((removed["data"]["seq"], removed["data"]["base_seq"]), (3, 2))
+		self.assertEqual(removed["data"]["changes"], [])
+		self.assertEqual(removed["data"]["removed"], ["NQ"])
+
+		snapshot = self.redis.cached_snapshot()
+		self.assertEqual(snapshot["seq"], 3)
+		self.assertEqual(snapshot["epoch"], removed["data"]["epoch"])
+		self.assertEqual(snapshot["quotes"], [{"symbol": "ES", "bid": 1.5}])
+
+	def test_snapshot_is_cached_at_the_delta_seq(self):
+		(delta,) = self.run_job({"symbol": "ES", "bid": 1.0})
+		self.assertEqual(self.redis.cached_snapshot()["seq"], delta["data"]["seq"])
+
+
+class _FakeKeyValue:
+	def __init__(self, store):
+		self.store = store
+
+	def get(self, key):
+		return self.store.get(key)
+
+	def set(self, key, value):
+		self.store[key] = value
+
+
+class _BarRecordingRedis:
+	"""ingest_tick stand-in that runs the real 1m bar upsert on an in-memory store."""
+
+	_parse_session_number = staticmethod(LiveDataRedis._parse_session_number)
+
+	def __init__(self):
+		self.store = {}
+		self.closed = []
+		self.bars = LiveDataRedis.__new__(LiveDataRedis)
+		self.bars.codec = "json"
+		self.bars.client = self.bars.raw_client = _FakeKeyValue(self.store)
+
+	def get_active_session_snapshot(self):
+		return {"default": "7"}
+
+	def ingest_tick(self, symbol, payload, *, routing_key=None, bar_tick=None, **kwargs):
+		closed = None
+		if routing_key is not None and bar_tick is not None:
+			closed, _current = self.bars.upsert_current_bar_1m(routing_key, symbol, bar_tick)
+			if closed:
+				self.closed.append(closed)
+		return closed, payload
+
+	def current_bars(self):
+		return {key: json.loads(value) for key, value in self.store.items()}
+
+
+# Marks the end of a conflation window in the replayed sequence.
+_FLUSH = object()
+
+
+class ConflationBarParityTests(SimpleTestCase):
+	"""Conflated windows must build the same 1m bars as processing every tick."""
+
+	def _ticks(self):
+		base = (int(time.time()) // 60 - 60) * 60
+		return [
+			# NQ opens with a price-less delta: no bar in either mode.
+			{"symbol": "/NQ", "volume": 9, "timestamp": base + 0.5},
+			{"symbol": "/ES", "bid": 100.0, "ask": 100.5, "last": 100.25, "volume": 2, "timestamp": base + 1.0},
+			{"symbol": "/ES", "volume": 3, "timestamp": base + 1.2},
+			{"symbol": "/NQ", "last": 200.0, "volume": 1, "timestamp": base + 1.3},
+			{"symbol": "/ES", "last": 100.75, "volume": 1, "timestamp": base + 1.4},
+			_FLUSH,
+			{"symbol": "/ES", "last": 99.5, "volume": 5, "timestamp": base + 20.0},
+			{"symbol": "/ES", "bid": 100.25, "timestamp": base + 59.8},
+			# Minute changes inside the open window.
+			{"symbol": "/ES", "last": 101.0, "volume": 4, "timestamp": base + 60.1},
+			{"symbol": "/ES", "ask": 101.5, "volume": 2, "timestamp": base + 60.3},
+			{"symbol": "/NQ", "volume": 6, "timestamp": base + 60.4},
+			_FLUSH,
+			# Late tick from the previous minute stays in the current bar.
+			{"symbol": "/ES", "last": 100.5, "volume": 1, "timestamp": base + 58.0},
+			{"symbol": "/ES", "last": 102.0, "volume": 1, "timestamp": base + 62.0},
+			{"symbol": "/ES", "volume": 7, "timestamp": base + 125.0},
+			{"symbol": "/NQ", "last": 201.0, "volume": 2, "timestamp": base + 125.5},
+		]
+
+	def _replay(self, conflation_ms):
+		redis = _BarRecordingRedis()
+		with mock.patch.object(streaming, "live_data_redis", redis):
+			producer = SchwabStreamingProducer(channel_layer=object(), conflation_ms=conflation_ms)
+			producer._logged_first_payload = producer._logged_first_redis_snapshot = True
+			for tick in self._ticks():
+				if tick is _FLUSH:
+					producer.flush_all()
+				else:
+					producer.process_tick(dict(tick))
+			producer.flush_all()
+		return producer, redis
+
+	def test_conflated_bars_match_unconflated(self):
+		plain_producer, plain = self._replay(0)
+		conflated_producer, conflated = self._replay(60_000)
+
+		self.assertLess(conflated_producer.ticks_emitted, plain_producer.ticks_emitted)
+		self.assertEqual(len(plain.closed), 4)
+		self.assertEqual(conflated.closed, plain.closed)
+		self.assertEqual(conflated.current_bars(), plain.current_bars())
+
+		first_es = plain.closed[0]
+		self.assertEqual(
+			(first_es["o"], first_es["h"], first_es["l"], first_es["c"], first_es["v"]),
+			(100.25, 100.75, 99.5, 99.5, 11),
+		)
@@ -0,0 +1,90 @@
+"""
+Versioned payload codec for the hot LiveData Redis keys.
+
+Covers latest quotes, tick:*, bar:1m:current:*, bar:1m:recent:*, the
+q:bars:1m:* queues and the quote pub/sub channels. Writers use the codec
+selected by settings.LIVE_DATA_REDIS_CODEC ("json" | "msgpack"); readers accept
+both so a rolling deploy can mix old and new processes.
+
+Wire formats:
+  - json (legacy): plain UTF-8 JSON text
+  - msgpack v1:    b"\\xc1T1" + msgpack body
+
+0xC1 is never emitted by msgpack and is not valid UTF-8/JSON, so the prefix
+cannot collide with a legacy JSON payload.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+from django.conf import settings
+
+try:
+    import msgpack
+except Exception:  # pragma: no cover
+    msgpack = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+
+MSGPACK_V1_PREFIX = b"\xc1T1"
+
+_warned_missing_msgpack = False
+
+
+def get_codec() -> str:
+    """Return the configured writer codec (falls back to JSON if msgpack is unavailable)."""
+    global _warned_missing_msgpack
+
+    codec = str(getattr(settings, "LIVE_DATA_REDIS_CODEC", CODEC_JSON) or CODEC_JSON).strip().lower()
+    if codec != CODEC_MSGPACK:
+        return CODEC_JSON
+    if msgpack is None:
+        if not _warned_missing_msgpack:
+            _warned_missing_msgpack = True
+            logger.warning("LIVE_DATA_REDIS_CODEC=msgpack but msgpack is not installed; using JSON")
+        return CODEC_JSON
+    return CODEC_MSGPACK
+
+
+def encode_payload(value: Any, codec: str | None = None) -> str | bytes:
+    """Encode a payload for Redis using `codec` (default: configured codec)."""
+    codec = codec or get_codec()
+    if codec == CODEC_MSGPACK and msgpack is not None:
+        return MSGPACK_V1_PREFIX + msgpack.packb(value, default=str, use_bin_type=True)
+    return json.dumps(value, default=str)
+
+
+def decode_payload(raw: Any) -> Any:
+    """Decode a Redis payload written in either format.
+
+    Returns None for empty values. Raises ValueError on undecodable input so
+    callers keep their existing `except Exception` handling.
+    """
+    if raw is None or raw == b"" or raw == "":
+        return None
+
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw)
+        if raw.startswith(MSGPACK_V1_PREFIX):
+            if msgpack is None:
+                raise ValueError("msgpack payload received but msgpack is not installed")
+            return msgpack.unpackb(raw[len(MSGPACK_V1_PREFIX):], raw=False, strict_map_key=False)
+        raw = raw.decode("utf-8")
+
+    return json.loads(raw)
+
+
+__all__ = [
+    "CODEC_JSON",
+    "CODEC_MSGPACK",
+    "MSGPACK_V1_PREFIX",
+    "get_codec",
+    "encode_payload",
+    "decode_payload",
+]
@@ -0,0 +1,251 @@
+"""
+Process-local cache for rarely-changing Redis config keys.
+
+Hot paths read a handful of keys that change a few times a day at most
+(instruments:quote_source, live_data:active_session). ConfigKeyCache keeps the
+loaded value per key in memory and drops it when Redis reports a write:
+
+  - A daemon thread subscribes to the keyspace notifications of the watched
+    keys (__keyspace@<db>__:<key>). Any SET/HSET/DEL/EXPIRE invalidates the
+    entry in every process at once.
+  - Each entry also expires after `ttl` seconds, which bounds staleness when
+    notifications are unavailable (disabled server config, listener down).
+
+Keyspace notifications must include K plus the string/hash/generic/expired
+classes; the listener adds any missing flags via CONFIG SET (a managed Redis
+that forbids CONFIG leaves the cache TTL-only). LIVE_DATA_CONFIG_CACHE_NOTIFY
+=False skips the listener altogether.
+
+RedisEpoch is the companion for caches built from the database (market
+calendar, classification tables, 52w extremes): writers bump a Redis counter
+and every process re-reads it at most once per `check_seconds`, dropping its
+copy when the value moved.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# K = keyspace channel, $ = strings, h = hashes, g = DEL/EXPIRE/RENAME, x = expired.
+_REQUIRED_NOTIFY_FLAGS = "K$hgx"
+
+_RECONNECT_DELAY_SECONDS = 5.0
+
+Loader = Callable[[redis.Redis], Any]
+
+
+class ConfigKeyCache:
+    """
+    Cache loader results for a fixed set of Redis keys.
+
+    Usage:
+        cache.get(KEY, lambda c: c.hgetall(KEY))
+
+    The loader runs on a miss and its (parsed) result is what gets cached, so
+    callers can cache decoded JSON or whole hashes, not just raw strings.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        keys: Iterable[str],
+        *,
+        ttl: float = 5.0,
+        notify: bool = True,
+    ):
+        self.client = client
+        self.keys = tuple(keys)
+        self.ttl = max(0.0, float(ttl))
+        self.notify = notify
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        # Bumped on every invalidation so a load that raced a write is not cached.
+        self._generation = 0
+        self._listener: threading.Thread | None = None
+        self._listener_pid: int | None = None
+        self._listening = False
+
+    # -------------------------
+    # Reads / invalidation
+    # -------------------------
+    def get(self, key: str, loader: Loader) -> Any:
+        """Cached loader(client) for `key`; the loader's exceptions propagate uncached."""
+        if key not in self.keys or self.ttl <= 0:
+            return loader(self.client)
+
+        self._ensure_listener()
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        generation = self._generation
+        value = loader(self.client)
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop one cached key (or all). Writers call this for read-your-writes in-process."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    @property
+    def listening(self) -> bool:
+        """True while the keyspace listener is subscribed."""
+        return self._listening
+
+    # -------------------------
+    # Keyspace listener
+    # -------------------------
+    def _ensure_listener(self) -> None:
+        if not self.notify:
+            return
+        pid = os.getpid()
+        if self._listener is not None and self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener is not None and self._listener_pid == pid:
+                return
+            # First use, or a forked child: the parent's thread did not survive the fork.
+            self._entries.clear()
+            self._listening = False
+            self._listener_pid = pid
+            self._listener = threading.Thread(
+                target=self._listen_forever,
+                name="live-data-config-cache",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def _enable_notifications(self) -> None:
+        try:
+            current = self.client.config_get("notify-keyspace-events").get("notify-keyspace-events") or ""
+        except Exception:
+            logger.debug("CONFIG GET notify-keyspace-events failed; relying on TTL", exc_info=True)
+            return
+
+        # "A" is an alias for every event class.
+        have = set(current.replace("A", "g$lshzxetd"))
+        missing = [flag for flag in _REQUIRED_NOTIFY_FLAGS if flag not in have]
+        if not missing:
+            return
+        try:
+            self.client.config_set("notify-keyspace-events", current + "".join(missing))
+        except Exception:
+            logger.warning(
+                "Could not enable Redis keyspace notifications (%s); config cache falls back to a %ss TTL",
+                "".join(missing),
+                self.ttl,
+            )
+
+    def _channel_prefix(self) -> str:
+        db = int(self.client.connection_pool.connection_kwargs.get("db", 0) or 0)
+        return f"__keyspace@{db}__:"
+
+    def _listen_forever(self) -> None:
+        prefix = self._channel_prefix()
+        while True:
+            pubsub = None
+            try:
+                self._enable_notifications()
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(*[prefix + key for key in self.keys])
+                # Writes made while we were not subscribed were never announced.
+                self.invalidate()
+                self._listening = True
+                for message in pubsub.listen():
+                    channel = message.get("channel")
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    if channel and str(channel).startswith(prefix):
+                        self.invalidate(str(channel)[len(prefix):])
+            except Exception:
+                logger.debug("Config cache listener disconnected; retrying", exc_info=True)
+            finally:
+                self._listening = False
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(_RECONNECT_DELAY_SECONDS)
+
+
+class RedisEpoch:
+    """
+    Cross-process invalidation counter stored at one Redis key.
+
+    current() returns the epoch as a string ("0" until the first bump),
+    re-reading Redis at most once per `check_seconds`. On a read error it keeps
+    the last known value and `available` turns False until a read succeeds.
+    bump() increments it (optionally deleting derived keys in the same
+    round trip) and adopts the new value in this process right away.
+    """
+
+    def __init__(self, key: str, *, check_seconds: float = 1.0, client: redis.Redis | None = None):
+        self.key = key
+        self.check_seconds = max(0.0, float(check_seconds))
+        self._client = client
+        self._value: str | None = None
+        self._checked_at = 0.0
+        self.available = True
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            # Lazy: redis_client imports this module.
+            from LiveData.shared.redis_client import live_data_redis
+
+            self._client = live_data_redis.client
+        return self._client
+
+    def current(self) -> str:
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < self.check_seconds:
+            return self._value
+        self._checked_at = now
+        try:
+            raw = self.client.get(self.key)
+        except Exception:
+            logger.debug("Failed reading %s", self.key, exc_info=True)
+            self.available = False
+            self._value = self._value or "0"
+            return self._value
+        self.available = True
+        self._value = str(raw or "0")
+        return self._value
+
+    def bump(self, *, delete: Iterable[str] = ()) -> str | None:
+        """Advance the epoch (deleting `delete` keys first); None if Redis failed."""
+        try:
+            pipe = self.client.pipeline()
+            for key in delete:
+                pipe.delete(key)
+            pipe.incr(self.key)
+            value = str(pipe.execute()[-1])
+        except Exception:
+            logger.debug("Failed bumping %s", self.key, exc_info=True)
+            return None
+        self._value = value
+        self._checked_at = time.monotonic()
+        self.available = True
+        return value
+
+
+__all__ = ["ConfigKeyCache", "RedisEpoch"]
@@ -19,6 +19,9 @@ from django.utils import timezone as dj_timezone
 
 from GlobalMarkets.normalize import normalize_country_code
 
+from .codec import decode_payload, encode_payload, get_codec
+from .config_cache import ConfigKeyCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +68,214 @@ def _to_epoch_seconds_utc(value) -> int:
     return int(dj_timezone.now().timestamp())
 
 
+# Single round-trip tick ingest (see LiveDataRedis.ingest_tick).
+#
+# KEYS: 1 quote-source hash, 2 latest quotes hash, 3 active symbols zset,
+#       4 tick cache key, 5 current 1m bar key, 6 closed-bar queue,
+#       7 recent closed bars zset, 8 quote version counter, 9 quote versions zset
+# ARGV: 1 symbol, 2 provider (upper, '' = unknown), 3 quote JSON, 4 ts epoch,
+#       5 pub/sub channel, 6 tick ttl ('' = skip tick/bar), 7 bar tick JSON
+#       ('' = skip bar), 8 session_number ('' = none), 9 writer codec
+#       ('json' | 'msgpack'), 10 recent bars kept (0 = no ring buffer)
+#
+# Stored values are read in either codec (see LiveData.shared.codec) and
+# written in ARGV[9]. Returns nil when the source preference rejects the tick,
+# otherwise {merged_quote, closed_bar_or_empty} in the writer codec.
+_INGEST_TICK_LUA = """
+local MSGPACK_V1 = '\\193T1'
+local use_msgpack = ARGV[9] == 'msgpack'
+
+local function decode(raw)
+  local ok, value
+  if string.sub(raw, 1, 3) == MSGPACK_V1 then
+    ok, value = pcall(cmsgpack.unpack, string.sub(raw, 4))
+  else
+    ok, value = pcall(cjson.decode, raw)
+  end
+  if ok and type(value) == 'table' then
+    return value
+  end
+  return nil
+end
+
+local function encode(value)
+  if use_msgpack then
+    return MSGPACK_V1 .. cmsgpack.pack(value)
+  end
+  return cjson.encode(value)
+end
+
+local sym = ARGV[1]
+if ARGV[2] ~= '' then
+  local desired = redis.call('HGET', KEYS[1], sym)
+  if desired then
+    desired = string.upper((string.gsub(desired, '^%s*(.-)%s*$', '%1')))
+    if desired ~= '' and desired ~= 'AUTO' and desired ~= ARGV[2] then
+      return nil
+    end
+  end
+end
+
+local quote = cjson.decode(ARGV[3])
+local prev_raw = redis.call('HGET', KEYS[2], sym)
+if prev_raw then
+  local prev = decode(prev_raw)
+  if prev then
+    for _, k in ipairs({'bid', 'ask', 'last'}) do
+      if (quote[k] == nil or quote[k] == cjson.null) and prev[k] ~= nil and prev[k] ~= cjson.null then
+        quote[k] = prev[k]
+      end
+    end
+  end
+end
+
+local merged = encode(quote)
+redis.call('PUBLISH', ARGV[5], merged)
+redis.call('HSET', KEYS[2], sym, merged)
+redis.call('ZADD', KEYS[3], ARGV[4], sym)
+redis.call('ZADD', KEYS[9], redis.call('INCR', KEYS[8]), sym)
+
+local session_number = cjson.null
+if ARGV[8] ~= '' then
+  session_number = tonumber(ARGV[8])
+end
+
+if ARGV[6] == '' then
+  return {merged, ''}
+end
+
+if session_number ~= cjson.null then
+  quote['session_number'] = session_number
+  redis.call('SET', KEYS[4], encode(quote), 'EX', ARGV[6])
+else
+  redis.call('SET', KEYS[4], merged, 'EX', ARGV[6])
+end
+
+if ARGV[7] == '' then
+  return {merged, ''}
+end
+
+local tick = cjson.decode(ARGV[7])
+local bucket = tonumber(tick['bucket'])
+local price = tonumber(tick['price'])
+local open_ = tonumber(tick['open']) or price
+local high = tonumber(tick['high']) or price
+local low = tonumber(tick['low']) or price
+local volume = tonumber(tick['volume']) or 0
+
+local existing = nil
+local existing_raw = redis.call('GET', KEYS[5])
+if existing_raw then
+  existing = decode(existing_raw)
+end
+-- cmsgpack.unpack drops null fields; restore them so both codecs store the same bar.
+if existing then
+  for _, k in ipairs({'bid', 'ask', 'spread', 'country'}) do
+    if existing[k] == nil then
+      existing[k] = cjson.null
+    end
+  end
+end
+
+local existing_bucket = nil
+if existing and existing['bucket'] ~= nil and existing['bucket'] ~= cjson.null then
+  existing_bucket = tonumber(existing['bucket'])
+end
+-- Never allow time to go backwards for a given symbol's current bar.
+if existing_bucket and bucket < existing_bucket then
+  bucket = existing_bucket
+end
+
+local closed = ''
+local current
+if existing == nil or existing_bucket ~= bucket then
+  if existing_bucket then
+    existing['routing_key'] = tick['routing_key']
+    if session_number ~= cjson.null then
+      existing['session_number'] = session_number
+    end
+    closed = encode(existing)
+    redis.call('RPUSH', KEYS[6], closed)
+    local keep = tonumber(ARGV[10]) or 0
+    if keep > 0 then
+      local t = tonumber(existing['t']) or existing_bucket * 60
+      redis.call('ZREMRANGEBYSCORE', KEYS[7], t, t)
+      redis.call('ZADD', KEYS[7], t, closed)
+      redis.call('ZREMRANGEBYRANK', KEYS[7], 0, -(keep + 1))
+    end
+  end
+  current = {
+    bucket = bucket,
+    t = tick['t'],
+    timestamp_minute = tick['timestamp_minute'],
+    o = open_,
+    h = high,
+    l = low,
+    c = price,
+    v = volume,
+    bid = tick['bid'],
+    ask = tick['ask'],
+    spread = tick['spread'],
+    country = tick['country'],
+    symbol = tick['symbol'],
+  }
+else
+  current = existing
+  current['h'] = math.max(tonumber(current['h']) or high, high)
+  current['l'] = math.min(tonumber(current['l']) or low, low)
+  current['c'] = price
+  current['v'] = (tonumber(current['v']) or 0) + volume
+  if tick['bid'] ~= cjson.null then
+    current['bid'] = tick['bid']
+  end
+  if tick['ask'] ~= cjson.null then
+    current['ask'] = tick['ask']
+  end
+  if tick['bid'] ~= cjson.null and tick['ask'] ~= cjson.null then
+    current['spread'] = tick['spread']
+  end
+  if current['timestamp_minute'] == nil or current['timestamp_minute'] == cjson.null then
+    current['timestamp_minute'] = tick['timestamp_minute']
+  end
+  if current['t'] == nil or current['t'] == cjson.null then
+    current['t'] = tick['t']
+  end
+end
+
+current['routing_key'] = tick['routing_key']
+if session_number ~= cjson.null then
+  current['session_number'] = session_number
+end
+redis.call('SET', KEYS[5], encode(current))
+
+return {merged, closed}
+"""
+
+# Active-symbol ZADD plus quote-version bump for the non-scripted publish path.
+# KEYS: 1 active zset, 2 version counter, 3 version zset. ARGV: 1 symbol, 2 ts.
+_MARK_QUOTE_UPDATED_LUA = """
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+local version = redis.call('INCR', KEYS[2])
+redis.call('ZADD', KEYS[3], version, ARGV[1])
+return version
+"""
+
+
+def _script_refused(exc: Exception) -> bool:
+    """True when Redis rejected a script call before running it."""
+    if isinstance(
+        exc,
+        (
+            redis.exceptions.NoScriptError,
+            redis.exceptions.NoPermissionError,
+            redis.exceptions.BusyLoadingError,
+        ),
+    ):
+        return True
+    # Scripting disabled or EVALSHA renamed away.
+    return type(exc) is redis.exceptions.ResponseError and str(exc).lower().startswith("unknown command")
+
+
 class LiveDataRedis:
     """
     Shared Redis client for publishing live market data.
@@ -82,6 +293,14 @@ class LiveDataRedis:
     LATEST_QUOTES_HASH = "live_data:latest:quotes"
     ACTIVE_QUOTES_ZSET = "live_data:active_symbols"
 
+    # --- Quote change feed: every accepted quote bumps a global counter and
+    # scores its symbol with the new value, so readers can ask "what changed
+    # since version N" without rescanning every active symbol.
+    QUOTE_VERSION_KEY = "live_data:quote_version"
+    QUOTE_VERSIONS_ZSET = "live_data:quote_versions"
+    # Bumped by publish_raw_quote (raw:quote:<SYM> snapshots).
+    RAW_QUOTE_VERSION_KEY = "live_data:raw_quote_version"
+
     # --- Instrument quote-source preference map (symbol -> source) ---
     # Values: AUTO | SCHWAB | TOS
     INSTRUMENT_QUOTE_SOURCE_HASH = "instruments:quote_source"
@@ -93,6 +312,9 @@ class LiveDataRedis:
     # --- Active session routing snapshot (written by GlobalMarkets heartbeat) ---
     ACTIVE_SESSION_KEY_REDIS = "live_data:active_session"
 
+    # --- Recent closed 1m bars per symbol (zset scored by minute epoch) ---
+    RECENT_BARS_KEY_PREFIX = "bar:1m:recent"
+
     def __init__(self):
         """Initialize Redis connection from Django settings."""
         self.client = redis.Redis(
@@ -101,6 +323,26 @@ class LiveDataRedis:
             db=getattr(settings, "REDIS_DB", 0),
             decode_responses=True,
         )
+        # Binary-safe client for hot keys that may hold msgpack payloads.
+        self.raw_client = redis.Redis(
+            host=getattr(settings, "REDIS_HOST", "localhost"),
+            port=getattr(settings, "REDIS_PORT", 6379),
+            db=getattr(settings, "REDIS_DB", 0),
+            decode_responses=False,
+        )
+        # Writer codec for hot payloads (readers accept both JSON and msgpack).
+        self.codec = get_codec()
+        # Closed 1m bars kept per symbol in the recent-bars ring buffer (0 = off).
+        self.recent_bars_max = max(0, int(getattr(settings, "LIVE_DATA_RECENT_BARS", 720) or 0))
+        self._ingest_tick_script = self.raw_client.register_script(_INGEST_TICK_LUA)
+        self._mark_quote_script = self.client.register_script(_MARK_QUOTE_UPDATED_LUA)
+        # Rarely-changing config keys read per tick (see LiveData.shared.config_cache).
+        self.config_cache = ConfigKeyCache(
+            self.client,
+            [self.INSTRUMENT_QUOTE_SOURCE_HASH, self.ACTIVE_SESSION_KEY_REDIS],
+            ttl=float(getattr(settings, "LIVE_DATA_CONFIG_CACHE_TTL", 5.0) or 0),
+            notify=bool(getattr(settings, "LIVE_DATA_CONFIG_CACHE_NOTIFY", True)),
+        )
 
     # -------------------------
     # Routing helpers
@@ -127,13 +369,8 @@ class LiveDataRedis:
         except Exception:
             return None
 
-    def _get_active_session_snapshot(self) -> dict | None:
-        """Return the cached active session routing payload from Redis."""
-        try:
-            raw = self.client.get(self.ACTIVE_SESSION_KEY_REDIS)
-        except Exception:
-            logger.debug("Failed to read %s", self.ACTIVE_SESSION_KEY_REDIS, exc_info=True)
-            return None
+    def _load_active_session_snapshot(self, client: redis.Redis) -> dict | None:
+        raw = client.get(self.ACTIVE_SESSION_KEY_REDIS)
         if not raw:
             return None
         try:
@@ -142,9 +379,22 @@ class LiveDataRedis:
             logger.debug("Failed to parse %s payload", self.ACTIVE_SESSION_KEY_REDIS, exc_info=True)
             return None
 
+    def get_active_session_snapshot(self) -> dict | None:
+        """Return the active session routing payload (process-cached, see config_cache)."""
+        try:
+            return self.config_cache.get(self.ACTIVE_SESSION_KEY_REDIS, self._load_active_session_snapshot)
+        except Exception:
+            logger.debug("Failed to read %s", self.ACTIVE_SESSION_KEY_REDIS, exc_info=True)
+            return None
+
+    def set_active_session_snapshot(self, payload: Dict[str, Any], *, ttl: int = 60 * 60 * 72) -> None:
+        """Write the active session routing payload and refresh this process's cache."""
+        self.client.set(self.ACTIVE_SESSION_KEY_REDIS, json.dumps(payload, default=str), ex=int(ttl))
+        self.config_cache.invalidate(self.ACTIVE_SESSION_KEY_REDIS)
+
     def get_active_session_number(self, asset_type: str | None = None) -> int | None:
         """Fetch active session_number from GlobalMarkets heartbeat snapshot."""
-        snap = self._get_active_session_snapshot() or {}
+        snap = self.get_active_session_snapshot() or {}
         if not snap or not isinstance(snap, dict):
             return None
 
@@ -177,15 +427,15 @@ class LiveDataRedis:
     # -------------------------
     # Pub/Sub base
     # -------------------------
-    def publish(self, channel: str, data: Dict[str, Any]) -> int:
+    def publish(self, channel: str, data: Dict[str, Any], *, codec: str | None = None) -> int:
         """
-        Publish JSON data to a Redis channel.
+        Publish data to a Redis channel (JSON unless a codec is given).
 
         Returns:
             Number of subscribers that received the message
         """
         try:
-            message = json.dumps(data, default=str)
+            message = encode_payload(data, codec) if codec else json.dumps(data, default=str)
             result = self.client.publish(channel, message)
             logger.debug("Published to %s: %s bytes to %s subscribers", channel, len(message), result)
             return result
@@ -344,29 +594,13 @@ class LiveDataRedis:
         """
         key = f"tick:{self._routing_prefix(routing_key)}:{symbol}".lower()
         try:
-            self.client.set(key, json.dumps(payload, default=str), ex=ttl)
+            self.client.set(key, encode_payload(payload, self.codec), ex=ttl)
         except Exception as e:
             logger.error("Failed to set tick %s: %s", key, e)
 
-    def upsert_current_bar_1m(
-        self,
-        routing_key: str,
-        symbol: str,
-        tick: Dict[str, Any],
-    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
-        """
-        Update the in-progress 1m bar for this symbol. Returns (closed_bar, current_bar).
-
-        Uses the tick's UTC timestamp to determine the minute bucket when available.
-        Falls back to server/Django time (UTC) when not.
-
-        Expected tick keys: price/last/close and (optional) volume.
-        Optional tick timestamp keys (any one): ts, timestamp, time, datetime
-        """
-        prefix = self._routing_prefix(routing_key)
-        key = f"bar:1m:current:{prefix}:{symbol}".lower()
-
-        # 1) price + volume
+    @staticmethod
+    def _normalize_bar_tick(tick: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract price/volume/bid/ask/spread and the clamped UTC epoch from a bar tick."""
         price = tick.get("price") or tick.get("last") or tick.get("close")
         if price is None:
             raise ValueError("tick missing price/last/close field")
@@ -378,7 +612,6 @@ class LiveDataRedis:
         except Exception:
             volume = 0
 
-        # 1b) bid/ask/spread (optional)
         bid = tick.get("bid")
         ask = tick.get("ask")
 
@@ -396,7 +629,18 @@ class LiveDataRedis:
         if bid is not None and ask is not None:
             spread = ask - bid
 
-        # 2) timestamp (UTC)
+        # Optional pre-aggregated window (conflated ticks): first/high/low price.
+        def _price_or(key: str, default: float) -> float:
+            v = tick.get(key)
+            try:
+                return float(v) if v is not None else default
+            except Exception:
+                return default
+
+        open_ = _price_or("open", price)
+        high = max(_price_or("high", price), price)
+        low = min(_price_or("low", price), price)
+
         ts_raw = tick.get("ts") or tick.get("timestamp") or tick.get("time") or tick.get("datetime")
         ts_epoch = _to_epoch_seconds_utc(ts_raw)
         # Some providers round timestamps to the next minute (or clocks can skew),
@@ -405,13 +649,57 @@ class LiveDataRedis:
         if ts_epoch > now_epoch:
             ts_epoch = now_epoch
 
+        return {
+            "price": price,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "volume": volume,
+            "bid": bid,
+            "ask": ask,
+            "spread": spread,
+            "ts_epoch": ts_epoch,
+        }
+
+    def upsert_current_bar_1m(
+        self,
+        routing_key: str,
+        symbol: str,
+        tick: Dict[str, Any],
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Update the in-progress 1m bar for this symbol. Returns (closed_bar, current_bar).
+
+        Uses the tick's UTC timestamp to determine the minute bucket when available.
+        Falls back to server/Django time (UTC) when not.
+
+        Expected tick keys: price/last/close and (optional) volume.
+        Optional tick timestamp keys (any one): ts, timestamp, time, datetime
+        Optional open/high/low keys describe a conflated window of ticks; the
+        price is then the window's last price and volume its summed volume.
+        """
+        prefix = self._routing_prefix(routing_key)
+        key = f"bar:1m:current:{prefix}:{symbol}".lower()
+
+        # 1-2) price/volume/bid/ask + timestamp (UTC)
+        norm = self._normalize_bar_tick(tick)
+        price = norm["price"]
+        open_ = norm["open"]
+        high = norm["high"]
+        low = norm["low"]
+        volume = norm["volume"]
+        bid = norm["bid"]
+        ask = norm["ask"]
+        spread = norm["spread"]
+        ts_epoch = norm["ts_epoch"]
+
         # 3) load existing bar
         closed_bar = None
-        existing_raw = self.client.get(key)
+        existing_raw = self.raw_client.get(key)
         existing = None
         if existing_raw:
             try:
-                existing = json.loads(existing_raw)
+                existing = decode_payload(existing_raw)
             except Exception:
                 existing = None
 
@@ -448,9 +736,9 @@ class LiveDataRedis:
                 "bucket": bucket,
                 "t": minute_epoch,  # epoch minute start (UTC)
                 "timestamp_minute": timestamp_minute,  # ISO UTC minute start
-                "o": price,
-                "h": price,
-                "l": price,
+                "o": open_,
+                "h": high,
+                "l": low,
                 "c": price,
                 "v": volume,
                 "bid": bid,
@@ -463,8 +751,8 @@ class LiveDataRedis:
             }
         else:
             current_bar = existing
-            current_bar["h"] = max(float(current_bar["h"]), price)
-            current_bar["l"] = min(float(current_bar["l"]), price)
+            current_bar["h"] = max(float(current_bar["h"]), high)
+            current_bar["l"] = min(float(current_bar["l"]), low)
             current_bar["c"] = price
             current_bar["v"] = float(current_bar.get("v") or 0) + volume
 
@@ -481,13 +769,14 @@ class LiveDataRedis:
         current_bar["routing_key"] = routing_key
         if session_number is not None:
             current_bar["session_number"] = session_number
-        self.client.set(key, json.dumps(current_bar, default=str))
+        self.client.set(key, encode_payload(current_bar, self.codec))
         return closed_bar, current_bar
 
     def enqueue_closed_bar(self, routing_key: str, bar: Dict[str, Any]) -> None:
         """
-        Push a finalized 1m bar onto the session queue for later DB flush.
-        Key: q:bars:1m:{routing_key}
+        Push a finalized 1m bar onto the session queue for later DB flush,
+        and into the symbol's recent-bars ring buffer.
+        Keys: q:bars:1m:{routing_key}, bar:1m:recent:{symbol}
         """
         prefix = self._routing_prefix(routing_key)
         key = f"q:bars:1m:{prefix}"
@@ -497,11 +786,79 @@ class LiveDataRedis:
             meta["session_number"] = session_number
 
         bar = {**bar, **meta}
+        encoded = encode_payload(bar, self.codec)
         try:
-            self.client.rpush(key, json.dumps(bar, default=str))
+            pipe = self.client.pipeline(transaction=False)
+            pipe.rpush(key, encoded)
+            self._push_recent_bar(pipe, bar, encoded)
+            pipe.execute()
         except Exception as e:
             logger.error("Failed to enqueue closed bar for %s: %s", routing_key, e)
 
+    # -------------------------
+    # Recent closed bars (ring buffer)
+    # -------------------------
+    def _recent_bars_key(self, symbol: str) -> str:
+        return f"{self.RECENT_BARS_KEY_PREFIX}:{symbol}".lower()
+
+    @staticmethod
+    def _bar_minute_epoch(bar: Dict[str, Any]) -> int | None:
+        try:
+            if bar.get("t") is not None:
+                return int(bar["t"])
+            if bar.get("bucket") is not None:
+                return int(bar["bucket"]) * 60
+        except (TypeError, ValueError):
+            pass
+        return None
+
+    def _push_recent_bar(self, pipe, bar: Dict[str, Any], encoded: str | bytes) -> None:
+        """Queue ring-buffer writes on `pipe`: replace the bar's minute, keep the newest N."""
+        symbol = bar.get("symbol")
+        t = self._bar_minute_epoch(bar)
+        if self.recent_bars_max <= 0 or not symbol or t is None:
+            return
+        key = self._recent_bars_key(symbol)
+        pipe.zremrangebyscore(key, t, t)
+        pipe.zadd(key, {encoded: t})
+        pipe.zremrangebyrank(key, 0, -(self.recent_bars_max + 1))
+
+    def get_recent_bars(
+        self,
+        symbol: str,
+        start_t: int | None = None,
+        end_t: int | None = None,
+    ) -> Tuple[List[Dict[str, Any]], int | None]:
+        """
+        Closed 1m bars from the ring buffer with start_t <= t < end_t, oldest first.
+
+        Returns (bars, oldest_t) where oldest_t is the oldest minute held in the
+        buffer at all (None when empty), so callers know which older range must
+        come from the database. One round trip.
+        """
+        key = self._recent_bars_key(symbol)
+        lo = "-inf" if start_t is None else int(start_t)
+        hi = "+inf" if end_t is None else f"({int(end_t)}"
+        try:
+            pipe = self.raw_client.pipeline(transaction=False)
+            pipe.zrange(key, 0, 0, withscores=True)
+            pipe.zrangebyscore(key, lo, hi)
+            head, raws = pipe.execute()
+        except Exception as e:
+            logger.error("Failed to read recent bars for %s: %s", symbol, e)
+            return [], None
+
+        oldest_t = int(head[0][1]) if head else None
+        bars: List[Dict[str, Any]] = []
+        for raw in raws:
+            try:
+                bar = decode_payload(raw)
+            except Exception:
+                continue
+            if bar:
+                bars.append(bar)
+        return bars, oldest_t
+
     def requeue_processing_closed_bars(self, routing_key: str, limit: int = 10000) -> int:
         """Move any bars stuck in the processing queue back to the main queue (crash recovery)."""
         prefix = self._routing_prefix(routing_key)
@@ -509,8 +866,9 @@ class LiveDataRedis:
         target = f"q:bars:1m:{prefix}"
         moved = 0
         try:
+            # raw_client: queue items may be msgpack (not valid UTF-8).
             for _ in range(limit):
-                item = self.client.rpoplpush(source, target)
+                item = self.raw_client.rpoplpush(source, target)
                 if not item:
                     break
                 moved += 1
@@ -518,19 +876,20 @@ class LiveDataRedis:
             logger.error("Failed to requeue processing bars for %s: %s", prefix, e)
         return moved
 
-    def checkout_closed_bars(self, routing_key: str, count: int = 500) -> Tuple[List[dict], List[str], int]:
+    def checkout_closed_bars(self, routing_key: str, count: int = 500) -> Tuple[List[dict], List[bytes], int]:
         """
         Atomically move up to `count` bars from the main queue to a processing queue.
 
         Returns: (decoded_bars, raw_items, queue_left)
+        raw_items are the undecoded queue entries (bytes) used for ACK/NACK.
         """
         prefix = self._routing_prefix(routing_key)
         source = f"q:bars:1m:{prefix}"
         processing = f"q:bars:1m:{prefix}:processing"
-        items: List[str] = []
+        items: List[bytes] = []
 
         try:
-            pipe = self.client.pipeline()
+            pipe = self.raw_client.pipeline()
             for _ in range(count):
                 pipe.lmove(source, processing, "LEFT", "RIGHT")
             pipe.llen(source)
@@ -547,13 +906,13 @@ class LiveDataRedis:
         decoded: List[dict] = []
         for item in items:
             try:
-                decoded.append(json.loads(item))
+                decoded.append(decode_payload(item))
             except Exception:
                 logger.warning("Failed to decode closed bar payload for %s: %s", prefix, item)
 
         return decoded, items, int(queue_left or 0)
 
-    def acknowledge_closed_bars(self, routing_key: str, items: List[str]) -> None:
+    def acknowledge_closed_bars(self, routing_key: str, items: List[bytes]) -> None:
         """Remove successfully processed items from the processing queue."""
         if not items:
             return
@@ -567,7 +926,7 @@ class LiveDataRedis:
         except Exception as e:
             logger.error("Failed to acknowledge closed bars for %s: %s", prefix, e)
 
-    def return_closed_bars(self, routing_key: str, items: List[str]) -> None:
+    def return_closed_bars(self, routing_key: str, items: List[bytes]) -> None:
         """Return items to the main queue if processing failed (and remove from processing queue)."""
         if not items:
             return
@@ -593,29 +952,115 @@ class LiveDataRedis:
             raw = data.get("country") or data.get("market") or self.DEFAULT_COUNTRY
             norm = self._norm_country(raw) or raw or self.DEFAULT_COUNTRY
 
-            payload = json.dumps({"symbol": sym, **data, "country": norm}, default=str)
+            payload = encode_payload({"symbol": sym, **data, "country": norm}, self.codec)
             self.client.hset(self.LATEST_QUOTES_HASH, sym, payload)
         except Exception as e:
             logger.error("Failed to cache latest quote for %s: %s", symbol, e)
 
     def get_latest_quote(self, symbol: str) -> Dict[str, Any] | None:
         try:
-            raw = self.client.hget(self.LATEST_QUOTES_HASH, symbol.upper())
+            raw = self.raw_client.hget(self.LATEST_QUOTES_HASH, symbol.upper())
             if not raw:
                 return None
-            return json.loads(raw)
+            return decode_payload(raw)
         except Exception as e:
             logger.error("Failed to read latest quote for %s: %s", symbol, e)
             return None
 
     def get_latest_quotes(self, symbols: list[str]) -> list[Dict[str, Any]]:
+        """Read latest quotes for many symbols in one HMGET (missing symbols skipped)."""
+        if not symbols:
+            return []
+        try:
+            raws = self.raw_client.hmget(self.LATEST_QUOTES_HASH, [s.upper() for s in symbols])
+        except Exception as e:
+            logger.error("Failed to read latest quotes: %s", e)
+            return []
+
         out: list[Dict[str, Any]] = []
-        for s in symbols:
-            q = self.get_latest_quote(s)
+        for raw in raws:
+            if not raw:
+                continue
+            try:
+                q = decode_payload(raw)
+            except Exception:
+                continue
             if q:
                 out.append(q)
         return out
 
+    def get_latest_quote_map(self, symbols: list[str]) -> Dict[str, Dict[str, Any]]:
+        """Like get_latest_quotes, keyed by the (upper-cased) requested symbol; one HMGET."""
+        fields = list(dict.fromkeys(s.upper() for s in symbols if s))
+        if not fields:
+            return {}
+        try:
+            raws = self.raw_client.hmget(self.LATEST_QUOTES_HASH, fields)
+        except Exception as e:
+            logger.error("Failed to read latest quotes: %s", e)
+            return {}
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for field, raw in zip(fields, raws):
+            if not raw:
+                continue
+            try:
+                q = decode_payload(raw)
+            except Exception:
+                continue
+            if q:
+                out[field] = q
+        return out
+
+    def get_quote_changes(self, since_version: int, limit: int = 5000) -> Tuple[list[str], int]:
+        """
+        Symbols whose quote changed after `since_version`, oldest change first.
+
+        Returns (symbols, high_water). Pass high_water back on the next call;
+        when `limit` truncates the batch the rest is returned next time. A
+        current counter below `since_version` means Redis was reset, and every
+        versioned symbol is returned again.
+        """
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.get(self.QUOTE_VERSION_KEY)
+            pipe.zrangebyscore(
+                self.QUOTE_VERSIONS_ZSET,
+                f"({int(since_version)}",
+                "+inf",
+                start=0,
+                num=int(limit),
+                withscores=True,
+            )
+            current_raw, rows = pipe.execute()
+        except Exception:
+            logger.debug("Failed to read quote changes", exc_info=True)
+            return [], int(since_version)
+
+        current = int(current_raw or 0)
+        if current < since_version:
+            return self.get_quote_changes(0, limit=limit)
+        if not rows:
+            return [], int(since_version)
+        return [str(sym) for sym, _ in rows], int(rows[-1][1])
+
+    def get_quote_version(self) -> int:
+        """Current value of the global quote version counter (0 when unset)."""
+        try:
+            return int(self.client.get(self.QUOTE_VERSION_KEY) or 0)
+        except Exception:
+            logger.debug("Failed to read %s", self.QUOTE_VERSION_KEY, exc_info=True)
+            return 0
+
+    def get_quote_versions(self) -> Tuple[int, int] | None:
+        """(quote version, raw quote version) in one MGET; None when Redis is unreachable."""
+        try:
+            quote_version, raw_version = self.client.mget([self.QUOTE_VERSION_KEY, self.RAW_QUOTE_VERSION_KEY])
+            return int(quote_version or 0), int(raw_version or 0)
+        except Exception:
+            logger.debug("Failed to read quote versions", exc_info=True)
+            return None
+
     # -------------------------
     # Excel lock
     # -------------------------
@@ -638,6 +1083,57 @@ class LiveDataRedis:
     # -------------------------
     # Publish helpers (quotes/positions/balances/orders/transactions)
     # -------------------------
+    @staticmethod
+    def _provider_norm(provider: str | None, data: Dict[str, Any]) -> str:
+        return (provider or data.get("provider") or data.get("source") or "").strip().upper()
+
+    def _quote_source_allows(self, sym: str, provider_norm: str) -> bool:
+        """Return False when the symbol is pinned to a different quote source."""
+        if not provider_norm:
+            return True
+        try:
+            desired = self.get_quote_source_map().get(sym)
+        except Exception:
+            desired = None
+        desired_norm = (desired or "AUTO").strip().upper()
+        return desired_norm in {"", "AUTO"} or provider_norm == desired_norm
+
+    def get_quote_source_map(self) -> Dict[str, str]:
+        """symbol -> preferred quote source (instruments:quote_source), process-cached."""
+        return self.config_cache.get(
+            self.INSTRUMENT_QUOTE_SOURCE_HASH,
+            lambda c: c.hgetall(self.INSTRUMENT_QUOTE_SOURCE_HASH) or {},
+        )
+
+    def _build_quote_payload(
+        self,
+        sym: str,
+        data: Dict[str, Any],
+        *,
+        provider: str | None = None,
+        asset_type: str | None = None,
+        ts: int | float | str | datetime | None = None,
+    ) -> Dict[str, Any]:
+        """Build the normalized quote payload (country + epoch ts) shared by publish paths."""
+        raw = data.get("country") or data.get("market") or self.DEFAULT_COUNTRY
+        norm = self._norm_country(raw) or raw or self.DEFAULT_COUNTRY
+
+        ts_raw = ts or data.get("ts") or data.get("timestamp") or data.get("time") or data.get("datetime")
+        ts_epoch = _to_epoch_seconds_utc(ts_raw)
+
+        payload: Dict[str, Any] = {
+            "type": "quote",
+            "symbol": sym,
+            **data,
+            "country": norm,
+            "ts": ts_epoch,
+        }
+        if provider:
+            payload["provider"] = provider
+        if asset_type:
+            payload["asset_type"] = asset_type
+        return payload
+
     def publish_quote(
         self,
         symbol: str,
@@ -665,34 +1161,13 @@ class LiveDataRedis:
         channel = get_quotes_channel(sym)
 
         # Enforce per-symbol quote source preference when we can identify the provider.
-        provider_norm = (
-            (provider or data.get("provider") or data.get("source") or "")
-            .strip()
-            .upper()
-        )
-        if provider_norm:
-            try:
-                desired = self.client.hget(self.INSTRUMENT_QUOTE_SOURCE_HASH, sym)
-            except Exception:
-                desired = None
-            desired_norm = (desired or "AUTO").strip().upper()
-            if desired_norm not in {"", "AUTO"} and provider_norm != desired_norm:
-                # Ignore ticks from non-selected feeds (prevents cross-feed overwrites).
-                return 0
-
-        raw = data.get("country") or data.get("market") or self.DEFAULT_COUNTRY
-        norm = self._norm_country(raw) or raw or self.DEFAULT_COUNTRY
-
-        ts_raw = ts or data.get("ts") or data.get("timestamp") or data.get("time") or data.get("datetime")
-        ts_epoch = _to_epoch_seconds_utc(ts_raw)
+        provider_norm = self._provider_norm(provider, data)
+        if not self._quote_source_allows(sym, provider_norm):
+            # Ignore ticks from non-selected feeds (prevents cross-feed overwrites).
+            return 0
 
-        payload: Dict[str, Any] = {
-            "type": "quote",
-            "symbol": sym,
-            **data,
-            "country": norm,
-            "ts": ts_epoch,
-        }
+        payload = self._build_quote_payload(sym, data, provider=provider, asset_type=asset_type, ts=ts)
+        ts_epoch = payload["ts"]
 
         # If another provider sends partial quotes (e.g. volume-only), don't
         # overwrite previously-known bid/ask/last with None.
@@ -704,32 +1179,214 @@ class LiveDataRedis:
         except Exception:
             # Never fail publishing due to a merge attempt.
             pass
-        if provider:
-            payload["provider"] = provider
-        if asset_type:
-            payload["asset_type"] = asset_type
 
-        result = self.publish(channel, payload)
+        result = self.publish(channel, payload, codec=self.codec)
         self.set_latest_quote(sym, payload)
 
         # Track "active" symbols for snapshot batching (score = last update epoch seconds)
+        # and bump the symbol's quote version for change-driven readers.
         try:
-            self.client.zadd(self.ACTIVE_QUOTES_ZSET, {sym: float(ts_epoch)})
+            self._mark_quote_script(
+                keys=[self.ACTIVE_QUOTES_ZSET, self.QUOTE_VERSION_KEY, self.QUOTE_VERSIONS_ZSET],
+                args=[sym, float(ts_epoch)],
+            )
         except Exception:
-            logger.debug("Failed to update active symbols zset", exc_info=True)
+            logger.debug("Failed to update active symbols / quote versions", exc_info=True)
 
         if broadcast_ws:
+            self._broadcast_quote_tick(sym, payload)
+
+        return result
+
+    def ingest_tick(
+        self,
+        symbol: str,
+        data: Dict[str, Any],
+        *,
+        provider: str | None = None,
+        asset_type: str | None = None,
+        ts: int | float | str | datetime | None = None,
+        routing_key: str | None = None,
+        bar_tick: Dict[str, Any] | None = None,
+        tick_ttl: int = 10,
+        broadcast_ws: bool = False,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Ingest one streaming tick in a single Redis round trip.
+
+        Runs a server-side script that performs, atomically:
+          - quote-source preference check (instruments:quote_source)
+          - bid/ask/last merge with the previous latest quote
+          - PUBLISH + latest snapshot HSET + active-symbol ZADD
+          - tick cache SET (when routing_key is given)
+          - 1m bar update/rollover + closed-bar RPUSH (when bar_tick is given)
+
+        Equivalent to publish_quote + set_tick + upsert_current_bar_1m +
+        enqueue_closed_bar, but with one RTT instead of up to eight.
+
+        Returns:
+            (closed_bar, merged_quote). merged_quote is None when the tick was
+            rejected by the per-symbol quote source preference.
+        """
+        from .channels import get_quotes_channel
+
+        sym = symbol.upper()
+        provider_norm = self._provider_norm(provider, data)
+        payload = self._build_quote_payload(sym, data, provider=provider, asset_type=asset_type, ts=ts)
+
+        session_number = self._parse_session_number(routing_key) if routing_key is not None else None
+
+        bar_arg = ""
+        if routing_key is not None and bar_tick is not None:
+            norm = self._normalize_bar_tick(bar_tick)
+            bucket = norm["ts_epoch"] // 60
+            minute_epoch = bucket * 60
+            bar_arg = json.dumps(
+                {
+                    "bucket": bucket,
+                    "t": minute_epoch,
+                    "timestamp_minute": datetime.fromtimestamp(minute_epoch, tz=dt_timezone.utc).isoformat(),
+                    "price": norm["price"],
+                    "open": norm["open"],
+                    "high": norm["high"],
+                    "low": norm["low"],
+                    "volume": norm["volume"],
+                    "bid": norm["bid"],
+                    "ask": norm["ask"],
+                    "spread": norm["spread"],
+                    "country": bar_tick.get("country"),
+                    "symbol": symbol,
+                    "routing_key": routing_key,
+                },
+                default=str,
+            )
+
+        prefix = self._routing_prefix(routing_key)
+        keys = [
+            self.INSTRUMENT_QUOTE_SOURCE_HASH,
+            self.LATEST_QUOTES_HASH,
+            self.ACTIVE_QUOTES_ZSET,
+            f"tick:{prefix}:{sym}".lower(),
+            f"bar:1m:current:{prefix}:{symbol}".lower(),
+            f"q:bars:1m:{prefix}",
+            self._recent_bars_key(symbol),
+            self.QUOTE_VERSION_KEY,
+            self.QUOTE_VERSIONS_ZSET,
+        ]
+        args = [
+            sym,
+            provider_norm,
+            json.dumps(payload, default=str),
+            float(payload["ts"]),
+            get_quotes_channel(sym),
+            int(tick_ttl) if routing_key is not None else "",
+            bar_arg,
+            session_number if session_number is not None else "",
+            self.codec,
+            self.recent_bars_max,
+        ]
+
+        # Fall back to the per-call path only when Redis provably did not run
+        # the script. Scripts are not rolled back, so replaying a tick after a
+        # partial run (or a reply lost in flight) would publish it twice and
+        # add its volume to the bar twice; such ticks are logged and dropped.
+        result = None
+        not_run = None
+        pool = self.raw_client.connection_pool
+        try:
+            # Connect before sending: a failure here means nothing went out.
+            pool.release(pool.get_connection("EVALSHA"))
+        except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
+            not_run = e
+        else:
             try:
-                from api.websocket.broadcast import broadcast_to_websocket_sync
+                result = self._ingest_tick_script(keys=keys, args=args)
+            except Exception as e:
+                if not _script_refused(e):
+                    logger.exception("ingest_tick script failed for %s; dropping tick", sym)
+                    return None, None
+                not_run = e
+
+        if not_run is not None:
+            logger.warning("ingest_tick script not run for %s (%s); falling back to per-call path", sym, not_run)
+            return self._ingest_tick_fallback(
+                sym,
+                data,
+                provider=provider,
+                asset_type=asset_type,
+                ts=ts,
+                routing_key=routing_key,
+                bar_tick=bar_tick,
+                tick_ttl=tick_ttl,
+                broadcast_ws=broadcast_ws,
+            )
+
+        if not result:
+            return None, None
 
-                broadcast_to_websocket_sync(
-                    channel_layer=None,
-                    message={"type": "quote_tick", "data": payload},
-                )
+        merged_raw, closed_raw = result[0], result[1]
+        try:
+            merged = decode_payload(merged_raw)
+        except Exception:
+            merged = payload
+
+        closed_bar = None
+        if closed_raw:
+            try:
+                closed_bar = decode_payload(closed_raw)
             except Exception:
-                logger.exception("Failed to broadcast quote to WebSocket for %s", sym)
+                logger.warning("Failed to decode closed bar for %s: %s", sym, closed_raw)
 
-        return result
+        if broadcast_ws:
+            self._broadcast_quote_tick(sym, merged)
+
+        return closed_bar, merged
+
+    def _ingest_tick_fallback(
+        self,
+        sym: str,
+        data: Dict[str, Any],
+        *,
+        provider: str | None,
+        asset_type: str | None,
+        ts: int | float | str | datetime | None,
+        routing_key: str | None,
+        bar_tick: Dict[str, Any] | None,
+        tick_ttl: int,
+        broadcast_ws: bool,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Multi-call equivalent of ingest_tick (used when scripting is unavailable)."""
+        provider_norm = self._provider_norm(provider, data)
+        if not self._quote_source_allows(sym, provider_norm):
+            return None, None
+
+        self.publish_quote(sym, data, provider=provider, asset_type=asset_type, ts=ts, broadcast_ws=broadcast_ws)
+        merged = self.get_latest_quote(sym)
+
+        closed_bar = None
+        if routing_key is not None:
+            tick = merged or data
+            session_number = self._parse_session_number(routing_key)
+            if session_number is not None:
+                tick = {**tick, "session_number": session_number}
+            self.set_tick(routing_key, sym, tick, ttl=tick_ttl)
+            if bar_tick is not None:
+                closed_bar, _cur = self.upsert_current_bar_1m(routing_key, sym, bar_tick)
+                if closed_bar:
+                    self.enqueue_closed_bar(routing_key, closed_bar)
+        return closed_bar, merged
+
+    def _broadcast_quote_tick(self, sym: str, payload: Dict[str, Any]) -> None:
+        try:
+            from api.websocket.broadcast import broadcast_symbol_message_sync
+
+            broadcast_symbol_message_sync(
+                None,
+                sym,
+                {"type": "quote_tick", "data": payload},
+            )
+        except Exception:
+            logger.exception("Failed to broadcast quote to WebSocket for %s", sym)
 
     def publish_raw_quote(self, symbol: str, data: Dict[str, Any]) -> int:
         """Publish a raw quote without requiring country. Stores snapshot and publishes a raw channel."""
@@ -738,12 +1395,34 @@ class LiveDataRedis:
         try:
             key = f"raw:quote:{symbol_upper}"
             self.set_json(key, payload)
+            self.client.incr(self.RAW_QUOTE_VERSION_KEY)
             channel = "raw:quotes"
             return self.publish(channel, payload)
         except Exception:
             logger.exception("Failed to publish raw quote for %s", symbol_upper)
             return 0
 
+    def get_raw_quotes(self, symbols: list[str]) -> Dict[str, Dict[str, Any]]:
+        """Raw quote snapshots (publish_raw_quote) for many symbols in one MGET."""
+        syms = list(dict.fromkeys(s.upper() for s in symbols if s))
+        if not syms:
+            return {}
+        try:
+            raws = self.client.mget([f"raw:quote:{sym}" for sym in syms])
+        except Exception as e:
+            logger.error("Failed to read raw quotes: %s", e)
+            return {}
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for sym, raw in zip(syms, raws):
+            if not raw:
+                continue
+            try:
+                out[sym] = json.loads(raw)
+            except Exception:
+                continue
+        return out
+
     def set_json(self, key: str, value: Dict[str, Any], ex: int | None = None) -> None:
         """Store JSON payload at a Redis key (helper for background workers)."""
         try:
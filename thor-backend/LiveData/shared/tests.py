@@ -0,0 +1,373 @@
+import time
+from unittest import mock
+
+import redis
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from .codec import CODEC_JSON, CODEC_MSGPACK, MSGPACK_V1_PREFIX, decode_payload, encode_payload, msgpack
+from .config_cache import RedisEpoch
+from .redis_client import LiveDataRedis
+
+
+class _FakeListRedis:
+	"""Minimal list-only Redis stand-in sharing storage between clients."""
+
+	def __init__(self, lists, decode_responses):
+		self.lists = lists
+		self.decode_responses = decode_responses
+
+	def rpoplpush(self, source, target):
+		items = self.lists.get(source) or []
+		if not items:
+			return None
+		item = items.pop()
+		self.lists.setdefault(target, []).insert(0, item)
+		if self.decode_responses:
+			# redis-py decodes the reply after Redis already moved the item.
+			return item.decode("utf-8")
+		return item
+
+
+class RequeueProcessingClosedBarsTests(SimpleTestCase):
+	def setUp(self):
+		if msgpack is None:
+			self.skipTest("msgpack not installed")
+		self.lists = {}
+		self.redis = LiveDataRedis.__new__(LiveDataRedis)
+		self.redis.client = _FakeListRedis(self.lists, decode_responses=True)
+		self.redis.raw_client = _FakeListRedis(self.lists, decode_responses=False)
+
+	def test_requeues_all_msgpack_bars(self):
+		bars = [{"symbol": "ES", "t": 60 * i, "c": 5000.0 + i} for i in range(3)]
+		self.lists["q:bars:1m:1:processing"] = [encode_payload(b, CODEC_MSGPACK) for b in bars]
+
+		moved = self.redis.requeue_processing_closed_bars("1")
+
+		self.assertEqual(moved, 3)
+		self.assertEqual(self.lists["q:bars:1m:1:processing"], [])
+		self.assertEqual([decode_payload(i) for i in self.lists["q:bars:1m:1"]], bars)
+
+
+class PayloadCodecTests(SimpleTestCase):
+	payload = {"symbol": "ES", "bid": 5000.25, "ask": 5000.5, "volume": 1200, "ts": "2026-01-06T14:30:00Z"}
+
+	def test_json_round_trip(self):
+		raw = encode_payload(self.payload, "json")
+		self.assertIsInstance(raw, str)
+		self.assertEqual(decode_payload(raw), self.payload)
+
+	def test_msgpack_round_trip(self):
+		if msgpack is None:
+			self.skipTest("msgpack not installed")
+		raw = encode_payload(self.payload, CODEC_MSGPACK)
+		self.assertIsInstance(raw, bytes)
+		self.assertEqual(decode_payload(raw), self.payload)
+
+	def test_decodes_legacy_json_bytes_and_str(self):
+		legacy = '{"symbol": "ES", "bid": 5000.25}'
+		expected = {"symbol": "ES", "bid": 5000.25}
+		self.assertEqual(decode_payload(legacy), expected)
+		self.assertEqual(decode_payload(legacy.encode("utf-8")), expected)
+
+	def test_empty_payload_decodes_to_none(self):
+		for raw in (None, b"", ""):
+			self.assertIsNone(decode_payload(raw))
+
+
+class _FakeEpochRedis:
+	def __init__(self):
+		self.values = {}
+		self.gets = 0
+		self.fail = False
+
+	def get(self, key):
+		self.gets += 1
+		if self.fail:
+			raise ConnectionError("down")
+		return self.values.get(key)
+
+	def pipeline(self):
+		return _FakeEpochPipeline(self)
+
+
+class _FakeEpochPipeline:
+	def __init__(self, redis):
+		self.redis = redis
+		self.ops = []
+
+	def delete(self, key):
+		self.ops.append(("delete", key))
+
+	def incr(self, key):
+		self.ops.append(("incr", key))
+
+	def execute(self):
+		if self.redis.fail:
+			raise ConnectionError("down")
+		out = []
+		for op, key in self.ops:
+			if op == "delete":
+				out.append(int(self.redis.values.pop(key, None) is not None))
+			else:
+				self.redis.values[key] = int(self.redis.values.get(key) or 0) + 1
+				out.append(self.redis.values[key])
+		return out
+
+
+class RedisEpochTests(SimpleTestCase):
+	def setUp(self):
+		self.redis = _FakeEpochRedis()
+
+	def test_unset_epoch_reads_as_zero_and_is_rate_limited(self):
+		epoch = RedisEpoch("k", check_seconds=60, client=self.redis)
+		self.assertEqual(epoch.current(), "0")
+		self.redis.values["k"] = 7
+		self.assertEqual(epoch.current(), "0")
+		self.assertEqual(self.redis.gets, 1)
+
+	def test_other_process_bump_is_seen_after_check_interval(self):
+		epoch = RedisEpoch("k", check_seconds=0, client=self.redis)
+		self.assertEqual(epoch.current(), "0")
+		RedisEpoch("k", client=self.redis).bump()
+		self.assertEqual(epoch.current(), "1")
+
+	def test_bump_deletes_derived_keys_and_adopts_value(self):
+		self.redis.values["derived"] = "x"
+		epoch = RedisEpoch("k", check_seconds=60, client=self.redis)
+		self.assertEqual(epoch.bump(delete=["derived"]), "1")
+		self.assertNotIn("derived", self.redis.values)
+		self.assertEqual(epoch.current(), "1")
+		self.assertEqual(self.redis.gets, 0)
+
+	def test_read_error_keeps_last_value_and_flags_unavailable(self):
+		epoch = RedisEpoch("k", check_seconds=0, client=self.redis)
+		self.redis.values["k"] = 3
+		self.assertEqual(epoch.current(), "3")
+		self.redis.fail = True
+		self.assertEqual(epoch.current(), "3")
+		self.assertFalse(epoch.available)
+		self.assertIsNone(epoch.bump())
+		self.redis.fail = False
+		self.assertEqual(epoch.current(), "3")
+		self.assertTrue(epoch.available)
+
+
+REDIS_CLIENT_LOGGER = "LiveData.shared.redis_client"
+
+
+class IngestTickFallbackTests(SimpleTestCase):
+	def setUp(self):
+		self.redis = LiveDataRedis()
+		self.fallback = mock.patch.object(self.redis, "_ingest_tick_fallback", return_value=(None, {"symbol": "ES"}))
+		self.fallback.start()
+		self.addCleanup(self.fallback.stop)
+
+	def _ingest(self):
+		return self.redis.ingest_tick("ES", {"bid": 1.0}, provider="schwab", routing_key="1", bar_tick={"price": 1.0})
+
+	def test_connect_failure_falls_back(self):
+		with mock.patch.object(
+			self.redis.raw_client.connection_pool,
+			"get_connection",
+			side_effect=redis.exceptions.ConnectionError("refused"),
+		), self.assertLogs(REDIS_CLIENT_LOGGER, "WARNING"):
+			self.assertEqual(self._ingest(), (None, {"symbol": "ES"}))
+		self.redis._ingest_tick_fallback.assert_called_once()
+
+	def test_refused_script_falls_back(self):
+		for exc in (
+			redis.exceptions.NoScriptError("No matching script"),
+			redis.exceptions.ResponseError("unknown command 'EVALSHA'"),
+		):
+			with self.subTest(exc=exc), self._script_raising(exc), self.assertLogs(REDIS_CLIENT_LOGGER, "WARNING"):
+				self.assertEqual(self._ingest(), (None, {"symbol": "ES"}))
+
+	def test_error_after_send_drops_tick(self):
+		for exc in (
+			redis.exceptions.ResponseError("Error running script (call to f_123): @user_script:1: oops"),
+			redis.exceptions.ConnectionError("Connection closed by server."),
+			redis.exceptions.TimeoutError("Timeout reading from socket"),
+		):
+			with self.subTest(exc=exc), self._script_raising(exc), self.assertLogs(REDIS_CLIENT_LOGGER, "ERROR"):
+				self.assertEqual(self._ingest(), (None, None))
+		self.redis._ingest_tick_fallback.assert_not_called()
+
+	def _script_raising(self, exc):
+		# The connection checks out fine; the script call itself fails.
+		self.redis._ingest_tick_script = mock.Mock(side_effect=exc)
+		return mock.patch.multiple(self.redis.raw_client.connection_pool, get_connection=mock.DEFAULT, release=mock.DEFAULT)
+
+
+# The ingest tests below talk to the Redis in settings (REDIS_HOST/REDIS_PORT)
+# and flush this database, so it must not hold anything else.
+INGEST_TEST_REDIS_DB = 15
+
+
+@override_settings(
+	REDIS_DB=INGEST_TEST_REDIS_DB,
+	LIVE_DATA_RECENT_BARS=2,
+	LIVE_DATA_CONFIG_CACHE_TTL=0,
+	LIVE_DATA_CONFIG_CACHE_NOTIFY=False,
+)
+class IngestTickParityTests(SimpleTestCase):
+	"""ingest_tick's script must leave Redis exactly as the per-call path does."""
+
+	routing_key = "7"
+
+	def setUp(self):
+		probe = redis.Redis(
+			host=settings.REDIS_HOST,
+			port=settings.REDIS_PORT,
+			db=INGEST_TEST_REDIS_DB,
+			socket_connect_timeout=1,
+			socket_timeout=1,
+		)
+		try:
+			probe.ping()
+		except redis.exceptions.RedisError:
+			self.skipTest("Redis not reachable")
+		self.redis = LiveDataRedis()
+		self.redis.client.flushdb()
+		self.addCleanup(self.redis.client.flushdb)
+
+	def _ticks(self):
+		base = (int(time.time()) // 60 - 60) * 60
+
+		def quote(ts, **fields):
+			return {"ts": ts, **fields}
+
+		def bar(ts, price, volume, **fields):
+			return {"ts": ts, "price": price, "volume": volume, **fields}
+
+		return [
+			(quote(base + 5, bid=100.0, ask=100.5, last=100.25, volume=5), bar(base + 5, 100.25, 5, bid=100.0, ask=100.5)),
+			# Volume-only quote: bid/ask/last carry over; the bar keeps its bid/ask.
+			(quote(base + 20, volume=3), bar(base + 20, 100.5, 3)),
+			# Rollover into the next minute.
+			(quote(base + 65, bid=100.75, ask=101.25, last=101.0), bar(base + 65, 101.0, 2, bid=100.75, ask=101.25)),
+			# Conflated window: open/high/low describe several ticks.
+			(quote(base + 70, last=100.9), bar(base + 70, 100.9, 4, open=101.0, high=101.5, low=100.8)),
+			# Late tick from an earlier minute stays in the current bar.
+			(quote(base + 50, last=100.95), bar(base + 50, 100.95, 1)),
+			(quote(base + 125, last=102.0), bar(base + 125, 102.0, 1)),
+			(quote(base + 185, last=103.0), bar(base + 185, 103.0, 1)),
+			(quote(base + 245, last=104.0), bar(base + 245, 104.0, 1)),
+		]
+
+	def _replay(self, codec, *, scripted, provider="schwab", ticks=None):
+		self.redis.client.flushdb()
+		self.redis.codec = codec
+		ingest = self._ingest if scripted else self._ingest_per_call
+		results = [ingest(data, bar_tick, provider) for data, bar_tick in (ticks if ticks is not None else self._ticks())]
+		return results, self._state()
+
+	def _state(self):
+		raw = self.redis.raw_client
+		return {
+			"latest": decode_payload(raw.hget(LiveDataRedis.LATEST_QUOTES_HASH, "ES")),
+			"tick": decode_payload(raw.get(f"tick:{self.routing_key}:es")),
+			"current": decode_payload(raw.get(f"bar:1m:current:{self.routing_key}:es")),
+			"queue": [decode_payload(i) for i in raw.lrange(f"q:bars:1m:{self.routing_key}", 0, -1)],
+			"recent": [decode_payload(i) for i in raw.zrange("bar:1m:recent:es", 0, -1)],
+			"active": raw.zrange(LiveDataRedis.ACTIVE_QUOTES_ZSET, 0, -1),
+			"version": raw.get(LiveDataRedis.QUOTE_VERSION_KEY),
+		}
+
+	def _codecs(self):
+		return [CODEC_JSON] + ([CODEC_MSGPACK] if msgpack is not None else [])
+
+	def test_script_matches_per_call_path(self):
+		for codec in self._codecs():
+			with self.subTest(codec=codec):
+				scripted = self._replay(codec, scripted=True)
+				per_call = self._replay(codec, scripted=False)
+				self.assertEqual(scripted, per_call)
+
+	def test_rollover_and_ring_buffer_trim(self):
+		for codec in self._codecs():
+			with self.subTest(codec=codec):
+				results, state = self._replay(codec, scripted=True)
+				closed = [closed_bar for closed_bar, _merged in results]
+				self.assertEqual([bool(b) for b in closed], [False, False, True, False, False, True, True, True])
+
+				first = closed[2]
+				self.assertEqual((first["o"], first["h"], first["l"], first["c"], first["v"]), (100.25, 100.5, 100.25, 100.5, 8))
+				self.assertEqual((first["bid"], first["ask"], first["session_number"]), (100.0, 100.5, 7))
+				second = closed[5]
+				self.assertEqual((second["o"], second["h"], second["l"], second["c"], second["v"]), (101.0, 101.5, 100.8, 100.95, 7))
+
+				self.assertEqual(len(state["queue"]), 4)
+				# Ring buffer keeps the newest LIVE_DATA_RECENT_BARS closed bars.
+				self.assertEqual([b["c"] for b in state["recent"]], [102.0, 103.0])
+				self.assertEqual(state["current"]["c"], 104.0)
+
+	def test_partial_quote_merges_previous_bid_ask_last(self):
+		for codec in self._codecs():
+			with self.subTest(codec=codec):
+				results, _state = self._replay(codec, scripted=True)
+				merged = results[1][1]
+				self.assertEqual((merged["bid"], merged["ask"], merged["last"], merged["volume"]), (100.0, 100.5, 100.25, 3))
+
+	def test_writes_configured_codec(self):
+		for codec in self._codecs():
+			with self.subTest(codec=codec):
+				self._replay(codec, scripted=True)
+				raw = self.redis.raw_client
+				stored = [
+					raw.hget(LiveDataRedis.LATEST_QUOTES_HASH, "ES"),
+					raw.get(f"bar:1m:current:{self.routing_key}:es"),
+					raw.lindex(f"q:bars:1m:{self.routing_key}", 0),
+				]
+				for value in stored:
+					self.assertEqual(value.startswith(MSGPACK_V1_PREFIX), codec == CODEC_MSGPACK)
+
+	def test_reads_values_written_in_the_other_codec(self):
+		if msgpack is None:
+			self.skipTest("msgpack not installed")
+		ticks = self._ticks()
+		for first, second in ((CODEC_JSON, CODEC_MSGPACK), (CODEC_MSGPACK, CODEC_JSON)):
+			with self.subTest(first=first, second=second):
+				self._replay(first, scripted=True, ticks=ticks[:2])
+				self.redis.codec = second
+				data, bar_tick = ticks[2]
+				closed, merged = self.redis.ingest_tick(
+					"ES", {"volume": 1, "ts": data["ts"]}, provider="schwab", routing_key=self.routing_key, bar_tick=bar_tick
+				)
+				self.assertEqual((merged["bid"], merged["last"]), (100.0, 100.25))
+				self.assertEqual((closed["o"], closed["v"]), (100.25, 8))
+
+	def test_quote_source_preference_rejects_other_feeds(self):
+		for codec in self._codecs():
+			for scripted in (True, False):
+				with self.subTest(codec=codec, scripted=scripted):
+					self.redis.client.flushdb()
+					self.redis.codec = codec
+					self.redis.client.hset(LiveDataRedis.INSTRUMENT_QUOTE_SOURCE_HASH, "ES", " tos ")
+					data, bar_tick = self._ticks()[0]
+					ingest = self._ingest if scripted else self._ingest_per_call
+					self.assertEqual(ingest(data, bar_tick, "schwab"), (None, None))
+					self.assertIsNone(self.redis.raw_client.hget(LiveDataRedis.LATEST_QUOTES_HASH, "ES"))
+					self.assertIsNone(self.redis.raw_client.get(f"bar:1m:current:{self.routing_key}:es"))
+
+					_closed, merged = ingest(data, bar_tick, "TOS")
+					self.assertEqual(merged["bid"], 100.0)
+
+					self.redis.client.hset(LiveDataRedis.INSTRUMENT_QUOTE_SOURCE_HASH, "ES", "AUTO")
+					self.assertIsNotNone(ingest(data, bar_tick, "schwab")[1])
+
+	def _ingest(self, data, bar_tick, provider):
+		return self.redis.ingest_tick("ES", data, provider=provider, routing_key=self.routing_key, bar_tick=bar_tick)
+
+	def _ingest_per_call(self, data, bar_tick, provider):
+		return self.redis._ingest_tick_fallback(
+			"ES",
+			data,
+			provider=provider,
+			asset_type=None,
+			ts=None,
+			routing_key=self.routing_key,
+			bar_tick=bar_tick,
+			tick_ttl=10,
+			broadcast_ws=False,
+		)
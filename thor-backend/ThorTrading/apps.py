@@ -59,6 +59,9 @@ class ThorTradingConfig(AppConfig):
         # (Models live under ThorTrading.studies.models.* and must be imported during app init.)
         from ThorTrading.studies.models import study as _study_models  # noqa: F401
         from ThorTrading.studies import load as _study_modules  # noqa: F401
+        from ThorTrading.studies.futures_total.quotes.classification import connect_classification_signals
+
+        connect_classification_signals()
 
         logger = logging.getLogger(__name__)
         argv = sys.argv or []
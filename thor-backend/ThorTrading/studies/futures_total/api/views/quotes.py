@@ -9,7 +9,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from Instruments.models import Instrument
-from ThorTrading.studies.futures_total.quotes import get_enriched_quotes_with_composite
+from ThorTrading.studies.futures_total.quotes import get_cached_enriched_quotes
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ class LatestQuotesView(APIView):
 
 	def get(self, request):
 		try:
-			rows, total = get_enriched_quotes_with_composite()
+			rows, total = get_cached_enriched_quotes()
 			return Response({"rows": rows, "total": total}, status=status.HTTP_200_OK)
 		except Exception as exc:  # noqa: BLE001
 			logger.error("Error in LatestQuotesView: %s", exc)
@@ -40,7 +40,7 @@ class RibbonQuotesView(APIView):
 
 	def get(self, request):
 		try:
-			rows, _ = get_enriched_quotes_with_composite()
+			rows, _ = get_cached_enriched_quotes()
 
 			# Source the ribbon universe from the master Instruments catalog.
 			# (Future hardening: add an explicit ribbon flag on Instrument or via a join model.)
@@ -1,13 +1,18 @@
 from .enrich import fetch_raw_quotes, build_enriched_rows, get_enriched_quotes_with_composite
-from .classification import classify, enrich_quote_row, compute_composite
+from .cache import get_cached_enriched_quotes, invalidate_enriched_quotes
+from .classification import classify, classify_many, enrich_quote_row, enrich_quote_rows, compute_composite
 from .row_metrics import compute_row_metrics
 
 __all__ = [
     "fetch_raw_quotes",
     "build_enriched_rows",
     "get_enriched_quotes_with_composite",
+    "get_cached_enriched_quotes",
+    "invalidate_enriched_quotes",
     "classify",
+    "classify_many",
     "enrich_quote_row",
+    "enrich_quote_rows",
     "compute_composite",
     "compute_row_metrics",
 ]
@@ -0,0 +1,148 @@
+"""Shared enriched-quote cache for the Futures Total study.
+
+get_enriched_quotes_with_composite() costs a round of DB queries (instruments,
+52w stats, markets, control countries, classification tables) per call, and the
+market_metrics job, open/close capture and the quotes API all need it.
+get_cached_enriched_quotes() shares one computation per quote version:
+
+  - the version is (live_data:quote_version, live_data:raw_quote_version),
+    bumped by every publish_quote / ingest_tick and publish_raw_quote
+  - process memory holds the last result; concurrent callers wait for the
+    computation in progress instead of starting their own
+  - Redis (thor:futures_total:enriched_quotes) holds it too, so web workers
+    reuse what the heartbeat already computed
+
+Entries also expire after THOR_ENRICHED_QUOTES_TTL seconds, which bounds how
+long DB-side edits (instruments, weights, 52w stats) take to show up.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from LiveData.shared.redis_client import live_data_redis
+
+from .enrich import get_enriched_quotes_with_composite
+
+logger = logging.getLogger(__name__)
+
+ENRICHED_QUOTES_KEY = "thor:futures_total:enriched_quotes"
+
+
+@dataclass(frozen=True)
+class _Entry:
+    version: str
+    computed_at: float  # wall clock, comparable across processes
+    rows: List[Dict]
+    composite: Dict
+
+    def fresh(self, version: str, ttl: float) -> bool:
+        return self.version == version and time.time() - self.computed_at < ttl
+
+
+_lock = threading.Lock()
+_entry: Optional[_Entry] = None
+
+
+def _ttl() -> float:
+    try:
+        return max(0.0, float(getattr(settings, "THOR_ENRICHED_QUOTES_TTL", 2.0) or 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _current_version() -> Optional[str]:
+    versions = live_data_redis.get_quote_versions()
+    if versions is None:
+        return None
+    return "%d:%d" % versions
+
+
+def _load_from_redis(version: str, ttl: float) -> Optional[_Entry]:
+    try:
+        raw = live_data_redis.client.get(ENRICHED_QUOTES_KEY)
+        if not raw:
+            return None
+        data = json.loads(raw)
+        entry = _Entry(
+            version=str(data["version"]),
+            computed_at=float(data["computed_at"]),
+            rows=data["rows"],
+            composite=data["composite"],
+        )
+    except Exception:
+        logger.debug("Failed loading %s", ENRICHED_QUOTES_KEY, exc_info=True)
+        return None
+    return entry if entry.fresh(version, ttl) else None
+
+
+def _store_in_redis(entry: _Entry, ttl: float) -> None:
+    try:
+        payload = json.dumps(
+            {
+                "version": entry.version,
+                "computed_at": entry.computed_at,
+                "rows": entry.rows,
+                "composite": entry.composite,
+            },
+            default=str,
+        )
+        live_data_redis.client.set(ENRICHED_QUOTES_KEY, payload, px=max(1, int(ttl * 1000)))
+    except Exception:
+        logger.debug("Failed storing %s", ENRICHED_QUOTES_KEY, exc_info=True)
+
+
+def get_cached_enriched_quotes() -> Tuple[List[Dict], Dict]:
+    """
+    Same result as get_enriched_quotes_with_composite(), computed at most once
+    per quote version (and TTL) across callers.
+
+    Callers get their own copies, so filtering or annotating rows is safe.
+    """
+    global _entry
+
+    ttl = _ttl()
+    version = _current_version() if ttl > 0 else None
+    if version is None:
+        return get_enriched_quotes_with_composite()
+
+    entry = _entry
+    if entry is None or not entry.fresh(version, ttl):
+        with _lock:
+            entry = _entry
+            if entry is None or not entry.fresh(version, ttl):
+                entry = _load_from_redis(version, ttl)
+                if entry is None:
+                    # Tagged with the version read before computing: quotes that land
+                    # meanwhile move the version on and the next caller recomputes.
+                    rows, composite = get_enriched_quotes_with_composite()
+                    entry = _Entry(version=version, computed_at=time.time(), rows=rows, composite=composite)
+                    _store_in_redis(entry, ttl)
+                _entry = entry
+
+    return copy.deepcopy(entry.rows), copy.deepcopy(entry.composite)
+
+
+def invalidate_enriched_quotes() -> None:
+    """Drop the cached result here and in Redis."""
+    global _entry
+    _entry = None
+    try:
+        live_data_redis.client.delete(ENRICHED_QUOTES_KEY)
+    except Exception:
+        logger.debug("Failed deleting %s", ENRICHED_QUOTES_KEY, exc_info=True)
+
+
+__all__ = [
+    "ENRICHED_QUOTES_KEY",
+    "get_cached_enriched_quotes",
+    "invalidate_enriched_quotes",
+]
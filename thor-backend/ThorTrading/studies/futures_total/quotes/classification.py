@@ -5,134 +5,252 @@ All thresholds/weights come from admin-managed models:
 - SignalStatValue (per instrument + signal threshold)
 - ContractWeight (per instrument weight; can be negative to invert)
 - SignalWeight (per signal contribution weight)
+
+The three tables are loaded together (one query each) into a
+ClassificationTable held per process. Saving or deleting any of those rows
+bumps a Redis version (thor:classification:version) after commit; every
+process checks it at most once per _VERSION_CHECK_SECONDS and reloads when it
+moved, so admin edits apply without a restart.
 """
 
 from __future__ import annotations
 
 import logging
+import threading
+from dataclasses import dataclass, field
 from decimal import Decimal
-from functools import lru_cache
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 
+from LiveData.shared.config_cache import RedisEpoch
 from ThorTrading.studies.futures_total.models.rtd import ContractWeight, SignalStatValue, SignalWeight
 
 logger = logging.getLogger(__name__)
 
 SIGNAL_ORDER = ["STRONG_BUY", "BUY", "HOLD", "SELL", "STRONG_SELL"]
 
+# Thresholds classify() needs for a symbol.
+_REQUIRED_THRESHOLDS = frozenset({"STRONG_BUY", "BUY", "SELL", "STRONG_SELL"})
+
+_VERSION_KEY = "thor:classification:version"
+_VERSION_CHECK_SECONDS = 1.0
+
+_TABLE_MODELS = (SignalStatValue, ContractWeight, SignalWeight)
+
+Classification = Tuple[Optional[str], Optional[Decimal], Decimal, int]
+
 
 def _normalize_symbol(symbol: str) -> str:
     # No hardcoded maps. Normalize consistently.
     return (symbol or "").strip().lstrip("/").upper()
 
 
-@lru_cache(maxsize=512)
-def _stat_thresholds(symbol: str) -> dict[str, Decimal]:
-    """Return thresholds for STRONG_BUY/BUY/SELL/STRONG_SELL from DB for this symbol."""
-    normalized = _normalize_symbol(symbol)
+@dataclass
+class ClassificationTable:
+    """Thresholds and weights keyed by normalized symbol / signal."""
+
+    version: str
+    thresholds: Dict[str, Dict[str, Decimal]] = field(default_factory=dict)
+    contract_weights: Dict[str, Decimal] = field(default_factory=dict)
+    signal_weights: Dict[str, int] = field(default_factory=dict)
+    # Missing-config warnings are logged once per symbol per table.
+    _warned: Set[Tuple[str, str]] = field(default_factory=set, repr=False)
+
+    def _warn_once(self, kind: str, name: str, msg: str, *args) -> None:
+        if (kind, name) in self._warned:
+            return
+        self._warned.add((kind, name))
+        logger.warning(msg, *args)
+
+    def stat_thresholds(self, symbol: str) -> Dict[str, Decimal]:
+        normalized = _normalize_symbol(symbol)
+        out = self.thresholds.get(normalized, {})
+        if not _REQUIRED_THRESHOLDS.issubset(out.keys()):
+            self._warn_once(
+                "thresholds",
+                normalized,
+                "SignalStatValue missing for %s: %s (classification disabled for this symbol)",
+                normalized,
+                sorted(_REQUIRED_THRESHOLDS - set(out.keys())),
+            )
+            return {}
+        return out
+
+    def contract_weight(self, symbol: str) -> Decimal:
+        normalized = _normalize_symbol(symbol)
+        weight = self.contract_weights.get(normalized)
+        if weight is None:
+            self._warn_once(
+                "contract_weight",
+                normalized,
+                "ContractWeight missing for %s (defaulting to 0 => excluded from composite)",
+                normalized,
+            )
+            return Decimal("0")
+        return weight
+
+    def signal_weight(self, signal: str) -> int:
+        weight = self.signal_weights.get(signal)
+        if weight is None:
+            self._warn_once("signal_weight", signal, "SignalWeight missing for signal=%s (defaulting to 0)", signal)
+            return 0
+        return weight
+
+    def classify(self, symbol: str, net_change: Optional[Decimal | float | int | str]) -> Classification:
+        weight = self.contract_weight(symbol)
+        if net_change is None:
+            return None, None, weight, 0
+
+        try:
+            change = Decimal(str(net_change))
+        except Exception:
+            return None, None, weight, 0
+
+        thresholds = self.stat_thresholds(symbol)
+        if not thresholds:
+            # Admin not configured for this symbol
+            return None, None, weight, 0
+
+        if change > thresholds["STRONG_BUY"]:
+            signal = "STRONG_BUY"
+        elif change > thresholds["BUY"]:
+            signal = "BUY"
+        elif change >= thresholds["SELL"]:
+            signal = "HOLD"
+        elif change > thresholds["STRONG_SELL"]:
+            signal = "SELL"
+        else:
+            signal = "STRONG_SELL"
+
+        # Use DB-controlled signal weight; instrument inversion happens via ContractWeight being negative (admin-controlled)
+        return signal, thresholds.get(signal), weight, self.signal_weight(signal)
+
 
-    qs = SignalStatValue.objects.filter(instrument__symbol__in=[normalized, f"/{normalized}"])
-    out: dict[str, Decimal] = {}
-    for row in qs:
+def load_classification_table(version: str = "0") -> ClassificationTable:
+    """Read all three admin tables (three queries)."""
+    table = ClassificationTable(version=version)
+
+    for symbol, signal, value in SignalStatValue.objects.values_list("instrument__symbol", "signal", "value"):
         try:
-            out[str(row.signal)] = Decimal(str(row.value))
+            table.thresholds.setdefault(_normalize_symbol(symbol), {})[str(signal)] = Decimal(str(value))
         except Exception:
             continue
 
-    # Require the four thresholds needed by classify()
-    required = {"STRONG_BUY", "BUY", "SELL", "STRONG_SELL"}
-    if not required.issubset(out.keys()):
-        missing = sorted(required - set(out.keys()))
-        logger.warning(
-            "SignalStatValue missing for %s: %s (classification disabled for this symbol)",
-            normalized,
-            missing,
-        )
-        return {}
-    return out
+    for symbol, weight in ContractWeight.objects.values_list("instrument__symbol", "weight"):
+        try:
+            table.contract_weights.setdefault(_normalize_symbol(symbol), Decimal(str(weight)))
+        except Exception:
+            continue
 
+    for signal, weight in SignalWeight.objects.values_list("signal", "weight"):
+        try:
+            table.signal_weights[str(signal)] = int(weight)
+        except Exception:
+            continue
+    if not table.signal_weights:
+        logger.warning("No SignalWeight rows found; composite will be empty/neutral.")
 
-@lru_cache(maxsize=512)
-def _contract_weight(symbol: str) -> Decimal:
-    normalized = _normalize_symbol(symbol)
+    return table
+
+
+# -----------------------------------------------------------------------------
+# Cache
+# -----------------------------------------------------------------------------
+_table_lock = threading.Lock()
+_table: Optional[ClassificationTable] = None
+_version = RedisEpoch(_VERSION_KEY, check_seconds=_VERSION_CHECK_SECONDS)
+
+
+def get_classification_table() -> ClassificationTable:
+    """Current table; reloaded from the DB when the Redis version moved."""
+    global _table
+    version = _version.current()
+    table = _table
+    if table is not None and table.version == version:
+        return table
+    with _table_lock:
+        table = _table
+        if table is None or table.version != version:
+            table = load_classification_table(version)
+            _table = table
+    return table
+
+
+def invalidate_classification_table() -> None:
+    """Drop the table here and (via the Redis version) in every other process."""
+    global _table
+    _table = None
+    if _version.bump() is None:
+        return
+
+    # Shared enriched quotes carry the old signals until they expire; drop them now.
     try:
-        cw = ContractWeight.objects.get(instrument__symbol__in=[normalized, f"/{normalized}"])
-        return Decimal(str(cw.weight))
-    except ContractWeight.DoesNotExist:
-        logger.warning(
-            "ContractWeight missing for %s (defaulting to 0 => excluded from composite)",
-            normalized,
-        )
-        return Decimal("0")
+        from .cache import invalidate_enriched_quotes
+
+        invalidate_enriched_quotes()
+    except Exception:
+        logger.debug("Failed invalidating enriched quotes", exc_info=True)
+
+
+def _on_table_changed(sender, **kwargs):
+    # Bumping before commit would let another process reload the pre-edit rows.
+    transaction.on_commit(invalidate_classification_table)
+
+
+def connect_classification_signals() -> None:
+    """Reload on edits to the table models and their admin proxies (called from AppConfig.ready)."""
+    from ThorTrading.studies.futures_total.models.admin_proxies import (
+        ThorTradingSignalStatValue,
+        ThorTradingSignalWeight,
+    )
+
+    # Proxy saves send the proxy class as sender, so each one is connected too.
+    for model in (*_TABLE_MODELS, ThorTradingSignalStatValue, ThorTradingSignalWeight):
+        label = model._meta.label_lower
+        post_save.connect(_on_table_changed, sender=model, dispatch_uid=f"classification_table_saved:{label}")
+        post_delete.connect(_on_table_changed, sender=model, dispatch_uid=f"classification_table_deleted:{label}")
+
+
+# -----------------------------------------------------------------------------
+# Lookups
+# -----------------------------------------------------------------------------
+def _stat_thresholds(symbol: str) -> dict[str, Decimal]:
+    """Return thresholds for STRONG_BUY/BUY/SELL/STRONG_SELL for this symbol ({} when incomplete)."""
+    return get_classification_table().stat_thresholds(symbol)
+
+
+def _contract_weight(symbol: str) -> Decimal:
+    return get_classification_table().contract_weight(symbol)
 
 
-@lru_cache(maxsize=64)
 def _signal_weight(signal: str) -> int:
-    try:
-        sw = SignalWeight.objects.get(signal=signal)
-        return int(sw.weight)
-    except SignalWeight.DoesNotExist:
-        logger.warning("SignalWeight missing for signal=%s (defaulting to 0)", signal)
-        return 0
+    return get_classification_table().signal_weight(signal)
 
 
-def classify(
-    symbol: str, net_change: Optional[Decimal | float | int | str]
-) -> Tuple[Optional[str], Optional[Decimal], Decimal, int]:
+def classify(symbol: str, net_change: Optional[Decimal | float | int | str]) -> Classification:
     """Returns: (signal, stat_value, contract_weight, signal_weight).
 
     Where stat_value is the threshold value for the chosen signal (for composite display/logic).
     """
-    weight = _contract_weight(symbol)
-    if net_change is None:
-        return None, None, weight, 0
+    return get_classification_table().classify(symbol, net_change)
 
-    try:
-        change = Decimal(str(net_change))
-    except Exception:
-        return None, None, weight, 0
-
-    thresholds = _stat_thresholds(symbol)
-    if not thresholds:
-        # Admin not configured for this symbol
-        return None, None, weight, 0
-
-    strong_buy = thresholds["STRONG_BUY"]
-    buy = thresholds["BUY"]
-    sell = thresholds["SELL"]
-    strong_sell = thresholds["STRONG_SELL"]
-
-    if change > strong_buy:
-        signal = "STRONG_BUY"
-    elif change > buy:
-        signal = "BUY"
-    elif change >= sell:
-        signal = "HOLD"
-    elif change > strong_sell:
-        signal = "SELL"
-    else:
-        signal = "STRONG_SELL"
 
-    # Use DB-controlled signal weight; instrument inversion happens via ContractWeight being negative (admin-controlled)
-    sig_weight = _signal_weight(signal)
+def classify_many(items: Iterable[Tuple[str, Optional[Decimal | float | int | str]]]) -> List[Classification]:
+    """classify() for many (symbol, net_change) pairs against one table snapshot."""
+    table = get_classification_table()
+    return [table.classify(symbol, net_change) for symbol, net_change in items]
 
-    return signal, thresholds.get(signal), weight, sig_weight
 
-
-def enrich_quote_row(row: dict) -> dict:
-    """Adds extended_data:
-      - signal
-      - stat_value
-      - contract_weight
-      - signal_weight
-    """
+def _enrich_row(table: ClassificationTable, row: dict) -> dict:
     instrument = row.get("instrument", {}) or {}
     symbol = instrument.get("symbol") or row.get("symbol") or ""
     extended = row.setdefault("extended_data", {})
 
     if not extended.get("signal"):
         change_raw = row.get("change")
-        signal, stat_value, contract_weight, signal_weight = classify(symbol, change_raw)
+        signal, stat_value, contract_weight, signal_weight = table.classify(symbol, change_raw)
 
         if signal:
             extended["signal"] = signal
@@ -143,29 +261,36 @@ def enrich_quote_row(row: dict) -> dict:
     else:
         # If someone prefilled signal, still ensure weights come from DB only.
         if "contract_weight" not in extended:
-            extended["contract_weight"] = str(_contract_weight(symbol))
+            extended["contract_weight"] = str(table.contract_weight(symbol))
         if "signal_weight" not in extended:
             existing_signal = extended.get("signal")
-            extended["signal_weight"] = str(_signal_weight(existing_signal)) if existing_signal else "0"
+            extended["signal_weight"] = str(table.signal_weight(existing_signal)) if existing_signal else "0"
 
     return row
 
 
-@lru_cache(maxsize=8)
+def enrich_quote_row(row: dict) -> dict:
+    """Adds extended_data:
+      - signal
+      - stat_value
+      - contract_weight
+      - signal_weight
+    """
+    return _enrich_row(get_classification_table(), row)
+
+
+def enrich_quote_rows(rows: List[dict]) -> List[dict]:
+    """enrich_quote_row() for every row in one pass over a single table snapshot."""
+    table = get_classification_table()
+    return [_enrich_row(table, row) for row in rows]
+
+
 def _load_signal_weights() -> Dict[str, int]:
     """DB is the source of truth.
 
     Returns {signal_name: weight_int}
     """
-    weights: Dict[str, int] = {}
-    for row in SignalWeight.objects.all():
-        try:
-            weights[str(row.signal)] = int(row.weight)
-        except Exception:
-            continue
-    if not weights:
-        logger.warning("No SignalWeight rows found; composite will be empty/neutral.")
-    return weights
+    return get_classification_table().signal_weights
 
 
 def compute_composite(rows: List[dict]) -> dict:
@@ -181,7 +306,7 @@ def compute_composite(rows: List[dict]) -> dict:
         return {}
 
     # Make sure rows are enriched (adds extended_data)
-    enriched = [enrich_quote_row(r) for r in rows]
+    enriched = enrich_quote_rows(rows)
 
     num = Decimal("0")
     den = Decimal("0")
@@ -234,7 +359,13 @@ def compute_composite(rows: List[dict]) -> dict:
 
 
 __all__ = [
+    "ClassificationTable",
     "classify",
+    "classify_many",
     "enrich_quote_row",
+    "enrich_quote_rows",
     "compute_composite",
+    "connect_classification_signals",
+    "get_classification_table",
+    "invalidate_classification_table",
 ]
@@ -14,7 +14,6 @@ Used by:
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import Dict, List, Tuple
 
@@ -24,7 +23,7 @@ from GlobalMarkets.services import get_control_countries
 from Instruments.models.market_52w import Rolling52WeekStats
 from GlobalMarkets.services import is_known_country, normalize_country_code
 
-from .classification import compute_composite, enrich_quote_row
+from .classification import compute_composite, enrich_quote_rows
 from .row_metrics import compute_row_metrics
 
 logger = logging.getLogger(__name__)
@@ -33,17 +32,6 @@ logger = logging.getLogger(__name__)
 STUDY_CODE = "FUTURE_TOTAL"
 
 
-def _load_raw_quote(symbol: str) -> dict | None:
-    key = f"raw:quote:{symbol.upper()}"
-    raw = live_data_redis.client.get(key)
-    if not raw:
-        return None
-    try:
-        return json.loads(raw)
-    except Exception:
-        return None
-
-
 def _as_float(x):
     try:
         if x is None or x == "":
@@ -141,24 +129,25 @@ def _tracked_instruments() -> List[object]:
     return []
 
 
-def fetch_raw_quotes() -> Dict[str, Dict]:
-    """Fetch latest raw quotes from Redis for all tracked instruments."""
-    out: Dict[str, Dict] = {}
-    for inst in _tracked_instruments():
-        sym = (inst.symbol or "").lstrip("/").upper()
-        if not sym:
-            continue
+def _tracked_symbols(instruments: List[object]) -> List[str]:
+    symbols = [(getattr(inst, "symbol", "") or "").lstrip("/").upper() for inst in instruments]
+    return [s for s in symbols if s]
 
-        # Redis keys may be published as "ES" or "/ES" depending on feed.
-        keys_to_try = [sym, f"/{sym}"]
-        try:
-            for key in keys_to_try:
-                data = live_data_redis.get_latest_quote(key)
-                if data:
-                    out[sym] = data
-                    break
-        except Exception as e:
-            logger.error("Redis fetch failed for %s: %s", sym, e)
+
+def fetch_raw_quotes(instruments: List[object] | None = None) -> Dict[str, Dict]:
+    """Fetch latest raw quotes from Redis for all tracked instruments (one HMGET)."""
+    if instruments is None:
+        instruments = _tracked_instruments()
+    symbols = _tracked_symbols(instruments)
+
+    # Redis keys may be published as "ES" or "/ES" depending on feed; ask for both at once.
+    found = live_data_redis.get_latest_quote_map([key for sym in symbols for key in (sym, f"/{sym}")])
+
+    out: Dict[str, Dict] = {}
+    for sym in symbols:
+        data = found.get(sym) or found.get(f"/{sym}")
+        if data:
+            out[sym] = data
     return out
 
 
@@ -166,8 +155,8 @@ def _to_str(v):
     return str(v) if v is not None else None
 
 
-def build_enriched_rows(raw_quotes: Dict[str, Dict]) -> List[Dict]:
-    """Return enriched row dicts (one per tracked instrument)."""
+def build_enriched_rows(raw_quotes: Dict[str, Dict], instruments: List[object] | None = None) -> List[Dict]:
+    """Return enriched row dicts (one per tracked instrument with a quote)."""
     control_countries = get_control_countries(require_session_capture=True)
     normalized_control = [normalize_country_code(c) or c for c in control_countries]
     primary_control_country = normalized_control[0] if normalized_control else None
@@ -177,9 +166,9 @@ def build_enriched_rows(raw_quotes: Dict[str, Dict]) -> List[Dict]:
         or primary_control_country
     )
 
-    instruments = _tracked_instruments()
-    tracked_symbols = [(getattr(inst, "symbol", "") or "").lstrip("/").upper() for inst in instruments]
-    tracked_symbols = [s for s in tracked_symbols if s]
+    if instruments is None:
+        instruments = _tracked_instruments()
+    tracked_symbols = _tracked_symbols(instruments)
 
     stats_52w: dict[str, Rolling52WeekStats] = {}
     try:
@@ -188,6 +177,10 @@ def build_enriched_rows(raw_quotes: Dict[str, Dict]) -> List[Dict]:
     except Exception:
         # If 52w stats table isn't ready yet, don't break quote rendering.
         stats_52w = {}
+
+    # Raw Excel snapshots for every quoted symbol in one MGET.
+    raw_excel = live_data_redis.get_raw_quotes([s for s in tracked_symbols if raw_quotes.get(s)])
+
     rows: List[Dict] = []
     fallback_country = _fallback_country_from_clock(control_countries)
 
@@ -262,7 +255,7 @@ def build_enriched_rows(raw_quotes: Dict[str, Dict]) -> List[Dict]:
         }
 
         # Prefer raw Excel quote for price fields when available
-        rawq = _load_raw_quote(sym)
+        rawq = raw_excel.get(sym)
         if rawq:
             raw_last = _as_float(rawq.get("last"))
             raw_bid = _as_float(rawq.get("bid"))
@@ -281,7 +274,6 @@ def build_enriched_rows(raw_quotes: Dict[str, Dict]) -> List[Dict]:
                     row["timestamp"] = rawq.get("timestamp")
                 row["source"] = "TOS_EXCEL"
 
-        enrich_quote_row(row)
         try:
             metrics = compute_row_metrics(row)
             row.update(metrics)
@@ -291,13 +283,16 @@ def build_enriched_rows(raw_quotes: Dict[str, Dict]) -> List[Dict]:
             logger.warning("Metrics failed for %s: %s", sym, e)
 
         rows.append(row)
-    return rows
+
+    # Signals and weights for all rows against one classification table.
+    return enrich_quote_rows(rows)
 
 
 def get_enriched_quotes_with_composite() -> Tuple[List[Dict], Dict]:
     """Convenience helper returning enriched rows + composite summary."""
-    raw = fetch_raw_quotes()
-    rows = build_enriched_rows(raw)
+    instruments = _tracked_instruments()
+    raw = fetch_raw_quotes(instruments)
+    rows = build_enriched_rows(raw, instruments)
     composite = compute_composite(rows) if rows else {}
     return rows, composite
 
@@ -8,7 +8,7 @@ from LiveData.shared.redis_client import live_data_redis
 from ThorTrading.studies.futures_total.models.market_session import MarketSession
 from GlobalMarkets.services import normalize_country_code
 from ThorTrading.studies.futures_total.services.sessions.metrics import MarketCloseMetric, MarketRangeMetric
-from ThorTrading.studies.futures_total.quotes import get_enriched_quotes_with_composite
+from ThorTrading.studies.futures_total.quotes import get_cached_enriched_quotes
 
 logger = logging.getLogger(__name__)
 
@@ -101,7 +101,7 @@ def capture_market_close(country: str | None, force: bool = False) -> Dict[str,
         return payload
 
     try:
-        enriched, _ = get_enriched_quotes_with_composite()
+        enriched, _ = get_cached_enriched_quotes()
     except Exception as exc:
         logger.exception("Quote fetch failed for close capture: country=%s", country)
         payload.update(
@@ -22,7 +22,7 @@ from ThorTrading.studies.futures_total.services.indicators import compute_target
 from ThorTrading.studies.futures_total.services.sessions.analytics.wndw_totals import CountrySymbolWndwTotalsService
 from ThorTrading.studies.futures_total.services.sessions.counters import CountrySymbolCounter
 from ThorTrading.studies.futures_total.services.sessions.metrics import MarketOpenMetric
-from ThorTrading.studies.futures_total.quotes import get_enriched_quotes_with_composite
+from ThorTrading.studies.futures_total.quotes import get_cached_enriched_quotes
 
 logger = logging.getLogger(__name__)
 
@@ -357,7 +357,7 @@ class MarketOpenCaptureService:
                     country_code or display_country,
                 )
 
-            enriched, composite = get_enriched_quotes_with_composite()
+            enriched, composite = get_cached_enriched_quotes()
             if not enriched:
                 logger.error("No enriched rows for %s", country_code or display_country or "?")
                 return None
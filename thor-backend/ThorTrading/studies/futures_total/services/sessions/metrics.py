@@ -1,11 +1,17 @@
 from __future__ import annotations
-"""MarketSession metrics (open/high/low/close/range)."""
+"""MarketSession metrics (open/high/low/close/range).
+
+Each pass reads the affected MarketSession rows for a country/session in one
+locked query, applies the rows in memory and writes the changes back with one
+bulk_update, so lock hold time and query count do not grow with the number of
+symbols.
+"""
 
 import logging
 from decimal import Decimal, InvalidOperation
 from django.utils import timezone
 from django.db import transaction
-from django.db.models import F
+from django.db.models import F, Q
 
 from ThorTrading.studies.futures_total.models.market_session import MarketSession
 from GlobalMarkets.services import normalize_country_code
@@ -48,6 +54,54 @@ def _move_from_open_pct(open_price: Decimal | None, target_price: Decimal | None
         return None
 
 
+_BULK_BATCH_SIZE = 500
+
+
+def _row_prices(enriched_rows, tag: str) -> list[tuple[str, Decimal]]:
+    """(base_symbol, last_price) for every usable enriched row, in order."""
+    out: list[tuple[str, Decimal]] = []
+    for row in enriched_rows:
+        symbol = row.get("instrument", {}).get("symbol")
+        if not symbol:
+            logger.debug("[DIAG %s] Skip row: missing symbol row=%s", tag, row)
+            continue
+
+        base_symbol = symbol.lstrip("/").upper()
+        last_price = _safe_decimal(row.get("last"))
+        if last_price is None:
+            logger.debug("[DIAG %s] Skip %s: last_price None raw_last=%s", tag, base_symbol, row.get("last"))
+            continue
+        out.append((base_symbol, last_price))
+    return out
+
+
+def _locked_sessions(country: str, session_number: int, symbols, fields: list[str]) -> dict[str, MarketSession]:
+    """
+    Session rows for `symbols`, locked, in one query.
+
+    Keeps the first row per symbol in MarketSession ordering, i.e. what a
+    per-symbol .filter(...).first() would return.
+    """
+    symbols = set(symbols)
+    if not symbols:
+        return {}
+    qs = (
+        MarketSession.objects
+        .select_for_update()
+        .filter(country=country, session_number=session_number, symbol__in=symbols)
+        .only("id", "symbol", *fields)
+    )
+    out: dict[str, MarketSession] = {}
+    for session in qs:
+        out.setdefault(session.symbol, session)
+    return out
+
+
+def _bulk_save(changed: dict[int, MarketSession], fields: list[str]) -> None:
+    if changed:
+        MarketSession.objects.bulk_update(list(changed.values()), fields, batch_size=_BULK_BATCH_SIZE)
+
+
 def _resolve_session_number(country: str, session_number: int | None = None) -> int | None:
     """
     Resolve the session_number to update.
@@ -82,25 +136,16 @@ class MarketOpenMetric:
         base_qs = MarketSession.objects.filter(session_number=session_number)
         open_updated = base_qs.update(market_open=F("last_price"))
 
-        initialized_count = 0
-        for session in base_qs.only(
-            "id", "market_high_open", "market_low_open", "last_price", "market_high_pct_open", "market_low_pct_open"
-        ):
-            lp = session.last_price
-            if lp in (None, 0):
-                continue
-            to_update = []
-            if session.market_high_open is None:
-                session.market_high_open = lp
-                session.market_high_pct_open = Decimal("0")
-                to_update.extend(["market_high_open", "market_high_pct_open"])
-            if session.market_low_open is None:
-                session.market_low_open = lp
-                session.market_low_pct_open = Decimal("0")
-                to_update.extend(["market_low_open", "market_low_pct_open"])
-            if to_update:
-                session.save(update_fields=to_update)
-                initialized_count += 1
+        # Seed high/low from last_price where still unset (set-based, no per-row saves).
+        priced_qs = base_qs.exclude(last_price__isnull=True).exclude(last_price=0)
+        initialized_count = priced_qs.filter(Q(market_high_open__isnull=True) | Q(market_low_open__isnull=True)).count()
+        if initialized_count:
+            priced_qs.filter(market_high_open__isnull=True).update(
+                market_high_open=F("last_price"), market_high_pct_open=Decimal("0")
+            )
+            priced_qs.filter(market_low_open__isnull=True).update(
+                market_low_open=F("last_price"), market_low_pct_open=Decimal("0")
+            )
 
         logger.info(
             "MarketOpenMetric complete → %s open prices, %s high/low initialized (session_number %s)",
@@ -136,26 +181,15 @@ class MarketHighMetric:
             logger.info("MarketHighMetric → No sessions for %s", country)
             return 0
 
-        updated_count = 0
-
-        for row in enriched_rows:
-            symbol = row.get("instrument", {}).get("symbol")
-            if not symbol:
-                logger.debug("[DIAG High] Skip row: missing symbol row=%s", row)
-                continue
+        fields = ["market_high_open", "market_high_pct_open"]
+        prices = _row_prices(enriched_rows, "High")
+        sessions = _locked_sessions(country, session_number, (sym for sym, _ in prices), ["market_open", *fields])
 
-            base_symbol = symbol.lstrip("/").upper()
-            last_price = _safe_decimal(row.get("last"))
-            if last_price is None:
-                logger.debug("[DIAG High] Skip %s: last_price None raw_last=%s", base_symbol, row.get("last"))
-                continue
+        updated_count = 0
+        changed: dict[int, MarketSession] = {}
 
-            session = (
-                MarketSession.objects
-                .select_for_update()
-                .filter(country=country, symbol=base_symbol, session_number=session_number)
-                .first()
-            )
+        for base_symbol, last_price in prices:
+            session = sessions.get(base_symbol)
             if not session:
                 logger.debug("[DIAG High] No session row for %s country=%s session_number=%s", base_symbol, country, session_number)
                 continue
@@ -172,7 +206,7 @@ class MarketHighMetric:
                 session.market_high_open = last_price
                 pct = _move_from_open_pct(open_price, last_price) or Decimal("0")
                 session.market_high_pct_open = pct
-                session.save(update_fields=["market_high_open", "market_high_pct_open"])
+                changed[session.pk] = session
                 logger.debug("[DIAG High] FIRST TICK %s: set high=%s pct=%s", base_symbol, last_price, pct)
                 updated_count += 1
                 continue
@@ -181,7 +215,7 @@ class MarketHighMetric:
                 session.market_high_open = last_price
                 pct = _move_from_open_pct(open_price, last_price) or Decimal("0")
                 session.market_high_pct_open = pct
-                session.save(update_fields=["market_high_open", "market_high_pct_open"])
+                changed[session.pk] = session
                 logger.debug(
                     "[DIAG High] NEW HIGH %s: last=%s prev_high=%s pct=%s",
                     base_symbol, last_price, current_high, pct
@@ -197,6 +231,8 @@ class MarketHighMetric:
                 session.market_high_pct_open,
             )
 
+        _bulk_save(changed, fields)
+
         logger.info(
             "MarketHighMetric complete → %s updated (country=%s session_number=%s)",
             updated_count, country, session_number
@@ -222,30 +258,15 @@ class MarketLowMetric:
             logger.info("MarketLowMetric → No sessions for %s", country)
             return 0
 
-        updated_count = 0
+        fields = ["market_low_open", "market_low_pct_open"]
+        prices = _row_prices(enriched_rows, "Low")
+        sessions = _locked_sessions(country, session_number, (sym for sym, _ in prices), fields)
 
-        for row in enriched_rows:
-            symbol = row.get("instrument", {}).get("symbol")
-            if not symbol:
-                logger.debug("[DIAG Low] Skip row: missing symbol row=%s", row)
-                continue
-
-            base_symbol = symbol.lstrip("/").upper()
-            last_price = _safe_decimal(row.get("last"))
-            if last_price is None:
-                logger.debug("[DIAG Low] Skip %s: last_price None raw_last=%s", base_symbol, row.get("last"))
-                continue
+        updated_count = 0
+        changed: dict[int, MarketSession] = {}
 
-            session = (
-                MarketSession.objects
-                .select_for_update()
-                .filter(
-                    country=country,
-                    symbol=base_symbol,
-                    session_number=session_number,
-                )
-                .first()
-            )
+        for base_symbol, last_price in prices:
+            session = sessions.get(base_symbol)
             if not session:
                 logger.debug("[DIAG Low] No session row for %s country=%s session_number=%s", base_symbol, country, session_number)
                 continue
@@ -255,7 +276,7 @@ class MarketLowMetric:
             if current_low is None:
                 session.market_low_open = last_price
                 session.market_low_pct_open = Decimal("0")
-                session.save(update_fields=["market_low_open", "market_low_pct_open"])
+                changed[session.pk] = session
                 logger.debug("[DIAG Low] FIRST TICK %s: set low=%s pct=0", base_symbol, last_price)
                 updated_count += 1
                 continue
@@ -263,7 +284,7 @@ class MarketLowMetric:
             if last_price < current_low:
                 session.market_low_open = last_price
                 session.market_low_pct_open = Decimal("0")
-                session.save(update_fields=["market_low_open", "market_low_pct_open"])
+                changed[session.pk] = session
                 logger.debug("[DIAG Low] NEW LOWER LOW %s: last=%s prev_low=%s pct=0", base_symbol, last_price, current_low)
                 updated_count += 1
                 continue
@@ -277,7 +298,7 @@ class MarketLowMetric:
 
             if pct != session.market_low_pct_open:
                 session.market_low_pct_open = pct
-                session.save(update_fields=["market_low_pct_open"])
+                changed[session.pk] = session
                 updated_count += 1
                 logger.debug(
                     "[DIAG Low] ABOVE LOW %s: last=%s low=%s runup=%s pct=%s",
@@ -288,6 +309,8 @@ class MarketLowMetric:
                     pct,
                 )
 
+        _bulk_save(changed, fields)
+
         logger.info(
             "MarketLowMetric complete → %s updated for %s (session_number %s)",
             updated_count, country, session_number
@@ -305,9 +328,10 @@ class MarketCloseMetric:
         pending = (
             MarketSession.objects
             .filter(country=country, session_number=session_number, wndw="PENDING")
+            .only("id", "bhs", "target_high", "target_low", "market_high_open", "market_low_open")
         )
 
-        updated = 0
+        neutral_ids = []
         for session in pending:
             signal = (session.bhs or "").upper()
             th = session.target_high
@@ -328,9 +352,9 @@ class MarketCloseMetric:
             if hit_target or hit_stop:
                 continue
 
-            session.wndw = "NEUTRAL"
-            session.save(update_fields=["wndw"])
-            updated += 1
+            neutral_ids.append(session.pk)
+
+        updated = MarketSession.objects.filter(pk__in=neutral_ids).update(wndw="NEUTRAL") if neutral_ids else 0
 
         if updated:
             logger.info(
@@ -359,24 +383,25 @@ class MarketCloseMetric:
             logger.info("MarketCloseMetric → No session for %s; skipping", country)
             return 0
 
-        updated_count = 0
-
-        for row in enriched_rows:
-            symbol = row.get("instrument", {}).get("symbol")
-            if not symbol:
-                continue
+        fields = [
+            "market_close",
+            "market_high_pct_close",
+            "market_low_pct_close",
+            "market_close_vs_open_pct",
+        ]
+        prices = _row_prices(enriched_rows, "Close")
+        sessions = _locked_sessions(
+            country,
+            session_number,
+            (sym for sym, _ in prices),
+            ["market_open", "market_high_open", "market_low_open", *fields],
+        )
 
-            base_symbol = symbol.lstrip("/").upper()
-            last_price = _safe_decimal(row.get("last"))
-            if last_price is None:
-                continue
+        updated_count = 0
+        changed: dict[int, MarketSession] = {}
 
-            session = (
-                MarketSession.objects
-                .select_for_update()
-                .filter(country=country, symbol=base_symbol, session_number=session_number)
-                .first()
-            )
+        for base_symbol, last_price in prices:
+            session = sessions.get(base_symbol)
             if not session:
                 continue
 
@@ -419,14 +444,11 @@ class MarketCloseMetric:
             session.market_high_pct_close = high_pct
             session.market_low_pct_close = low_pct
             session.market_close_vs_open_pct = close_vs_open_pct
-            session.save(update_fields=[
-                "market_close",
-                "market_high_pct_close",
-                "market_low_pct_close",
-                "market_close_vs_open_pct",
-            ])
+            changed[session.pk] = session
             updated_count += 1
 
+        _bulk_save(changed, fields)
+
         logger.info(
             "MarketCloseMetric complete → %s rows updated for %s (session_number %s)",
             updated_count, country, session_number,
@@ -460,13 +482,16 @@ class MarketRangeMetric:
             logger.info("MarketRangeMetric → No session for %s; skipping", country)
             return 0
 
+        fields = ["market_range", "market_range_pct"]
         sessions = (
             MarketSession.objects
             .select_for_update()
             .filter(country=country, session_number=session_number)
+            .only("id", "market_high_open", "market_low_open", "market_open", *fields)
         )
 
         updated_count = 0
+        changed: dict[int, MarketSession] = {}
         for session in sessions:
             high = session.market_high_open
             low = session.market_low_open
@@ -485,9 +510,11 @@ class MarketRangeMetric:
 
             session.market_range = range_number
             session.market_range_pct = pct
-            session.save(update_fields=["market_range", "market_range_pct"])
+            changed[session.pk] = session
             updated_count += 1
 
+        _bulk_save(changed, fields)
+
         logger.info(
             "MarketRangeMetric complete → %s rows updated for %s (session_number=%s)",
             updated_count, country, session_number,
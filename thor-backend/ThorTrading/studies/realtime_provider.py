@@ -22,9 +22,16 @@ logger = logging.getLogger(__name__)
 class InlineJob(Job):
     """Minimal Job wrapper with interval-based should_run."""
 
-    def __init__(self, name: str, interval_seconds: float, runner: Callable[[Any], None]):
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        runner: Callable[[Any], None],
+        timeout_seconds: float | None = None,
+    ):
         self.name = name
         self.interval_seconds = float(interval_seconds)
+        self.timeout_seconds = timeout_seconds
         self._runner = runner
 
     def should_run(self, now: float, state: dict[str, Any]) -> bool:
@@ -49,6 +56,16 @@ def _run_intraday_tick(ctx: Any) -> None:
     IntradaySupervisor().tick()
 
 
+def _run_intraday_partitions(ctx: Any) -> None:
+    """Keep upcoming daily InstrumentIntraday partitions in place (PostgreSQL only)."""
+    from Instruments.services.intraday_partitions import ensure_intraday_partitions
+
+    try:
+        ensure_intraday_partitions()
+    except Exception:
+        logger.exception("intraday_partitions: ensure failed")
+
+
 def _run_open_capture_scan(ctx: Any) -> None:
     """State-based open capture.
 
@@ -65,7 +82,7 @@ def _run_open_capture_scan(ctx: Any) -> None:
 
 
 def _run_market_metrics(ctx: Any) -> None:
-    from ThorTrading.studies.futures_total.quotes import get_enriched_quotes_with_composite
+    from ThorTrading.studies.futures_total.quotes import get_cached_enriched_quotes
     from ThorTrading.studies.futures_total.services.sessions.metrics import MarketHighMetric
 
     active = set(_active_countries())
@@ -73,7 +90,7 @@ def _run_market_metrics(ctx: Any) -> None:
         return
 
     try:
-        enriched, _ = get_enriched_quotes_with_composite()
+        enriched, _ = get_cached_enriched_quotes()
     except Exception:
         logger.exception("market_metrics: failed to load enriched quotes")
         return
@@ -102,10 +119,11 @@ def _run_market_grader(ctx: Any) -> None:
 
 def register(registry: Any) -> list[str]:
     jobs = [
-        InlineJob("intraday_tick", 1.0, _run_intraday_tick),
-        InlineJob("gm.open_capture_scan", 5.0, _run_open_capture_scan),
-        InlineJob("market_metrics", 10.0, _run_market_metrics),
-        InlineJob("market_grader", 15.0, _run_market_grader),
+        InlineJob("intraday_tick", 1.0, _run_intraday_tick, timeout_seconds=10.0),
+        InlineJob("intraday_partitions", 3600.0, _run_intraday_partitions, timeout_seconds=300.0),
+        InlineJob("gm.open_capture_scan", 5.0, _run_open_capture_scan, timeout_seconds=30.0),
+        InlineJob("market_metrics", 10.0, _run_market_metrics, timeout_seconds=30.0),
+        InlineJob("market_grader", 15.0, _run_market_grader, timeout_seconds=60.0),
     ]
 
     job_names: list[str] = []
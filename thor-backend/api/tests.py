@@ -0,0 +1,186 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, override_settings
+
+from api.websocket import broadcast
+from api.websocket.broadcast import (
+	ALL_SYMBOLS_GROUP_NAME,
+	broadcast_symbol_message_sync,
+	broadcast_to_websocket_sync,
+	symbol_group_name,
+)
+from api.websocket.consumers import MarketDataConsumer
+
+IN_MEMORY_CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+def _quote_tick(symbol):
+	return {"type": "quote_tick", "data": {"symbol": symbol, "last": 100.0}}
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class SymbolSubscriptionConsumerTests(SimpleTestCase):
+	def setUp(self):
+		self.ref_calls = []
+		patches = [
+			mock.patch.object(MarketDataConsumer, "_read_market_data_snapshot", staticmethod(lambda: None)),
+			mock.patch(
+				"api.websocket.consumers.adjust_symbol_refs",
+				lambda symbols, delta: self.ref_calls.append((sorted(symbols), delta)),
+			),
+			# Unknown subscriber set: broadcasts go to every group.
+			mock.patch.object(broadcast, "symbols_with_subscribers", lambda: None),
+		]
+		for p in patches:
+			p.start()
+			self.addCleanup(p.stop)
+
+	async def _connect(self):
+		communicator = WebsocketCommunicator(MarketDataConsumer.as_asgi(), "/ws/")
+		connected, _ = await communicator.connect()
+		self.assertTrue(connected)
+		return communicator
+
+	async def test_subscribed_socket_gets_only_its_symbols(self):
+		subscribed = await self._connect()
+		firehose = await self._connect()
+
+		await subscribed.send_json_to({"type": "subscribe", "symbols": ["/es"]})
+		reply = await subscribed.receive_json_from()
+		self.assertEqual(reply, {"type": "subscriptions", "data": {"symbols": ["ES"]}})
+
+		for symbol in ("ES", "NQ", "/ES"):
+			await sync_to_async(broadcast_symbol_message_sync)(None, symbol, _quote_tick(symbol))
+
+		self.assertEqual((await subscribed.receive_json_from())["data"]["symbol"], "ES")
+		self.assertEqual((await subscribed.receive_json_from())["data"]["symbol"], "/ES")
+		self.assertTrue(await subscribed.receive_nothing())
+
+		received = [(await firehose.receive_json_from())["data"]["symbol"] for _ in range(3)]
+		self.assertEqual(received, ["ES", "NQ", "/ES"])
+		self.assertTrue(await firehose.receive_nothing())
+
+		await subscribed.disconnect()
+		await firehose.disconnect()
+
+	async def test_symbol_refs_follow_subscribe_unsubscribe_and_disconnect(self):
+		communicator = await self._connect()
+
+		await communicator.send_json_to({"type": "subscribe", "symbols": ["ES", "NQ"]})
+		await communicator.receive_json_from()
+		await communicator.send_json_to({"type": "unsubscribe", "symbols": ["NQ"]})
+		await communicator.receive_json_from()
+		await communicator.disconnect()
+
+		self.assertEqual(self.ref_calls, [(["ES", "NQ"], 1), (["NQ"], -1), (["ES"], -1)])
+
+
+SNAPSHOT = {
+	"epoch": "e1",
+	"seq": 5,
+	"timestamp": 0,
+	"quotes": [{"symbol": "ES", "bid": 1.0}, {"symbol": "NQ", "bid": 2.0}],
+}
+
+
+def _delta(seq, changes, epoch="e1"):
+	return {
+		"type": "market_data_delta",
+		"data": {"epoch": epoch, "seq": seq, "base_seq": seq - 1, "timestamp": 0, "changes": changes, "removed": []},
+		"legacy": {"type": "market_data", "data": {"timestamp": 0, "seq": seq, "quotes": changes}},
+	}
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class MarketDataDeltaSeqTests(SimpleTestCase):
+	def setUp(self):
+		for p in (
+			mock.patch.object(MarketDataConsumer, "_read_market_data_snapshot", staticmethod(lambda: SNAPSHOT)),
+			mock.patch("api.websocket.consumers.adjust_symbol_refs", lambda symbols, delta: None),
+		):
+			p.start()
+			self.addCleanup(p.stop)
+
+	async def _connect_delta_socket(self):
+		communicator = WebsocketCommunicator(MarketDataConsumer.as_asgi(), "/ws/?market_data=delta")
+		connected, _ = await communicator.connect()
+		self.assertTrue(connected)
+		snapshot = await communicator.receive_json_from()
+		self.assertEqual(snapshot["type"], "market_data_snapshot")
+		self.assertEqual(snapshot["data"]["seq"], 5)
+		return communicator
+
+	async def _send(self, message):
+		await sync_to_async(broadcast_to_websocket_sync)(None, message)
+
+	async def test_delta_at_snapshot_seq_is_dropped(self):
+		communicator = await self._connect_delta_socket()
+
+		# Snapshot 5 was cached before delta 5 went out: the socket already has it.
+		await self._send(_delta(5, [{"symbol": "ES", "bid": 1.0}]))
+		await self._send(_delta(6, [{"symbol": "ES", "bid": 1.5}]))
+		await self._send(_delta(7, [{"symbol": "NQ", "bid": 2.5}]))
+
+		frames = [await communicator.receive_json_from() for _ in range(2)]
+		self.assertEqual([(f["type"], f["data"]["seq"], f["data"]["base_seq"]) for f in frames], [
+			("market_data_delta", 6, 5),
+			("market_data_delta", 7, 6),
+		])
+		self.assertTrue(await communicator.receive_nothing())
+		await communicator.disconnect()
+
+	async def test_filtered_delta_path_applies_same_rule(self):
+		communicator = await self._connect_delta_socket()
+		await communicator.send_json_to({"type": "subscribe", "symbols": ["ES"]})
+		self.assertEqual((await communicator.receive_json_from())["type"], "subscriptions")
+		snapshot = await communicator.receive_json_from()
+		self.assertEqual(snapshot["data"]["quotes"], [{"symbol": "ES", "bid": 1.0}])
+
+		await self._send(_delta(4, [{"symbol": "ES", "bid": 0.5}]))
+		await self._send(_delta(5, [{"symbol": "ES", "bid": 1.0}]))
+		await self._send(_delta(6, [{"symbol": "NQ", "bid": 2.5}]))
+
+		frame = await communicator.receive_json_from()
+		self.assertEqual((frame["data"]["seq"], frame["data"]["base_seq"]), (6, 5))
+		self.assertEqual(frame["data"]["changes"], [])
+		self.assertTrue(await communicator.receive_nothing())
+		await communicator.disconnect()
+
+	async def test_delta_from_new_epoch_is_forwarded(self):
+		communicator = await self._connect_delta_socket()
+
+		await self._send(_delta(1, [{"symbol": "ES", "bid": 9.0}], epoch="e2"))
+
+		frame = await communicator.receive_json_from()
+		self.assertEqual((frame["data"]["epoch"], frame["data"]["seq"]), ("e2", 1))
+		await communicator.disconnect()
+
+
+class _RecordingLayer:
+	def __init__(self):
+		self.groups = []
+
+	async def group_send(self, group, event):
+		self.groups.append(group)
+
+
+class SymbolBroadcastRefcountTests(SimpleTestCase):
+	def test_skips_symbol_group_without_subscribers(self):
+		layer = _RecordingLayer()
+		with mock.patch.object(broadcast, "symbols_with_subscribers", lambda: frozenset({"ES"})):
+			broadcast_symbol_message_sync(layer, "NQ", _quote_tick("NQ"))
+			broadcast_symbol_message_sync(layer, "/ES", _quote_tick("/ES"))
+
+		self.assertEqual(
+			layer.groups,
+			[ALL_SYMBOLS_GROUP_NAME, symbol_group_name("ES"), ALL_SYMBOLS_GROUP_NAME],
+		)
+
+	def test_sends_symbol_group_when_subscribers_unknown(self):
+		layer = _RecordingLayer()
+		with mock.patch.object(broadcast, "symbols_with_subscribers", lambda: None):
+			broadcast_symbol_message_sync(layer, "NQ", _quote_tick("NQ"))
+
+		self.assertEqual(layer.groups, [symbol_group_name("NQ"), ALL_SYMBOLS_GROUP_NAME])
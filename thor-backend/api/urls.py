@@ -8,6 +8,7 @@ urlpatterns = [
     path('quotes/', views.quotes_snapshot, name='quotes-snapshot'),
     path('quotes/stream/', views.quotes_stream, name='quotes-stream'),
     path('intraday/health/', views.intraday_health, name='intraday-health'),
+    path('heartbeat/metrics/', views.heartbeat_metrics, name='heartbeat-metrics'),
     # Market session intraday latest
     path('session/', views.session, name='session'),
    
@@ -4,10 +4,11 @@ import time
 from decimal import Decimal, InvalidOperation
 
 from django.db.models import Max
-from django.http import HttpRequest, StreamingHttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from django.utils.timezone import now
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from .redis_client import get_redis, latest_key, unified_stream_key
@@ -15,6 +16,7 @@ from LiveData.shared.redis_client import live_data_redis
 from GlobalMarkets.normalize import normalize_country_code
 from Instruments.models.instrument import Instrument
 from Instruments.models.intraday import InstrumentIntraday
+from thor_project.realtime.metrics import PROMETHEUS_CONTENT_TYPE, load_job_metrics, render_prometheus
 
 
 def _floor_to_minute(dt):
@@ -281,11 +283,27 @@ def api_overview(request):
         'Quotes Stream (SSE)': '/api/quotes/stream/',
         'Intraday Health': '/api/intraday/health/?markets=USA,Pre_USA&threshold_minutes=3',
         'Session': '/api/session/?market=Tokyo&future=YM',
+        'Heartbeat Metrics (Prometheus)': '/api/heartbeat/metrics/',
         'Global Markets': '/api/global-markets/',
         'Admin': '/admin/',
     }
     return Response(api_urls)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def heartbeat_metrics(request: HttpRequest):
+    """
+    GET /api/heartbeat/metrics/
+
+    Per-job heartbeat metrics (durations, counts, scheduling lag) in the
+    Prometheus text format, as last published by the heartbeat leader.
+    """
+    try:
+        jobs, meta = load_job_metrics()
+    except Exception as e:
+        return Response({'detail': f'Heartbeat metrics unavailable: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return HttpResponse(render_prometheus(jobs, meta), content_type=PROMETHEUS_CONTENT_TYPE)
+
 # Statistics endpoint
 @api_view(['GET'])
 def api_statistics(request):
@@ -6,11 +6,13 @@ Domain apps call these to broadcast their data without knowing about WebSocket i
 """
 
 import asyncio
+import json
 import logging
 import os
+import re
 from datetime import date, datetime, time
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
@@ -19,6 +21,102 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_GROUP_NAME = "market_data"
 
+# Per-symbol fan-out (quote_tick / market.24h / market.52w).
+# Sockets that never sent a `subscribe` stay in ALL_SYMBOLS_GROUP_NAME (firehose);
+# subscribed sockets only join the groups of the symbols they display.
+ALL_SYMBOLS_GROUP_NAME = "market_data.symbols"
+SYMBOL_GROUP_PREFIX = "market_data.sym."
+
+# Redis hash symbol -> number of sockets (across processes) subscribed to it.
+# Maintained by MarketDataConsumer; per-symbol group sends are skipped for
+# symbols nobody holds.
+WS_SYMBOL_REFS_KEY = "thor:ws:symbol_refs"
+# Upper bound on how stale the cached subscriber set may be (keyspace
+# notifications usually invalidate it immediately).
+WS_SYMBOL_REFS_TTL_SECONDS = 1.0
+
+# Full market_data snapshot (with seq) written by MarketDataSnapshotJob and
+# served by MarketDataConsumer on connect / resync.
+MARKET_DATA_SNAPSHOT_KEY = "thor:market_data:snapshot"
+
+_GROUP_UNSAFE_CHARS = re.compile(r"[^A-Z0-9_.-]")
+
+
+def normalize_ws_symbol(symbol: Any) -> str:
+    """Canonical symbol form used for WS interest matching (no leading '/', upper)."""
+    return str(symbol or "").strip().lstrip("/").upper()
+
+
+def symbol_group_name(symbol: Any) -> str | None:
+    """Channel-layer group name for one symbol (group names allow [A-Za-z0-9_.-] only)."""
+    sym = normalize_ws_symbol(symbol)
+    if not sym:
+        return None
+    return f"{SYMBOL_GROUP_PREFIX}{_GROUP_UNSAFE_CHARS.sub('_', sym)}"[:99]
+
+
+# Adds `delta` to each symbol's refcount; drops fields that reach zero.
+# KEYS: 1 refs hash. ARGV: 1 delta, 2.. symbols.
+_ADJUST_SYMBOL_REFS_LUA = """
+local delta = tonumber(ARGV[1])
+for i = 2, #ARGV do
+    local n = redis.call('HINCRBY', KEYS[1], ARGV[i], delta)
+    if n <= 0 then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+return #ARGV - 1
+"""
+
+_symbol_refs_cache: Any = None
+_adjust_symbol_refs_script: Any = None
+
+
+def _get_symbol_refs_cache():
+    global _symbol_refs_cache
+    if _symbol_refs_cache is None:
+        from django.conf import settings
+
+        from LiveData.shared.config_cache import ConfigKeyCache
+        from LiveData.shared.redis_client import live_data_redis
+
+        _symbol_refs_cache = ConfigKeyCache(
+            live_data_redis.client,
+            [WS_SYMBOL_REFS_KEY],
+            ttl=WS_SYMBOL_REFS_TTL_SECONDS,
+            notify=bool(getattr(settings, "LIVE_DATA_CONFIG_CACHE_NOTIFY", True)),
+        )
+    return _symbol_refs_cache
+
+
+def adjust_symbol_refs(symbols: Iterable[Any], delta: int) -> None:
+    """Record that `delta` sockets gained (+) or lost (-) interest in `symbols`."""
+    global _adjust_symbol_refs_script
+    names = sorted({normalize_ws_symbol(s) for s in symbols} - {""})
+    if not names or not delta:
+        return
+    try:
+        from LiveData.shared.redis_client import live_data_redis
+
+        if _adjust_symbol_refs_script is None:
+            _adjust_symbol_refs_script = live_data_redis.client.register_script(_ADJUST_SYMBOL_REFS_LUA)
+        _adjust_symbol_refs_script(keys=[WS_SYMBOL_REFS_KEY], args=[int(delta), *names])
+        _get_symbol_refs_cache().invalidate(WS_SYMBOL_REFS_KEY)
+    except Exception:
+        logger.debug("WS symbol refcount update failed", exc_info=True)
+
+
+def symbols_with_subscribers() -> frozenset | None:
+    """Symbols at least one socket subscribed to (None = unknown; callers send anyway)."""
+    try:
+        return _get_symbol_refs_cache().get(
+            WS_SYMBOL_REFS_KEY,
+            lambda c: frozenset(c.hkeys(WS_SYMBOL_REFS_KEY)),
+        )
+    except Exception:
+        logger.debug("WS symbol refcount read failed", exc_info=True)
+        return None
+
 
 def _market_data_debug_enabled() -> bool:
     return os.getenv("THOR_DEBUG_MARKET_DATA", "").strip().lower() in {"1", "true", "yes", "on"}
@@ -51,51 +149,106 @@ def _debug_market_data_send(group_name: str, msg_type: str | None) -> None:
         logger.debug("market_data debug counter failed", exc_info=True)
 
 
-def _json_safe(value: Any) -> Any:
-    """Recursively convert objects to msgpack/json-safe primitives."""
-    if value is None:
-        return None
-
-    if isinstance(value, (str, int, float, bool)):
-        return value
-
+def _json_default(value: Any) -> Any:
+    """json.dumps fallback for the non-JSON types domain payloads carry."""
     if isinstance(value, Decimal):
         return float(value)
 
     if isinstance(value, (datetime, date, time)):
         return value.isoformat()
 
-    if isinstance(value, dict):
-        return {str(k): _json_safe(v) for k, v in value.items()}
-
-    if isinstance(value, (list, tuple, set)):
-        return [_json_safe(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return list(value)
 
     # Last resort: stringify unknown objects
     return str(value)
 
 
+def encode_ws_frame(message: Dict[str, Any]) -> str:
+    """Serialize a {"type", "data"} message to the exact text frame clients receive."""
+    return json.dumps({"type": message.get("type"), "data": message.get("data")}, default=_json_default)
+
+
+def build_channel_event(message: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the channel-layer event for a WebSocket message, encoding it once.
+
+    The event carries the pre-encoded client frame in "text"; consumer handlers
+    forward it verbatim instead of re-serializing per socket. An optional
+    message["legacy"] (another {"type", "data"} message) is encoded into
+    "legacy_text" for sockets that have not opted into a newer protocol.
+    """
+    event: Dict[str, Any] = {"type": message.get("type"), "text": encode_ws_frame(message)}
+    legacy = message.get("legacy")
+    if isinstance(legacy, dict):
+        event["legacy_text"] = encode_ws_frame(legacy)
+    return event
+
+
 async def broadcast_to_websocket_async(message: Dict[str, Any], group_name: str = DEFAULT_GROUP_NAME) -> None:
     channel_layer = get_channel_layer()
     if not channel_layer:
         logger.warning("No channel_layer available - skipping WebSocket broadcast")
         return
 
-    safe_message = _json_safe(message)
-
     try:
-        msg_type = safe_message.get("type")
+        event = build_channel_event(message)
+        msg_type = event.get("type")
         logger.debug("📡 Broadcasting to WebSocket (async): %s", msg_type)
 
         if group_name == DEFAULT_GROUP_NAME and _market_data_debug_enabled():
             await asyncio.to_thread(_debug_market_data_send, group_name, msg_type)
 
-        await channel_layer.group_send(group_name, safe_message)
+        await channel_layer.group_send(group_name, event)
         logger.debug("✅ WebSocket broadcast sent (async): %s", msg_type)
     except Exception:
         logger.exception("❌ WebSocket broadcast error (async)")
 
 
+_broadcast_queue: Any = None
+
+
+def set_broadcast_queue(queue: Any) -> None:
+    """
+    Route in-loop broadcasts through a BroadcastQueue (None to uninstall).
+
+    Only sends made on the queue's own event loop go through it; sync callers
+    in other threads keep the async_to_sync bridge.
+    """
+    global _broadcast_queue
+    _broadcast_queue = queue
+
+
+def _send_event_sync(
+    channel_layer: Any,
+    event: Dict[str, Any],
+    group_name: str,
+    conflate_key: Any = None,
+) -> None:
+    msg_type = event.get("type")
+    _debug_market_data_send(group_name, msg_type)
+
+    # If we are already inside an event loop thread, schedule the send
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    queue = _broadcast_queue
+    if queue is not None and loop is not None and queue.loop is loop:
+        queue.submit(group_name, event, conflate_key)
+        return
+
+    if loop and loop.is_running():
+        loop.create_task(channel_layer.group_send(group_name, event))
+        logger.debug("✅ WebSocket broadcast scheduled on loop: %s", msg_type)
+        return
+
+    # No running loop in this thread -> bridge safely
+    async_to_sync(channel_layer.group_send)(group_name, event)
+    logger.debug("✅ WebSocket broadcast sent (sync bridge): %s", msg_type)
+
+
 def broadcast_to_websocket_sync(
     channel_layer: Optional[Any],
     message: Dict[str, Any],
@@ -111,27 +264,43 @@ def broadcast_to_websocket_sync(
         logger.warning("No channel_layer available - skipping WebSocket broadcast")
         return
 
-    safe_message = _json_safe(message)
-    msg_type = safe_message.get("type")
-
     try:
-        _debug_market_data_send(group_name, msg_type)
-
-        # If we are already inside an event loop thread, schedule the send
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            loop = None
+        _send_event_sync(channel_layer, build_channel_event(message), group_name)
+    except Exception:
+        # Never let WebSocket errors block the calling code
+        logger.exception("❌ WebSocket broadcast error")
 
-        if loop and loop.is_running():
-            loop.create_task(channel_layer.group_send(group_name, safe_message))
-            logger.debug("✅ WebSocket broadcast scheduled on loop: %s", msg_type)
-            return
 
-        # No running loop in this thread -> bridge safely
-        async_to_sync(channel_layer.group_send)(group_name, safe_message)
-        logger.debug("✅ WebSocket broadcast sent (sync bridge): %s", msg_type)
+def broadcast_symbol_message_sync(
+    channel_layer: Optional[Any],
+    symbol: Any,
+    message: Dict[str, Any],
+) -> None:
+    """
+    Broadcast a per-symbol message only to interested sockets.
+
+    Sends to the symbol's group (subscribed sockets) and to the firehose group
+    (legacy sockets that never subscribed). Sockets watching other symbols are
+    never reached, and the symbol group send is skipped when no socket holds
+    the symbol (WS_SYMBOL_REFS_KEY). The frame is encoded once for both groups. Under a
+    BroadcastQueue, queued-but-unsent messages of the same type and symbol
+    are conflated (latest wins).
+    """
+    channel_layer = channel_layer or get_channel_layer()
+    if not channel_layer:
+        logger.warning("No channel_layer available - skipping WebSocket broadcast")
+        return
 
+    try:
+        event = build_channel_event(message)
+        conflate_key = (event.get("type"), normalize_ws_symbol(symbol))
+        group = symbol_group_name(symbol)
+        if group:
+            subscribed = symbols_with_subscribers()
+            if subscribed is not None and conflate_key[1] not in subscribed:
+                group = None
+        if group:
+            _send_event_sync(channel_layer, event, group, conflate_key)
+        _send_event_sync(channel_layer, event, ALL_SYMBOLS_GROUP_NAME, conflate_key)
     except Exception:
-        # Never let WebSocket errors block the calling code
         logger.exception("❌ WebSocket broadcast error")
@@ -0,0 +1,160 @@
+"""
+Bounded, conflating WebSocket broadcast queue for asyncio producers.
+
+Without it, broadcast_to_websocket_sync() called from inside an event loop
+(e.g. the Schwab streamer) schedules one group_send task per message with no
+bound, so a slow channel layer lets pending tasks pile up without limit.
+
+A BroadcastQueue owns a single worker task that sends events in FIFO order:
+  - at most `max_pending` events are queued; when full the oldest is dropped
+  - events submitted with a conflate key (e.g. per-symbol quote_tick) replace
+    the queued-but-unsent event with the same key, keeping its queue slot
+  - send latency (first enqueue -> group_send done) and drops are tracked
+
+Install it with api.websocket.broadcast.set_broadcast_queue(); the broadcast
+helpers then route in-loop sends through it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BroadcastQueue:
+    def __init__(
+        self,
+        channel_layer: Any,
+        *,
+        max_pending: int = 5000,
+        send_timeout: float = 2.0,
+    ):
+        self.channel_layer = channel_layer
+        self.max_pending = max(1, int(max_pending))
+        self.send_timeout = float(send_timeout)
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: "OrderedDict[Hashable, tuple[str, Dict[str, Any], float]]" = OrderedDict()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._seq = itertools.count()
+
+        self.enqueued = 0
+        self.conflated = 0
+        self.dropped = 0
+        self.sent = 0
+        self.send_errors = 0
+        self.max_depth = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+        self._latency_last = 0.0
+
+    # ---- lifecycle ----
+
+    def start(self) -> asyncio.Task:
+        """Start the worker on the running loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self.loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            if self._pending:
+                self._wakeup.set()
+            self._task = self.loop.create_task(self._worker())
+        return self._task
+
+    async def stop(self, *, drain_timeout: float = 1.0) -> None:
+        """Give pending events up to `drain_timeout` seconds, then stop the worker."""
+        deadline = time.monotonic() + max(0.0, drain_timeout)
+        while self._pending and time.monotonic() < deadline and self._task and not self._task.done():
+            await asyncio.sleep(0.01)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+
+    # ---- producer side (must be called on the queue's loop thread) ----
+
+    def submit(self, group_name: str, event: Dict[str, Any], conflate_key: Hashable | None = None) -> None:
+        self.enqueued += 1
+        now = time.monotonic()
+
+        if conflate_key is not None:
+            key = (group_name, conflate_key)
+            existing = self._pending.get(key)
+            if existing is not None:
+                # Latest wins; keep the original slot and enqueue time.
+                self._pending[key] = (group_name, event, existing[2])
+                self.conflated += 1
+                return
+        else:
+            key = ("_", next(self._seq))
+
+        if len(self._pending) >= self.max_pending:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        self._pending[key] = (group_name, event, now)
+        self.max_depth = max(self.max_depth, len(self._pending))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ---- worker ----
+
+    async def _worker(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            _key, (group_name, event, enqueued_at) = self._pending.popitem(last=False)
+            try:
+                await asyncio.wait_for(
+                    self.channel_layer.group_send(group_name, event),
+                    timeout=self.send_timeout,
+                )
+                self.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.send_errors += 1
+                logger.debug("broadcast queue: group_send failed group=%s", group_name, exc_info=True)
+                continue
+
+            latency = time.monotonic() - enqueued_at
+            self._latency_last = latency
+            self._latency_sum += latency
+            self._latency_max = max(self._latency_max, latency)
+
+    # ---- metrics ----
+
+    def get_stats(self) -> Dict[str, Any]:
+        oldest_age = 0.0
+        if self._pending:
+            oldest_age = time.monotonic() - next(iter(self._pending.values()))[2]
+        return {
+            "depth": len(self._pending),
+            "max_depth": self.max_depth,
+            "max_pending": self.max_pending,
+            "enqueued": self.enqueued,
+            "conflated": self.conflated,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "send_errors": self.send_errors,
+            "oldest_age_ms": round(oldest_age * 1000.0, 1),
+            "latency_last_ms": round(self._latency_last * 1000.0, 1),
+            "latency_avg_ms": round(self._latency_sum / self.sent * 1000.0, 1) if self.sent else 0.0,
+            "latency_max_ms": round(self._latency_max * 1000.0, 1),
+        }
+
+
+__all__ = ["BroadcastQueue"]
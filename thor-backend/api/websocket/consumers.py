@@ -7,11 +7,26 @@ quotes, and other real-time data from the heartbeat scheduler.
 
 import json
 import logging
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.layers import get_channel_layer
 
+from api.websocket.broadcast import (
+    ALL_SYMBOLS_GROUP_NAME,
+    DEFAULT_GROUP_NAME,
+    MARKET_DATA_SNAPSHOT_KEY,
+    adjust_symbol_refs,
+    normalize_ws_symbol,
+    symbol_group_name,
+)
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on per-socket symbol subscriptions (protects the channel layer).
+MAX_SYMBOL_SUBSCRIPTIONS = 1000
+
 
 class MarketDataConsumer(AsyncWebsocketConsumer):
     """
@@ -31,6 +46,32 @@ class MarketDataConsumer(AsyncWebsocketConsumer):
         "type": "intraday_bar" | "market_status" | "quote_tick" | "heartbeat" | etc.,
         "data": { ...message-specific fields... }
     }
+
+    Symbol subscriptions (optional, client -> server):
+        {"type": "subscribe", "symbols": ["ES", "/NQ", "AAPL"]}
+        {"type": "unsubscribe", "symbols": ["AAPL"]}
+        {"type": "subscribe", "symbols": ["*"]}   # back to all symbols
+
+    Until a client subscribes it receives every symbol (legacy behavior).
+    After subscribing, quote_tick / market.24h / market.52w arrive only for
+    its symbols and market_data snapshots are filtered to them. The server
+    replies with {"type": "subscriptions", "data": {"symbols": [...] | "*"}}.
+
+    market_data delta protocol (opt-in via ?market_data=delta or by sending
+    {"type": "market_data_resync"}):
+        server -> {"type": "market_data_snapshot", "data": {epoch, seq, timestamp, quotes}}
+        server -> {"type": "market_data_delta",
+                   "data": {epoch, seq, base_seq, timestamp, changes, removed}}
+    Client rule, with last = the seq of the last snapshot/delta applied:
+      - epoch differs from the snapshot's -> market_data_resync
+      - seq <= last -> drop (already contained in what the client has; a
+        snapshot cached just before its delta was broadcast yields this)
+      - base_seq > last -> a delta was missed -> market_data_resync
+      - otherwise apply it and set last = seq
+    The consumer already drops deltas at or below the snapshot seq it sent.
+    Legacy sockets
+    receive {"type": "market_data"} on connect (full) and then the full quotes
+    of changed symbols only.
     """
     
     async def connect(self):
@@ -38,25 +79,38 @@ class MarketDataConsumer(AsyncWebsocketConsumer):
         Called when a WebSocket connection is established.
         Joins the broadcast channel layer if available.
         """
+        # None = all symbols (firehose); a set = explicit symbol interest.
+        self.subscribed_symbols = None
+        self.market_data_deltas = self._query_param("market_data") == "delta"
+        # (epoch, seq) of the last snapshot sent to a delta socket, until a newer delta passes.
+        self.market_data_snapshot_seq = None
+
         # Join the market data broadcast group if channel layer is configured
         if self.channel_layer:
             try:
-                await self.channel_layer.group_add("market_data", self.channel_name)
+                await self.channel_layer.group_add(DEFAULT_GROUP_NAME, self.channel_name)
+                await self.channel_layer.group_add(ALL_SYMBOLS_GROUP_NAME, self.channel_name)
             except AttributeError:
                 pass  # channel_name may not be available in all test scenarios
         
         await self.accept()
         logger.debug("WebSocket client connected")
+
+        await self._send_market_data_snapshot()
     
     async def disconnect(self, close_code):
         """
         Called when a WebSocket connection is closed.
         Removes the client from broadcast groups.
         """
-        # Leave the market data broadcast group if channel layer is configured
+        # Leave the market data broadcast groups if channel layer is configured
         if self.channel_layer:
             try:
-                await self.channel_layer.group_discard("market_data", self.channel_name)
+                await self.channel_layer.group_discard(DEFAULT_GROUP_NAME, self.channel_name)
+                if self.subscribed_symbols is None:
+                    await self.channel_layer.group_discard(ALL_SYMBOLS_GROUP_NAME, self.channel_name)
+                else:
+                    await self._discard_symbol_groups(self.subscribed_symbols)
             except AttributeError:
                 pass  # channel_name may not be available in all test scenarios
         logger.debug("WebSocket client disconnected")
@@ -64,7 +118,7 @@ class MarketDataConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data=None, bytes_data=None):
         """
         Called when data is received from the WebSocket.
-        Currently used for heartbeat acknowledgments (optional).
+        Handles heartbeat pings and symbol subscribe/unsubscribe requests.
         """
         if text_data:
             try:
@@ -77,95 +131,279 @@ class MarketDataConsumer(AsyncWebsocketConsumer):
                         "type": "pong",
                         "timestamp": data.get("timestamp")
                     }))
+                elif message_type == "subscribe":
+                    await self._subscribe(data.get("symbols"))
+                elif message_type == "unsubscribe":
+                    await self._unsubscribe(data.get("symbols"))
+                elif message_type == "market_data_resync":
+                    self.market_data_deltas = True
+                    await self._send_market_data_snapshot()
                 else:
                     logger.debug(f"Received message from client: {message_type}")
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON received from client")
     
+    def _query_param(self, name: str) -> str | None:
+        try:
+            qs = parse_qs((self.scope.get("query_string") or b"").decode("latin-1"))
+        except Exception:
+            return None
+        values = qs.get(name)
+        return values[0] if values else None
+
+    # ---- market_data snapshot / delta ----
+
+    def _filter_quotes(self, quotes) -> list:
+        quotes = [q for q in (quotes or []) if isinstance(q, dict)]
+        if self.subscribed_symbols is None:
+            return quotes
+        wanted = self.subscribed_symbols
+        return [q for q in quotes if normalize_ws_symbol(q.get("symbol")) in wanted]
+
+    @staticmethod
+    def _read_market_data_snapshot():
+        from LiveData.shared.redis_client import live_data_redis
+
+        raw = live_data_redis.client.get(MARKET_DATA_SNAPSHOT_KEY)
+        return json.loads(raw) if raw else None
+
+    async def _send_market_data_snapshot(self) -> None:
+        """Send the cached full snapshot (delta sockets always get a reply)."""
+        try:
+            snapshot = await sync_to_async(self._read_market_data_snapshot, thread_sensitive=False)()
+        except Exception:
+            logger.debug("market_data snapshot read failed", exc_info=True)
+            snapshot = None
+
+        if not isinstance(snapshot, dict):
+            if not self.market_data_deltas:
+                return
+            # Nothing cached yet: the first delta will carry every symbol.
+            snapshot = {"epoch": None, "seq": None, "timestamp": None, "quotes": []}
+
+        data = {**snapshot, "quotes": self._filter_quotes(snapshot.get("quotes"))}
+        if self.market_data_deltas:
+            seq = snapshot.get("seq")
+            self.market_data_snapshot_seq = None if seq is None else (snapshot.get("epoch"), seq)
+        await self.send(text_data=json.dumps({
+            "type": "market_data_snapshot" if self.market_data_deltas else "market_data",
+            "data": data,
+        }))
+
+    # ---- Symbol subscriptions ----
+
+    @staticmethod
+    def _parse_symbols(raw) -> list:
+        if isinstance(raw, str):
+            raw = [raw]
+        if not isinstance(raw, (list, tuple)):
+            return []
+        out = []
+        for item in raw:
+            sym = "*" if str(item).strip() == "*" else normalize_ws_symbol(item)
+            if sym and sym not in out:
+                out.append(sym)
+        return out
+
+    async def _add_symbol_groups(self, symbols) -> None:
+        for sym in symbols:
+            group = symbol_group_name(sym)
+            if group:
+                await self.channel_layer.group_add(group, self.channel_name)
+        await self._adjust_symbol_refs(symbols, 1)
+
+    async def _discard_symbol_groups(self, symbols) -> None:
+        for sym in symbols:
+            group = symbol_group_name(sym)
+            if group:
+                await self.channel_layer.group_discard(group, self.channel_name)
+        await self._adjust_symbol_refs(symbols, -1)
+
+    @staticmethod
+    async def _adjust_symbol_refs(symbols, delta: int) -> None:
+        # Lets broadcasters skip symbol groups no socket is in.
+        if symbols:
+            await sync_to_async(adjust_symbol_refs, thread_sensitive=False)(list(symbols), delta)
+
+    async def _send_subscriptions(self) -> None:
+        symbols = "*" if self.subscribed_symbols is None else sorted(self.subscribed_symbols)
+        await self.send(text_data=json.dumps({
+            "type": "subscriptions",
+            "data": {"symbols": symbols},
+        }))
+
+    async def _subscribe(self, raw_symbols) -> None:
+        symbols = self._parse_symbols(raw_symbols)
+        if not self.channel_layer:
+            return
+
+        if "*" in symbols:
+            # Back to firehose mode.
+            if self.subscribed_symbols is not None:
+                await self._discard_symbol_groups(self.subscribed_symbols)
+                await self.channel_layer.group_add(ALL_SYMBOLS_GROUP_NAME, self.channel_name)
+                self.subscribed_symbols = None
+                if self.market_data_deltas:
+                    await self._send_market_data_snapshot()
+            await self._send_subscriptions()
+            return
+
+        if self.subscribed_symbols is None:
+            # First explicit subscription: leave the firehose.
+            await self.channel_layer.group_discard(ALL_SYMBOLS_GROUP_NAME, self.channel_name)
+            self.subscribed_symbols = set()
+
+        room = MAX_SYMBOL_SUBSCRIPTIONS - len(self.subscribed_symbols)
+        new_symbols = [s for s in symbols if s not in self.subscribed_symbols][: max(0, room)]
+        await self._add_symbol_groups(new_symbols)
+        self.subscribed_symbols.update(new_symbols)
+        await self._send_subscriptions()
+        if new_symbols and self.market_data_deltas:
+            # Delta sockets need base state for the symbols they just added.
+            await self._send_market_data_snapshot()
+
+    async def _unsubscribe(self, raw_symbols) -> None:
+        symbols = self._parse_symbols(raw_symbols)
+        if not self.channel_layer or self.subscribed_symbols is None:
+            await self._send_subscriptions()
+            return
+
+        removed = [s for s in symbols if s in self.subscribed_symbols]
+        await self._discard_symbol_groups(removed)
+        self.subscribed_symbols.difference_update(removed)
+        await self._send_subscriptions()
+
     # ---- Broadcast message handlers ----
     # These methods are called by the channel layer when messages are sent
     # to the "market_data" group. Method name must match message["type"].
-    
+    #
+    # Events from api.websocket.broadcast carry the client frame pre-encoded
+    # in "text" (encoded once per broadcast, not once per socket); handlers
+    # forward it verbatim and only decode when they must filter per socket.
+
+    async def _forward(self, event, wire_type: str, text_key: str = "text"):
+        text = event.get(text_key)
+        if text is None:
+            # Event sent without the broadcast helpers: encode here.
+            text = json.dumps({"type": wire_type, "data": event.get("data")}, default=str)
+        await self.send(text_data=text)
+
+    @staticmethod
+    def _event_data(event, text_key: str = "text"):
+        if "data" in event or event.get(text_key) is None:
+            return event.get("data")
+        return json.loads(event[text_key]).get("data")
+
     async def intraday_bar(self, event):
         """Broadcast intraday bar update to client."""
-        await self.send(text_data=json.dumps({
-            "type": "intraday_bar",
-            "data": event.get("data")
-        }))
+        await self._forward(event, "intraday_bar")
     
     async def market_status(self, event):
         """Broadcast market status update to client."""
-        await self.send(text_data=json.dumps({
-            "type": "market_status",
-            "data": event.get("data")
-        }))
+        await self._forward(event, "market_status")
     
     async def quote_tick(self, event):
         """Broadcast quote tick update to client."""
-        await self.send(text_data=json.dumps({
-            "type": "quote_tick",
-            "data": event.get("data")
-        }))
+        await self._forward(event, "quote_tick")
 
     async def market_data(self, event):
         """Broadcast batched market data snapshot (quotes array) to client."""
+        if self.subscribed_symbols is None:
+            await self._forward(event, "market_data")
+            return
+
+        data = self._event_data(event)
+        if not isinstance(data, dict):
+            return
+        quotes = self._filter_quotes(data.get("quotes"))
+        if not quotes:
+            return
         await self.send(text_data=json.dumps({
             "type": "market_data",
-            "data": event.get("data")
+            "data": {**data, "quotes": quotes}
+        }))
+
+    async def market_data_delta(self, event):
+        """Forward a sequenced market_data delta (or its legacy full-quote form)."""
+        if not self.market_data_deltas:
+            if self.subscribed_symbols is None:
+                if event.get("legacy_text"):
+                    await self.send(text_data=event["legacy_text"])
+                return
+            legacy = self._event_data(event, "legacy_text") or {}
+            quotes = self._filter_quotes(legacy.get("quotes"))
+            if not quotes:
+                return
+            await self.send(text_data=json.dumps({
+                "type": "market_data",
+                "data": {**legacy, "quotes": quotes},
+            }))
+            return
+
+        data = None
+        if self.market_data_snapshot_seq is not None:
+            data = self._event_data(event) or {}
+            if self._delta_predates_snapshot(data):
+                return
+            self.market_data_snapshot_seq = None
+
+        if self.subscribed_symbols is None:
+            await self._forward(event, "market_data_delta")
+            return
+
+        # Sequenced sockets always get the frame (even if filtered empty) so
+        # their seq chain stays contiguous.
+        if data is None:
+            data = self._event_data(event) or {}
+        wanted = self.subscribed_symbols
+        data = {
+            **data,
+            "changes": self._filter_quotes(data.get("changes")),
+            "removed": [s for s in (data.get("removed") or []) if normalize_ws_symbol(s) in wanted],
+        }
+        await self.send(text_data=json.dumps({
+            "type": "market_data_delta",
+            "data": data,
         }))
     
+    def _delta_predates_snapshot(self, data) -> bool:
+        """True if the snapshot this socket got already includes the delta (seq <= snapshot seq)."""
+        epoch, snapshot_seq = self.market_data_snapshot_seq
+        if data.get("epoch") != epoch:
+            return False
+        try:
+            return int(data.get("seq")) <= int(snapshot_seq)
+        except (TypeError, ValueError):
+            return False
+
     async def twenty_four_hour(self, event):
         """Broadcast 24-hour statistics update to client."""
-        await self.send(text_data=json.dumps({
-            "type": "twenty_four_hour",
-            "data": event.get("data")
-        }))
+        await self._forward(event, "twenty_four_hour")
 
     async def market_24h(self, event):
         """Broadcast live 24h snapshot update to client (event type 'market.24h')."""
-        await self.send(text_data=json.dumps({
-            "type": "market.24h",
-            "data": event.get("data"),
-        }))
+        await self._forward(event, "market.24h")
 
     async def market_52w(self, event):
         """Broadcast live 52w snapshot update to client (event type 'market.52w')."""
-        await self.send(text_data=json.dumps({
-            "type": "market.52w",
-            "data": event.get("data"),
-        }))
+        await self._forward(event, "market.52w")
     
     async def vwap_update(self, event):
         """Broadcast VWAP update to client."""
-        await self.send(text_data=json.dumps({
-            "type": "vwap_update",
-            "data": event.get("data")
-        }))
+        await self._forward(event, "vwap_update")
     
     async def heartbeat(self, event):
         """Broadcast heartbeat message to client."""
-        await self.send(text_data=json.dumps({
-            "type": "heartbeat",
-            "data": event.get("data")
-        }))
+        await self._forward(event, "heartbeat")
 
     async def schwab_health(self, event):
         """Broadcast Schwab health snapshot to client."""
-        await self.send(text_data=json.dumps({
-            "type": "schwab_health",
-            "data": event.get("data", event),
-        }))
+        await self._forward(event, "schwab_health")
 
     async def global_markets_tick(self, event):
         """Broadcast consolidated per-market clock tick to client."""
-        await self.send(text_data=json.dumps({
-            "type": "global_markets_tick",
-            "data": event.get("data")
-        }))
+        await self._forward(event, "global_markets_tick")
     
     async def error_message(self, event):
         """Broadcast error message to client."""
-        await self.send(text_data=json.dumps({
-            "type": "error_message",
-            "data": event.get("data")
-        }))
+        await self._forward(event, "error_message")
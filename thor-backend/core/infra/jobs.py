@@ -6,13 +6,35 @@ No domain imports here. Shared state tracks last_run per job name.
 Used by the realtime heartbeat scheduler (thor_project/realtime/engine.py) to
 dispatch all periodic jobs on a unified tick. This is the only JobRegistry
 implementation in the codebase.
+
+Execution:
+- max_workers=0 runs due jobs inline, one after another (legacy behaviour).
+- max_workers>0 hands due jobs to a bounded thread pool so a slow job never
+  delays the others. A job is never started again while its previous run is
+  still queued or running.
+- Scheduling is fixed-rate: last_run records the slot a run was due for, not
+  when it happened to start, so a 1s job stays on its 1s grid. A job that
+  falls more than one interval behind skips the missed slots.
+- timeout_seconds flags runs that exceed it (threads cannot be killed); the
+  job stays blocked from overlapping until the stuck run returns.
+- run_hook, when given, is called in the running thread right before and
+  right after every job run. The runtime passes Django's
+  close_old_connections so worker threads never reuse a dead or expired
+  DB connection; this module itself stays framework-free.
+
+Metrics: every entry keeps a JobStats (rolling durations, run / overrun /
+exception / timeout counts, scheduling lag); metrics_snapshot() returns them
+as plain dicts, plus a "heartbeat" pseudo-job fed by record_tick().
 """
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Iterable, Protocol
+from typing import Any, Callable, Iterable, Protocol
 
 
 class Job(Protocol):
@@ -26,10 +48,105 @@ class Job(Protocol):
         ...
 
 
+# Rolling window of durations/lags behind the p50/p95 figures.
+_STATS_WINDOW = 256
+
+
+def _percentile(sorted_values: list[float], q: float) -> float | None:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class JobStats:
+    """Rolling run metrics for one job (thread-safe; recorded by worker threads)."""
+
+    def __init__(self, window: int = _STATS_WINDOW) -> None:
+        self._lock = threading.Lock()
+        self._durations: deque[float] = deque(maxlen=window)
+        self._lags: deque[float] = deque(maxlen=window)
+        self.runs = 0
+        self.exceptions = 0
+        self.overruns = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.last_duration: float | None = None
+        self.max_duration: float | None = None
+        self.last_lag: float | None = None
+        self.max_lag: float | None = None
+        self.last_run_at: float | None = None  # wall clock (epoch seconds)
+
+    def record(self, duration: float, lag: float, *, failed: bool = False, interval: float | None = None) -> None:
+        with self._lock:
+            self.runs += 1
+            if failed:
+                self.exceptions += 1
+            if interval and duration > interval:
+                self.overruns += 1
+            self._durations.append(duration)
+            self._lags.append(lag)
+            self.last_duration = duration
+            self.max_duration = duration if self.max_duration is None else max(self.max_duration, duration)
+            self.last_lag = lag
+            self.max_lag = lag if self.max_lag is None else max(self.max_lag, lag)
+            self.last_run_at = time.time()
+
+    def record_skip(self) -> None:
+        """Job was due but its previous run was still in flight."""
+        with self._lock:
+            self.skipped += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            durations = sorted(self._durations)
+            lags = sorted(self._lags)
+            return {
+                "runs": self.runs,
+                "exceptions": self.exceptions,
+                "overruns": self.overruns,
+                "timeouts": self.timeouts,
+                "skipped": self.skipped,
+                "last_duration": self.last_duration,
+                "p50_duration": _percentile(durations, 0.50),
+                "p95_duration": _percentile(durations, 0.95),
+                "max_duration": self.max_duration,
+                "last_lag": self.last_lag,
+                "p95_lag": _percentile(lags, 0.95),
+                "max_lag": self.max_lag,
+                "last_run_at": self.last_run_at,
+            }
+
+
 @dataclass
 class JobEntry:
     job: Job
     interval_seconds: float | None = None
+    timeout_seconds: float | None = None
+
+    # Runtime bookkeeping (owned by JobRegistry).
+    future: Future | None = field(default=None, repr=False)
+    started_at: float | None = field(default=None, repr=False)
+    timeout_reported: bool = field(default=False, repr=False)
+    stats: JobStats = field(default_factory=JobStats, repr=False)
+
+    @property
+    def name(self) -> str:
+        return getattr(self.job, "name", repr(self.job))
+
+    @property
+    def in_flight(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def cadence(self) -> float | None:
+        if self.interval_seconds is not None:
+            return float(self.interval_seconds)
+        interval = getattr(self.job, "interval_seconds", None)
+        return float(interval) if interval is not None else None
 
 
 @dataclass
@@ -46,53 +163,177 @@ class JobRegistry:
     jobs: list[JobEntry] = field(default_factory=list)
     state: dict[str, Any] = field(default_factory=lambda: {"last_run": {}})
     logger: logging.Logger = field(default_factory=lambda: logging.getLogger("job_registry"))
+    max_workers: int = 0
+    run_hook: Callable[[], None] | None = None
 
     def __init__(
         self,
         jobs: Iterable[JobEntry] | None = None,
         shared_state: dict[str, Any] | None = None,
         logger: logging.Logger | None = None,
+        max_workers: int = 0,
+        run_hook: Callable[[], None] | None = None,
     ) -> None:
         self.jobs = list(jobs) if jobs else []
         self.state = shared_state if shared_state is not None else {"last_run": {}}
         self.logger = logger or logging.getLogger("job_registry")
+        self.max_workers = max(0, int(max_workers or 0))
+        self.run_hook = run_hook
+        self._executor: ThreadPoolExecutor | None = None
+        # Heartbeat loop itself: duration = dispatch time, lag = late wake-up.
+        self.heartbeat_stats = JobStats()
+        self.tick_seconds: float | None = None
 
-    def register(self, job: Job, interval_seconds: float | None = None) -> None:
+    def register(
+        self,
+        job: Job,
+        interval_seconds: float | None = None,
+        timeout_seconds: float | None = None,
+    ) -> None:
         """Register a job with optional default interval (in seconds).
         
         Args:
             job: Job instance with name and run/should_run methods.
             interval_seconds: Optional default interval. Job's should_run() can override.
+            timeout_seconds: Optional run-time budget; defaults to job.timeout_seconds.
         """
-        self.jobs.append(JobEntry(job=job, interval_seconds=interval_seconds))
+        if timeout_seconds is None:
+            timeout_seconds = getattr(job, "timeout_seconds", None)
+        self.jobs.append(
+            JobEntry(job=job, interval_seconds=interval_seconds, timeout_seconds=timeout_seconds)
+        )
 
     def run_pending(self, ctx: Any, now: float | None = None) -> None:
-        """Execute all jobs that are due on this tick.
+        """Execute (or, with a worker pool, dispatch) all jobs that are due on this tick.
         
         Args:
             ctx: Context passed to each job's run() method.
             now: Current monotonic time. Computed if not provided.
         """
-        now = now or time.monotonic()
+        now = time.monotonic() if now is None else now
         last_run_map = self.state.setdefault("last_run", {})
 
         for entry in self.jobs:
             job = entry.job
             try:
-                should = False
-                if hasattr(job, "should_run"):
-                    should = job.should_run(now, self.state)
-                elif entry.interval_seconds is not None:
-                    last = last_run_map.get(job.name)
-                    should = last is None or (now - last) >= entry.interval_seconds
-
-                if not should:
+                if entry.in_flight:
+                    self._check_timeout(entry)
+                    if self._is_due(entry, now, last_run_map):
+                        entry.stats.record_skip()
+                    continue
+                entry.future = None
+
+                if not self._is_due(entry, now, last_run_map):
                     continue
 
-                start = time.monotonic()
-                job.run(ctx)
-                last_run_map[job.name] = now
-                duration = time.monotonic() - start
-                self.logger.debug("job %s ran in %.3fs", job.name, duration)
+                slot = self._slot(entry, last_run_map.get(job.name), now)
+                entry.started_at = None
+                entry.timeout_reported = False
+                if self.max_workers:
+                    entry.future = self._pool().submit(self._run_entry, entry, ctx, slot)
+                else:
+                    self._run_entry(entry, ctx, slot)
             except Exception:  # noqa: BLE001
-                self.logger.exception("job %s failed", getattr(job, "name", job))
+                self.logger.exception("job %s failed", entry.name)
+
+    def record_tick(self, dispatch_seconds: float, lag_seconds: float, tick_seconds: float | None = None) -> None:
+        """Heartbeat loop timing: time spent in run_pending and how late the tick woke."""
+        self.tick_seconds = tick_seconds
+        self.heartbeat_stats.record(dispatch_seconds, max(0.0, lag_seconds), interval=tick_seconds)
+
+    def metrics_snapshot(self) -> dict[str, dict[str, Any]]:
+        """Per-job metrics (plus "heartbeat") as plain dicts, keyed by job name."""
+        out: dict[str, dict[str, Any]] = {}
+        for entry in self.jobs:
+            snap = entry.stats.snapshot()
+            snap["interval"] = entry.cadence()
+            snap["timeout"] = entry.timeout_seconds
+            snap["in_flight"] = entry.in_flight
+            out[entry.name] = snap
+        out["heartbeat"] = {
+            **self.heartbeat_stats.snapshot(),
+            "interval": self.tick_seconds,
+            "timeout": None,
+            "in_flight": False,
+        }
+        return out
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker pool; queued runs are cancelled, running ones finish."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        return self._executor
+
+    def _is_due(self, entry: JobEntry, now: float, last_run_map: dict[str, Any]) -> bool:
+        job = entry.job
+        if hasattr(job, "should_run"):
+            return bool(job.should_run(now, self.state))
+        if entry.interval_seconds is not None:
+            last = last_run_map.get(job.name)
+            return last is None or (now - last) >= entry.interval_seconds
+        return False
+
+    @staticmethod
+    def _slot(entry: JobEntry, last: float | None, now: float) -> float:
+        """Fixed-rate slot this run is due for: last + interval, or now when a slot was missed."""
+        interval = entry.cadence()
+        if last is None or not interval:
+            return now
+        slot = last + interval
+        return slot if now - slot < interval else now
+
+    def _run_entry(self, entry: JobEntry, ctx: Any, slot: float) -> None:
+        self._call_run_hook(entry)
+        try:
+            self._run_job(entry, ctx, slot)
+        finally:
+            self._call_run_hook(entry)
+
+    def _call_run_hook(self, entry: JobEntry) -> None:
+        if self.run_hook is None:
+            return
+        try:
+            self.run_hook()
+        except Exception:  # noqa: BLE001
+            self.logger.exception("run hook failed around job %s", entry.name)
+
+    def _run_job(self, entry: JobEntry, ctx: Any, slot: float) -> None:
+        started = entry.started_at = time.monotonic()
+        try:
+            entry.job.run(ctx)
+        except Exception:  # noqa: BLE001
+            entry.stats.record(time.monotonic() - started, started - slot, failed=True, interval=entry.cadence())
+            self.logger.exception("job %s failed", entry.name)
+            return
+        self.state.setdefault("last_run", {})[entry.job.name] = slot
+        duration = time.monotonic() - started
+        entry.stats.record(duration, started - slot, interval=entry.cadence())
+        self.logger.debug("job %s ran in %.3fs", entry.name, duration)
+        if entry.timeout_seconds and duration > entry.timeout_seconds:
+            if not entry.timeout_reported:
+                entry.stats.record_timeout()
+            self.logger.warning(
+                "job %s took %.3fs (timeout %.3fs)", entry.name, duration, entry.timeout_seconds
+            )
+
+    def _check_timeout(self, entry: JobEntry) -> None:
+        if not entry.timeout_seconds or entry.started_at is None or entry.timeout_reported:
+            return
+        elapsed = time.monotonic() - entry.started_at
+        if elapsed > entry.timeout_seconds:
+            entry.timeout_reported = True
+            entry.stats.record_timeout()
+            self.logger.error(
+                "job %s still running after %.1fs (timeout %.1fs); not rescheduling until it returns",
+                entry.name,
+                elapsed,
+                entry.timeout_seconds,
+            )
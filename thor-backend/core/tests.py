@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+import unittest
+
+from core.infra.jobs import JobRegistry
+
+# Failures and timeouts below are expected; keep them out of the test output.
+_QUIET = logging.getLogger("core.tests.jobs")
+_QUIET.disabled = True
+
+
+class FakeJob:
+	"""Interval-driven job (no should_run) that records each run."""
+
+	def __init__(self, name="fake", *, fail=False, block=None, sleep=0.0):
+		self.name = name
+		self.fail = fail
+		self.block = block
+		self.sleep = sleep
+		self.runs = 0
+		self.started = threading.Event()
+
+	def run(self, ctx):
+		self.runs += 1
+		self.started.set()
+		if self.block is not None:
+			self.block.wait(5)
+		if self.sleep:
+			time.sleep(self.sleep)
+		if self.fail:
+			raise RuntimeError("boom")
+
+
+def _wait_done(entry):
+	if entry.future is not None:
+		try:
+			entry.future.result(timeout=5)
+		except Exception:
+			pass
+
+
+class FixedRateSchedulingTests(unittest.TestCase):
+	def setUp(self):
+		self.registry = JobRegistry(logger=_QUIET)
+		self.job = FakeJob()
+		self.registry.register(self.job, interval_seconds=1.0)
+
+	def last_run(self):
+		return self.registry.state["last_run"].get(self.job.name)
+
+	def test_first_run_uses_now_and_later_runs_stay_on_grid(self):
+		self.registry.run_pending(None, now=100.0)
+		self.assertEqual(self.last_run(), 100.0)
+
+		# Started late, but recorded against the slot it was due for.
+		self.registry.run_pending(None, now=101.3)
+		self.assertEqual(self.last_run(), 101.0)
+
+		self.registry.run_pending(None, now=101.9)
+		self.assertEqual(self.job.runs, 2)
+
+		self.registry.run_pending(None, now=102.0)
+		self.assertEqual(self.job.runs, 3)
+		self.assertEqual(self.last_run(), 102.0)
+
+	def test_missed_slots_are_skipped(self):
+		self.registry.run_pending(None, now=100.0)
+		self.registry.run_pending(None, now=103.5)
+
+		self.assertEqual(self.job.runs, 2)
+		self.assertEqual(self.last_run(), 103.5)
+
+	def test_failed_run_does_not_advance_slot(self):
+		self.job.fail = True
+		self.registry.run_pending(None, now=100.0)
+
+		self.assertIsNone(self.last_run())
+		self.assertEqual(self.registry.metrics_snapshot()[self.job.name]["exceptions"], 1)
+
+	def test_now_zero_is_respected(self):
+		self.registry.run_pending(None, now=0.0)
+		self.assertEqual(self.last_run(), 0.0)
+
+
+class ConcurrentExecutionTests(unittest.TestCase):
+	def setUp(self):
+		self.registry = JobRegistry(max_workers=2, logger=_QUIET)
+		self.addCleanup(self.registry.shutdown, True)
+
+	def test_in_flight_job_is_skipped_not_overlapped(self):
+		release = threading.Event()
+		job = FakeJob(block=release)
+		self.registry.register(job, interval_seconds=1.0)
+		entry = self.registry.jobs[0]
+
+		self.registry.run_pending(None, now=100.0)
+		self.assertTrue(job.started.wait(5))
+		self.registry.run_pending(None, now=102.0)
+		self.registry.run_pending(None, now=103.0)
+
+		self.assertEqual(job.runs, 1)
+		self.assertEqual(entry.stats.snapshot()["skipped"], 2)
+
+		release.set()
+		_wait_done(entry)
+		self.registry.run_pending(None, now=104.0)
+		_wait_done(entry)
+		self.assertEqual(job.runs, 2)
+
+	def test_slow_job_does_not_delay_others(self):
+		release = threading.Event()
+		slow = FakeJob("slow", block=release)
+		fast = FakeJob("fast")
+		self.registry.register(slow, interval_seconds=1.0)
+		self.registry.register(fast, interval_seconds=1.0)
+
+		self.registry.run_pending(None, now=100.0)
+		_wait_done(self.registry.jobs[1])
+
+		self.assertEqual(fast.runs, 1)
+		self.assertTrue(self.registry.jobs[0].in_flight)
+		release.set()
+
+	def test_timeout_reported_once_per_run(self):
+		release = threading.Event()
+		job = FakeJob(block=release)
+		self.registry.register(job, interval_seconds=1.0, timeout_seconds=0.05)
+		entry = self.registry.jobs[0]
+
+		self.registry.run_pending(None, now=100.0)
+		self.assertTrue(job.started.wait(5))
+		time.sleep(0.1)
+		self.registry.run_pending(None, now=100.5)
+		self.registry.run_pending(None, now=100.6)
+		release.set()
+		_wait_done(entry)
+
+		self.assertEqual(entry.stats.snapshot()["timeouts"], 1)
+
+	def test_inline_timeout_is_counted(self):
+		registry = JobRegistry(logger=_QUIET)
+		registry.register(FakeJob(sleep=0.05), interval_seconds=1.0, timeout_seconds=0.01)
+
+		registry.run_pending(None, now=100.0)
+
+		self.assertEqual(registry.jobs[0].stats.snapshot()["timeouts"], 1)
+
+	def test_shutdown_cancels_queued_runs(self):
+		registry = JobRegistry(max_workers=1, logger=_QUIET)
+		self.addCleanup(registry.shutdown, True)
+		release = threading.Event()
+		busy = FakeJob("busy", block=release)
+		queued = FakeJob("queued")
+		registry.register(busy, interval_seconds=1.0)
+		registry.register(queued, interval_seconds=1.0)
+
+		registry.run_pending(None, now=100.0)
+		self.assertTrue(busy.started.wait(5))
+		registry.shutdown(wait=False)
+		release.set()
+		_wait_done(registry.jobs[0])
+
+		self.assertTrue(registry.jobs[1].future.cancelled())
+		self.assertEqual(queued.runs, 0)
+		self.assertIsNone(registry.state["last_run"].get("queued"))
+
+		# A later tick starts a fresh pool and runs the cancelled job.
+		registry.run_pending(None, now=101.0)
+		_wait_done(registry.jobs[1])
+		self.assertEqual(queued.runs, 1)
+
+
+class RunHookTests(unittest.TestCase):
+	def _registry(self, calls, **kwargs):
+		registry = JobRegistry(logger=_QUIET, run_hook=lambda: calls.append(threading.current_thread()), **kwargs)
+		self.addCleanup(registry.shutdown, True)
+		return registry
+
+	def test_hook_runs_before_and_after_each_job_in_its_thread(self):
+		calls = []
+		registry = self._registry(calls, max_workers=1)
+		job = FakeJob()
+		job.run = lambda ctx: calls.append(threading.current_thread())
+		registry.register(job, interval_seconds=1.0)
+
+		registry.run_pending(None, now=100.0)
+		_wait_done(registry.jobs[0])
+
+		self.assertEqual(len(calls), 3)
+		self.assertEqual(len(set(calls)), 1)
+		self.assertIsNot(calls[0], threading.current_thread())
+
+	def test_hook_runs_after_failed_job(self):
+		calls = []
+		registry = self._registry(calls)
+		registry.register(FakeJob(fail=True), interval_seconds=1.0)
+
+		registry.run_pending(None, now=100.0)
+
+		self.assertEqual(len(calls), 2)
+		self.assertEqual(registry.jobs[0].stats.snapshot()["exceptions"], 1)
+
+	def test_failing_hook_does_not_block_job(self):
+		registry = JobRegistry(logger=_QUIET, run_hook=lambda: 1 / 0)
+		job = FakeJob()
+		registry.register(job, interval_seconds=1.0)
+
+		registry.run_pending(None, now=100.0)
+
+		self.assertEqual(job.runs, 1)
+		self.assertEqual(registry.state["last_run"][job.name], 100.0)
@@ -0,0 +1,119 @@
+"""
+Benchmark WebSocket fan-out serialization cost (encode-per-socket vs encode-once).
+
+Before: broadcast ran a recursive _json_safe() over the message and every
+MarketDataConsumer handler called json.dumps() for its own socket, so one
+message was serialized N+1 times for N clients.
+
+After: api.websocket.broadcast.build_channel_event() encodes the client frame
+once; handlers forward event["text"] verbatim.
+
+Usage:
+    python scripts/bench_ws_fanout.py [--quotes 500] [--clients 1 10 100] [--repeat 20]
+
+No database, Redis or channel layer is needed; only the serialization work
+done by the broadcaster and the consumers is measured.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(ROOT_DIR, '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure()
+
+from api.websocket.broadcast import build_channel_event
+
+
+def _legacy_json_safe(value):
+    """The pre-change recursive converter, kept here for comparison only."""
+    if value is None:
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): _legacy_json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [_legacy_json_safe(v) for v in value]
+    return str(value)
+
+
+def make_message(n_quotes: int) -> dict:
+    now = datetime.now(timezone.utc)
+    quotes = [
+        {
+            "symbol": f"SYM{i}",
+            "bid": Decimal("5012.25") + i,
+            "ask": Decimal("5012.50") + i,
+            "last": 5012.25 + i,
+            "volume": 120000 + i,
+            "bid_size": 12,
+            "ask_size": 9,
+            "source": "SCHWAB",
+            "asset_type": "FUTURE",
+            "timestamp": now,
+        }
+        for i in range(n_quotes)
+    ]
+    return {"type": "market_data", "data": {"timestamp": int(now.timestamp()), "quotes": quotes}}
+
+
+def run_before(message: dict, clients: int) -> None:
+    event = _legacy_json_safe(message)
+    for _ in range(clients):
+        json.dumps({"type": "market_data", "data": event.get("data")})
+
+
+def run_after(message: dict, clients: int) -> None:
+    event = build_channel_event(message)
+    for _ in range(clients):
+        _ = event["text"]  # forwarded verbatim by the consumer
+
+
+def _time(fn, message: dict, clients: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(message, clients)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quotes", type=int, default=500)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    message = make_message(args.quotes)
+    frame_kb = len(build_channel_event(message)["text"]) / 1024.0
+    print(f"market_data with {args.quotes} quotes ({frame_kb:.1f} KiB frame), best of {args.repeat}")
+    print(f"{'clients':>8} {'before ms':>10} {'after ms':>10} {'before/client us':>17} {'after/client us':>16}")
+
+    for clients in args.clients:
+        before = _time(run_before, message, clients, args.repeat)
+        after = _time(run_after, message, clients, args.repeat)
+        print(
+            f"{clients:>8} {before * 1e3:>10.2f} {after * 1e3:>10.2f} "
+            f"{before / clients * 1e6:>17.1f} {after / clients * 1e6:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
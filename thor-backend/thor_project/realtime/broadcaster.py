@@ -7,7 +7,8 @@ This file is called by the realtime heartbeat (engine).
 It decides WHEN to broadcast things.
 
 FOR GLOBAL MARKETS:
-- It checks market status periodically
+- Statuses come from the precomputed market calendar (GlobalMarkets.market_calendar)
+- Between calendar transitions a tick does no market work at all
 - It ONLY broadcasts when a status actually changes
 - This results in ~8 messages per day total
 
@@ -21,15 +22,14 @@ IMPORTANT RULES
 from __future__ import annotations
 
 import logging
-import json
-from datetime import timezone as dt_timezone
+from datetime import datetime, timezone as dt_timezone
 import time
-from typing import Dict
+from typing import Dict, Optional
 
 from django.utils import timezone
 
+from GlobalMarkets.market_calendar import MarketCalendar, get_market_calendar
 from GlobalMarkets.models import Market
-from GlobalMarkets.services import compute_market_status
 from GlobalMarkets.ws_push import broadcast_global_markets_tick
 from LiveData.shared.redis_client import live_data_redis
 
@@ -38,6 +38,10 @@ logger = logging.getLogger(__name__)
 # Cache of last-known statuses to detect changes
 _LAST_MARKET_STATUS: Dict[str, str] = {}
 
+# When (and against which calendar build) market statuses next need evaluating.
+_NEXT_EVALUATION_UTC: Optional[datetime] = None
+_EVALUATED_CALENDAR: Optional[MarketCalendar] = None
+
 
 def _update_live_data_active_session(now_utc) -> None:
     """Write the active session routing snapshot used by LiveData stream routing.
@@ -62,11 +66,7 @@ def _update_live_data_active_session(now_utc) -> None:
 
     try:
         # Keep a generous TTL so restarts don't break routing.
-        live_data_redis.client.set(
-            live_data_redis.ACTIVE_SESSION_KEY_REDIS,
-            json.dumps(payload, default=str),
-            ex=60 * 60 * 72,
-        )
+        live_data_redis.set_active_session_snapshot(payload, ttl=60 * 60 * 72)
     except Exception:
         logger.debug("Failed to write %s", live_data_redis.ACTIVE_SESSION_KEY_REDIS, exc_info=True)
 
@@ -76,35 +76,40 @@ def maybe_broadcast_global_market_status() -> None:
     Called by the realtime heartbeat.
 
     DOES NOTHING unless at least one market's OPEN/CLOSED status changes.
+    Market statuses are only evaluated when the calendar's next transition is
+    reached (or the calendar was rebuilt); other ticks return after the
+    active-session write.
     """
+    global _NEXT_EVALUATION_UTC, _EVALUATED_CALENDAR
 
     now = timezone.now()
 
     # Always keep LiveData session routing up-to-date (even if no market status changes).
     _update_live_data_active_session(now)
 
+    calendar = get_market_calendar(now)
+    if calendar is _EVALUATED_CALENDAR and _NEXT_EVALUATION_UTC is not None and now < _NEXT_EVALUATION_UTC:
+        return
+    _EVALUATED_CALENDAR = calendar
+    _NEXT_EVALUATION_UTC = calendar.next_change_after(now)
+
     markets_payload = []
-    status_changed = False
+    changed_keys: Dict[str, str] = {}
 
-    for market in Market.objects.filter(is_active=True):
-        computed = compute_market_status(market, now_utc=now)
+    for key, name in calendar.names.items():
+        computed = calendar.status_at(key, now)
+        if computed is None:
+            continue
         current_status = computed.status
 
-        # Persist status transitions to the DB so admin + REST stay correct.
-        # This remains transition-only: Market.mark_status is a no-op if unchanged.
-        try:
-            market.mark_status(current_status, when=now)
-        except Exception:
-            logger.debug("Failed to persist market status for %s", getattr(market, "key", market.pk), exc_info=True)
-
         # Detect change
-        if _LAST_MARKET_STATUS.get(market.key) != current_status:
-            _LAST_MARKET_STATUS[market.key] = current_status
-            status_changed = True
+        if _LAST_MARKET_STATUS.get(key) != current_status:
+            _LAST_MARKET_STATUS[key] = current_status
+            changed_keys[key] = current_status
 
         markets_payload.append({
-            "key": market.key,
-            "name": market.name,
+            "key": key,
+            "name": name,
             "status": current_status,
             "next_transition_utc": (
                 computed.next_transition_utc.isoformat()
@@ -114,9 +119,17 @@ def maybe_broadcast_global_market_status() -> None:
         })
 
     # No change → no broadcast
-    if not status_changed:
+    if not changed_keys:
         return
 
+    # Persist status transitions to the DB so admin + REST stay correct.
+    # This remains transition-only: Market.mark_status is a no-op if unchanged.
+    for market in Market.objects.filter(key__in=list(changed_keys)):
+        try:
+            market.mark_status(changed_keys[market.key], when=now)
+        except Exception:
+            logger.debug("Failed to persist market status for %s", getattr(market, "key", market.pk), exc_info=True)
+
     logger.info("Global market status changed — broadcasting update")
 
     broadcast_global_markets_tick({
@@ -8,6 +8,10 @@ from dataclasses import dataclass
 from typing import Any
 
 from core.infra.jobs import JobRegistry
+from thor_project.realtime.metrics import publish_job_metrics
+
+# Publish job metrics to Redis every N ticks.
+_METRICS_PUBLISH_EVERY_TICKS = 5
 
 
 @dataclass
@@ -35,9 +39,12 @@ def run_heartbeat(
 
     # Force a 1s cadence for now (can be revisited later)
     tick_seconds = 1.0
-    logger.info("heartbeat starting (tick=%.2fs)", tick_seconds)
+    logger.info("heartbeat starting (tick=%.2fs, workers=%s)", tick_seconds, getattr(registry, "max_workers", 0))
     current_tick = tick_seconds
     tick_count = 0
+    # Fixed-rate ticks: wake on a grid anchored at start-up instead of sleeping a
+    # full tick after the work, so dispatch time does not accumulate as drift.
+    next_tick = time.monotonic()
 
     while True:
         tick_count += 1
@@ -47,8 +54,18 @@ def run_heartbeat(
                 logger.error("heartbeat lost leader lock; stopping")
                 break
 
+        # Before dispatch, so in_flight only shows runs left over from earlier ticks.
+        if tick_count % _METRICS_PUBLISH_EVERY_TICKS == 0 and hasattr(registry, "metrics_snapshot"):
+            try:
+                publish_job_metrics(registry)
+            except Exception:
+                logger.debug("heartbeat metrics publish failed", exc_info=True)
+
         now = time.monotonic()
         registry.run_pending(context, now)
+        if hasattr(registry, "record_tick"):
+            # Lag: how late this tick woke relative to its grid slot.
+            registry.record_tick(time.monotonic() - now, now - next_tick, tick_seconds)
 
         if context.stop_event and context.stop_event.is_set():
             logger.info("heartbeat stopping on stop_event")
@@ -60,13 +77,23 @@ def run_heartbeat(
         if tick_count % 30 == 0:
             logger.info("💓 Heartbeat alive (tick=%s, tick_seconds=%s)", tick_count, current_tick)
 
+        next_tick += current_tick
+        delay = next_tick - time.monotonic()
+        if delay < 0:
+            # Fell behind by more than a tick: skip the missed ticks rather than bursting.
+            next_tick += current_tick * (int(-delay // current_tick) + 1)
+            delay = next_tick - time.monotonic()
+
         # Use stop_event-aware wait to exit promptly on shutdown
         if context.stop_event:
-            if context.stop_event.wait(timeout=current_tick):
+            if context.stop_event.wait(timeout=delay):
                 logger.info("heartbeat stopping on stop_event (wait)")
                 break
         else:
-            time.sleep(current_tick)
+            time.sleep(delay)
+
+    if hasattr(registry, "shutdown"):
+        registry.shutdown(wait=False)
 
 
 __all__ = ["HeartbeatContext", "run_heartbeat"]
@@ -0,0 +1,175 @@
+"""Heartbeat job metrics: Redis publication and Prometheus text rendering.
+
+The heartbeat leader publishes JobRegistry.metrics_snapshot() to a Redis hash
+(one JSON field per job plus "_meta") every few ticks; any web process can then
+serve it, so the /api/heartbeat/metrics/ endpoint does not need to run where
+the heartbeat does.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from LiveData.shared.redis_client import live_data_redis
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_METRICS_KEY = "thor:heartbeat:metrics"
+_META_FIELD = "_meta"
+
+# Published hash expires if the heartbeat stops publishing.
+_METRICS_TTL_SECONDS = 60
+
+
+def publish_job_metrics(registry: Any, ttl_seconds: int = _METRICS_TTL_SECONDS) -> None:
+    """Replace the Redis metrics hash with the registry's current snapshot."""
+    snapshot = registry.metrics_snapshot()
+    mapping = {name: json.dumps(stats) for name, stats in snapshot.items()}
+    mapping[_META_FIELD] = json.dumps({"published_at": time.time(), "pid": os.getpid()})
+
+    pipe = live_data_redis.client.pipeline()
+    pipe.delete(HEARTBEAT_METRICS_KEY)
+    pipe.hset(HEARTBEAT_METRICS_KEY, mapping=mapping)
+    pipe.expire(HEARTBEAT_METRICS_KEY, int(ttl_seconds))
+    pipe.execute()
+
+
+def load_job_metrics() -> tuple[Dict[str, Dict[str, Any]], Optional[dict]]:
+    """(per-job metrics, meta) as last published; ({}, None) when nothing is published."""
+    raw = live_data_redis.client.hgetall(HEARTBEAT_METRICS_KEY) or {}
+    meta = None
+    jobs: Dict[str, Dict[str, Any]] = {}
+    for name, payload in raw.items():
+        try:
+            data = json.loads(payload)
+        except (TypeError, ValueError):
+            logger.debug("Bad heartbeat metrics field %s", name, exc_info=True)
+            continue
+        if name == _META_FIELD:
+            meta = data
+        elif isinstance(data, dict):
+            jobs[name] = data
+    return jobs, meta
+
+
+# -----------------------------------------------------------------------------
+# Prometheus text exposition (format 0.0.4)
+# -----------------------------------------------------------------------------
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_PREFIX = "thor_heartbeat"
+
+# (metric suffix, help, snapshot field)
+_COUNTERS = (
+    ("runs_total", "Completed runs.", "runs"),
+    ("exceptions_total", "Runs that raised.", "exceptions"),
+    ("overruns_total", "Runs that took longer than the job interval.", "overruns"),
+    ("timeouts_total", "Runs that exceeded the job timeout.", "timeouts"),
+    ("skipped_total", "Ticks where the job was due but its previous run was still in flight.", "skipped"),
+)
+
+_GAUGES = (
+    ("interval_seconds", "Configured job interval.", "interval"),
+    ("timeout_seconds", "Configured job timeout.", "timeout"),
+    ("in_flight", "1 while a run is executing.", "in_flight"),
+    ("last_run_timestamp_seconds", "Wall-clock time of the last completed run.", "last_run_at"),
+)
+
+# stat label value -> snapshot field
+_DURATION_STATS = (("last", "last_duration"), ("p50", "p50_duration"), ("p95", "p95_duration"), ("max", "max_duration"))
+_LAG_STATS = (("last", "last_lag"), ("p95", "p95_lag"), ("max", "max_lag"))
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    try:
+        return repr(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+
+
+def _family(lines: list, name: str, mtype: str, help_text: str, samples: Iterable[tuple[str, Any]]) -> None:
+    body = [f"{name}{labels} {text}" for labels, value in samples if (text := _format_value(value)) is not None]
+    if not body:
+        return
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {mtype}")
+    lines.extend(body)
+
+
+def render_prometheus(jobs: Dict[str, Dict[str, Any]], meta: Optional[dict] = None, now: Optional[float] = None) -> str:
+    """Render load_job_metrics() output in the Prometheus text exposition format."""
+    lines: list[str] = []
+    names = sorted(jobs)
+
+    for suffix, help_text, key in _COUNTERS:
+        _family(
+            lines,
+            f"{_PREFIX}_job_{suffix}",
+            "counter",
+            help_text,
+            ((_labels(job_name=n), jobs[n].get(key)) for n in names),
+        )
+
+    _family(
+        lines,
+        f"{_PREFIX}_job_duration_seconds",
+        "gauge",
+        "Run duration over the rolling window (stat=last|p50|p95|max).",
+        ((_labels(job_name=n, stat=stat), jobs[n].get(key)) for n in names for stat, key in _DURATION_STATS),
+    )
+    _family(
+        lines,
+        f"{_PREFIX}_job_lag_seconds",
+        "gauge",
+        "Scheduling lag: run start minus its fixed-rate slot (stat=last|p95|max).",
+        ((_labels(job_name=n, stat=stat), jobs[n].get(key)) for n in names for stat, key in _LAG_STATS),
+    )
+
+    for suffix, help_text, key in _GAUGES:
+        _family(
+            lines,
+            f"{_PREFIX}_job_{suffix}",
+            "gauge",
+            help_text,
+            ((_labels(job_name=n), jobs[n].get(key)) for n in names),
+        )
+
+    published_at = (meta or {}).get("published_at")
+    if published_at is not None:
+        now = time.time() if now is None else now
+        _family(
+            lines,
+            f"{_PREFIX}_metrics_age_seconds",
+            "gauge",
+            "Seconds since the heartbeat last published these metrics.",
+            [("", max(0.0, now - float(published_at)))],
+        )
+    _family(lines, f"{_PREFIX}_up", "gauge", "1 when heartbeat metrics are published.", [("", bool(jobs))])
+
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "HEARTBEAT_METRICS_KEY",
+    "PROMETHEUS_CONTENT_TYPE",
+    "publish_job_metrics",
+    "load_job_metrics",
+    "render_prometheus",
+]
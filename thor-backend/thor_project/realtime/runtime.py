@@ -150,7 +150,13 @@ def start_realtime(force: bool = False) -> None:
         else:
             logger.info("🔓 Leader lock disabled (dev mode)")
 
-        registry = JobRegistry()
+        from django.conf import settings
+        from django.db import close_old_connections
+
+        registry = JobRegistry(
+            max_workers=getattr(settings, "HEARTBEAT_JOB_WORKERS", 0),
+            run_hook=close_old_connections,
+        )
         job_names = register_jobs(registry) or []
         logger.info("✅ Jobs registered: %s", job_names)
 
@@ -269,6 +269,24 @@ REDIS_HOST = config('REDIS_HOST', default='redis')
 REDIS_PORT = config('REDIS_PORT', default=6379, cast=int)
 REDIS_DB = config('REDIS_DB', default=0, cast=int)
 
+# Codec for hot LiveData Redis payloads (latest quotes, ticks, bars, bar queues,
+# quote channels): "json" (legacy) or "msgpack". Readers accept both formats.
+LIVE_DATA_REDIS_CODEC = config('LIVE_DATA_REDIS_CODEC', default='json')
+
+# Closed 1m bars kept per symbol in Redis (bar:1m:recent:<symbol>) so charts can
+# paint recent history without waiting for the DB flush. 720 = 12h; 0 disables.
+LIVE_DATA_RECENT_BARS = config('LIVE_DATA_RECENT_BARS', default=720, cast=int)
+
+# Process-local cache for rarely-changing config keys (instruments:quote_source,
+# live_data:active_session). Entries drop on Redis keyspace notifications; the
+# TTL (seconds, 0 disables caching) bounds staleness if notifications are off.
+LIVE_DATA_CONFIG_CACHE_TTL = config('LIVE_DATA_CONFIG_CACHE_TTL', default=5.0, cast=float)
+LIVE_DATA_CONFIG_CACHE_NOTIFY = config('LIVE_DATA_CONFIG_CACHE_NOTIFY', default=True, cast=bool)
+
+# Days of open/close transitions precomputed per market for the global markets
+# heartbeat (GlobalMarkets.market_calendar). Rebuilt a day before it runs out.
+GLOBAL_MARKETS_CALENDAR_DAYS = config('GLOBAL_MARKETS_CALENDAR_DAYS', default=14, cast=int)
+
 # LiveData Excel Provider (TOS / Excel) pulled from .env
 EXCEL_DATA_FILE = config('EXCEL_DATA_FILE', default=r'A:\Thor\RTD_TOS.xlsm')
 EXCEL_SHEET_NAME = config('EXCEL_SHEET_NAME', default='LiveData')
@@ -307,6 +325,26 @@ REALTIME_JOB_PROVIDERS = [
     "LiveData.schwab.realtime.provider",
 ]
 
+# Worker threads for heartbeat jobs (0 = run due jobs inline, one after another).
+# Each job has at most one run in flight, so >= the number of jobs means a slow
+# job can never hold up another.
+HEARTBEAT_JOB_WORKERS = config('HEARTBEAT_JOB_WORKERS', default=8, cast=int)
+
+# Futures Total enriched quotes are shared per quote version (see
+# ThorTrading.studies.futures_total.quotes.cache); this bounds how long DB-side
+# edits take to show up while quotes are idle. 0 disables the cache.
+THOR_ENRICHED_QUOTES_TTL = config('THOR_ENRICHED_QUOTES_TTL', default=2.0, cast=float)
+
+# Intraday flush: MarketTrading24Hour merges newly inserted 1m bars incrementally;
+# a full per-session recompute reconciles drift (late / out-of-order bars) at
+# most this often. 0 = always full recompute.
+INTRADAY_24H_RECONCILE_SECONDS = config('INTRADAY_24H_RECONCILE_SECONDS', default=300, cast=int)
+
+# InstrumentIntraday daily partitions (PostgreSQL): days created ahead by the
+# heartbeat, and default retention for `manage.py prune_intraday_partitions`.
+INTRADAY_PARTITION_DAYS_AHEAD = config('INTRADAY_PARTITION_DAYS_AHEAD', default=7, cast=int)
+INTRADAY_RETENTION_DAYS = config('INTRADAY_RETENTION_DAYS', default=400, cast=int)
+
 
 # Frontend base URL exposed in admin shortcuts and cross-links
 FRONTEND_BASE_URL = config('FRONTEND_BASE_URL', default='http://localhost:5173/')
@@ -326,6 +364,14 @@ SCHWAB_CLIENT_SECRET = config('SCHWAB_CLIENT_SECRET', default='')
 SCHWAB_HEARTBEAT_BUFFER_SECONDS = config('SCHWAB_HEARTBEAT_BUFFER_SECONDS', default=120, cast=int)
 SCHWAB_HEALTH_INTERVAL = config('SCHWAB_HEALTH_INTERVAL', default=15, cast=int)
 
+# Per-symbol conflation window for the Schwab streamer (ms). 0 = emit every delta.
+# 50-250ms trades a little latency for far fewer Redis/WebSocket writes in bursts.
+SCHWAB_STREAM_CONFLATE_MS = config('SCHWAB_STREAM_CONFLATE_MS', default=0, cast=int)
+
+# Bound on queued-but-unsent WebSocket broadcasts inside the Schwab streamer.
+# Per-symbol ticks are conflated in the queue; beyond this the oldest are dropped.
+SCHWAB_STREAM_BROADCAST_QUEUE_MAX = config('SCHWAB_STREAM_BROADCAST_QUEUE_MAX', default=5000, cast=int)
+
 # If true, watchlist changes emit control-plane updates to the Schwab streamer.
 # Default off: Instruments.services.watchlist_sync publishes authoritative 'set' messages at the end of watchlist writes.
 SCHWAB_SUBSCRIPTION_SIGNAL_PUBLISH = config('SCHWAB_SUBSCRIPTION_SIGNAL_PUBLISH', default=False, cast=bool)
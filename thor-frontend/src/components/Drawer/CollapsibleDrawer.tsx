@@ -1,8 +1,8 @@
-import React, { useCallback, useEffect, useRef, useState } from 'react';
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 // 1. Remove the 'react-use-websocket' import
 // import useWebSocket from 'react-use-websocket'; 
-import { useWsConnection, useWsMessage, wsEnabled } from '../../realtime'; // <--- Use this instead
+import { useWsConnection, useWsMessage, useWsSymbols, wsEnabled } from '../../realtime'; // <--- Use this instead
 import type { WsEnvelope } from '../../realtime/types';
 import {
   DndContext,
@@ -416,6 +416,13 @@ const CollapsibleDrawer: React.FC<CollapsibleDrawerProps> = ({
     }
   }, [applyMarketPatch]);
 
+  // Only stream the watchlist symbols over the shared socket.
+  const watchlistSymbols = useMemo(
+    () => watchlist.map((w) => normalizeWsSymbol(w.instrument?.symbol)).filter(Boolean),
+    [watchlist]
+  );
+  useWsSymbols(watchlistSymbols);
+
   // Use the shared global socket connection
   useWsMessage('quote_tick', (msg: WsEnvelope<QuoteTickPayload>) => {
     setLastTickAt(new Date());
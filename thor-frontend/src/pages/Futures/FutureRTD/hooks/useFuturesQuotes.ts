@@ -1,5 +1,5 @@
-import { useCallback, useEffect, useRef, useState } from "react";
-import { useWsMessage } from "../../../../realtime";
+import { useCallback, useEffect, useMemo, useRef, useState } from "react";
+import { useWsMessage, useWsSymbols } from "../../../../realtime";
 import { INSTRUMENT_QUOTES_LATEST_ENDPOINT } from "../../../../constants/endpoints";
 import type { ApiResponse, MarketData } from "../types";
 
@@ -199,6 +199,13 @@ export function useFuturesQuotes(): UseFuturesQuotesResult {
     fetchQuotes("initial");
   }, [fetchQuotes]);
 
+  // Only stream the symbols on screen (server filters market_data to them).
+  const displayedSymbols = useMemo(
+    () => rows.map((row) => normalizeSymbol(row.instrument.symbol)).filter(Boolean),
+    [rows]
+  );
+  useWsSymbols(displayedSymbols);
+
   useWsMessage<MarketDataSnapshot>(
     "market_data",
     (msg) => {
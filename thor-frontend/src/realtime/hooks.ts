@@ -1,6 +1,7 @@
 import { useEffect, useRef, useState } from 'react';
 import { subscribe } from './router';
 import { connectSocket, onConnectionChange, isConnected, wsEnabled } from './socket';
+import { retainSymbols } from './symbols';
 import type { MessageHandler, WsEnvelope } from './types';
 
 export function useWsMessage<T = unknown>(
@@ -44,6 +45,31 @@ export function useWsConnection(enabled = true): boolean {
   return state;
 }
 
+/**
+ * Subscribe the shared socket to `symbols` while the calling component is mounted,
+ * so per-symbol messages for other symbols are not sent to this client.
+ */
+export function useWsSymbols(symbols: string[], enabled = true): void {
+  // Stable key: re-subscribe only when the set of symbols actually changes.
+  const key = Array.from(new Set(symbols.filter(Boolean).map((s) => s.toUpperCase()))).sort().join(',');
+  const releaseRef = useRef<(() => void) | null>(null);
+
+  useEffect(() => {
+    const active = wsEnabled() && enabled && Boolean(key);
+    if (active) connectSocket();
+    // Retain the new set before releasing the old one so symbols kept across
+    // the change are not unsubscribed and re-subscribed.
+    const release = active ? retainSymbols(key.split(',')) : null;
+    releaseRef.current?.();
+    releaseRef.current = release;
+  }, [key, enabled]);
+
+  useEffect(() => () => {
+    releaseRef.current?.();
+    releaseRef.current = null;
+  }, []);
+}
+
 // Friendly aliases for downstream code
 export const useChannel = useWsMessage;
 export const useConnection = useWsConnection;
@@ -3,5 +3,6 @@ export * from './events';
 export * from './queryKeys';
 export * from './router';
 export * from './socket';
+export * from './symbols';
 export * from './hooks';
 
@@ -0,0 +1,56 @@
+import { onConnectionChange, sendMessage } from './socket';
+
+// Server-side symbol interest (api.websocket MarketDataConsumer subscribe/unsubscribe).
+// Components retain the symbols they display; the shared socket is subscribed to
+// the union, so quote_tick / market.24h / market.52w / market_data only carry
+// those symbols instead of the whole firehose.
+
+const refCounts = new Map<string, number>();
+let resubscribeInstalled = false;
+
+const normalizeSymbol = (symbol: unknown): string =>
+  String(symbol ?? '').trim().replace(/^\//, '').toUpperCase();
+
+function installResubscribe() {
+  if (resubscribeInstalled) return;
+  resubscribeInstalled = true;
+  // Subscriptions live on the server socket: a reconnect starts from the firehose.
+  onConnectionChange((connected) => {
+    if (connected && refCounts.size) {
+      sendMessage({ type: 'subscribe', symbols: Array.from(refCounts.keys()) });
+    }
+  });
+}
+
+export function retainSymbols(symbols: string[]): () => void {
+  const normalized = Array.from(new Set(symbols.map(normalizeSymbol).filter(Boolean)));
+  if (!normalized.length) return () => {};
+
+  installResubscribe();
+
+  const added: string[] = [];
+  normalized.forEach((sym) => {
+    const count = refCounts.get(sym) ?? 0;
+    refCounts.set(sym, count + 1);
+    if (count === 0) added.push(sym);
+  });
+  if (added.length) sendMessage({ type: 'subscribe', symbols: added });
+
+  let released = false;
+  return () => {
+    if (released) return;
+    released = true;
+
+    const removed: string[] = [];
+    normalized.forEach((sym) => {
+      const count = (refCounts.get(sym) ?? 0) - 1;
+      if (count > 0) {
+        refCounts.set(sym, count);
+      } else {
+        refCounts.delete(sym);
+        removed.push(sym);
+      }
+    });
+    if (removed.length) sendMessage({ type: 'unsubscribe', symbols: removed });
+  };
+}